@@ -0,0 +1,148 @@
+"""
+개인화 추천 목록 사전 계산 배치 작업
+
+실행 방법:
+- 변경분만 계산: python -m app.batch.recommendation_jobs materialize
+- 전체 재계산:   python -m app.batch.recommendation_jobs materialize --full
+
+결과 테이블 (user_recommendations, 생성 SQL: app/sql/user_recommendations.sql):
+    user_id          PK
+    entries          jsonb   [{"activity_id", "match_score", "match_reasons"}, ...] 점수순
+    catalog_version  text    계산 시점 activities.updated_at 최댓값
+    computed_at      timestamptz
+
+다음 경우에만 다시 계산한다.
+- 결과가 없는 사용자 (추천 설정 저장 시 결과 행을 삭제함)
+- user_preferences.updated_at 또는 users.updated_at 이 computed_at 이후인 사용자
+- 새로 크롤링/수정된 활동이 있어 catalog_version 이 바뀐 경우 (전체 사용자)
+"""
+
+import asyncio
+from datetime import datetime, date
+import sys
+import os
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from app.database import get_supabase
+from app.config import settings
+from app.utils.match_scoring import ActivityMatrix
+from app.utils.paging import fetch_all, chunked
+
+UPSERT_BATCH_SIZE = 500
+
+def is_stale(row: dict, catalog_version: str, changed_at: list) -> bool:
+    """저장된 추천 결과를 다시 계산해야 하는지"""
+    if not row:
+        return True
+    if row.get('catalog_version') != catalog_version:
+        return True
+    computed_at = row.get('computed_at') or ''
+    return any(ts and ts > computed_at for ts in changed_at)
+
+async def materialize_recommendations(full: bool = False):
+    """사용자별 추천 목록 사전 계산"""
+    print(f"[{datetime.now()}] 추천 목록 사전 계산 시작")
+    
+    try:
+        supabase = get_supabase()
+        
+        # 모집 중인 활동 전체 (한 번만 인코딩)
+        activities = fetch_all(lambda: supabase.table("activities")
+            .select("id, fields, keywords, recommended_majors, difficulty_level, updated_at")
+            .eq("status", "active")
+            .gte("application_end_date", date.today().isoformat())
+            .order("id"))
+        
+        catalog_version = max((a.get('updated_at') or '' for a in activities), default='')
+        matrix = ActivityMatrix(activities)
+        print(f"{len(activities)}개 활동 인코딩 (catalog_version={catalog_version})")
+        
+        users = fetch_all(lambda: supabase.table("users")
+            .select("id, major, updated_at")
+            .order("id"))
+        prefs = {
+            p['user_id']: p
+            for p in fetch_all(lambda: supabase.table("user_preferences")
+                .select("user_id, interested_fields, skill_keywords, preferred_difficulty, updated_at")
+                .order("user_id"))
+        }
+        existing = {} if full else {
+            r['user_id']: r
+            for r in fetch_all(lambda: supabase.table("user_recommendations")
+                .select("user_id, catalog_version, computed_at")
+                .order("user_id"))
+        }
+        
+        computed_at = datetime.now().isoformat()
+        rows = []
+        skipped = 0
+        
+        for user in users:
+            user_id = user['id']
+            user_prefs = prefs.get(user_id, {})
+            
+            if not full and not is_stale(
+                existing.get(user_id),
+                catalog_version,
+                [user.get('updated_at'), user_prefs.get('updated_at')]
+            ):
+                skipped += 1
+                continue
+            
+            user_data = {
+                'major': user.get('major') or '',
+                'interested_fields': user_prefs.get('interested_fields') or [],
+                'skill_keywords': user_prefs.get('skill_keywords') or [],
+                'preferred_difficulty': user_prefs.get('preferred_difficulty')
+            }
+            
+            top = matrix.top_k(user_data, settings.recommendation_materialized_limit)
+            rows.append({
+                "user_id": user_id,
+                "entries": [
+                    {
+                        "activity_id": activity['id'],
+                        "match_score": score,
+                        "match_reasons": reasons
+                    }
+                    for score, reasons, activity in top
+                ],
+                "catalog_version": catalog_version,
+                "computed_at": computed_at
+            })
+        
+        print(f"{len(rows)}명 계산, {skipped}명 변경 없음")
+        
+        for batch in chunked(rows, UPSERT_BATCH_SIZE):
+            try:
+                supabase.table("user_recommendations").upsert(batch).execute()
+            except Exception as e:
+                print(f"  - [ERROR] {len(batch)}명 저장 실패: {str(e)}")
+        
+        print(f"[{datetime.now()}] 추천 목록 사전 계산 완료")
+    
+    except Exception as e:
+        print(f"[ERROR] 추천 목록 사전 계산 실패: {str(e)}")
+        raise
+
+def main():
+    """메인 실행 함수"""
+    if len(sys.argv) < 2:
+        print("사용법: python -m app.batch.recommendation_jobs <command> [--full]")
+        print("Commands:")
+        print("  materialize            - 변경된 사용자 추천 목록 사전 계산")
+        print("  materialize --full     - 전체 사용자 추천 목록 재계산")
+        return
+    
+    command = sys.argv[1]
+    
+    if command == "materialize":
+        asyncio.run(materialize_recommendations(full="--full" in sys.argv[2:]))
+    else:
+        print(f"알 수 없는 명령: {command}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
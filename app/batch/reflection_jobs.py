@@ -4,10 +4,17 @@
 실행 방법:
 - 시간별 리마인더: python -m app.batch.reflection_jobs send_reminders
 - 일일 메트릭 계산: python -m app.batch.reflection_jobs calculate_daily_metrics
+- 메트릭 누적 집계 재구성 (복구용): python -m app.batch.reflection_jobs rebuild_metrics
+
+증분 메트릭 계산용 테이블:
+- growth_metric_state: user_id(PK), reflection_count, score_sum, score_count, keywords(jsonb),
+                       checkpoint_date, checkpoint_created_at
+- batch_checkpoints:   job(PK), reflection_date, created_at
 """
 
 import asyncio
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timedelta, timezone
 from typing import List
 import sys
 import os
@@ -17,144 +24,288 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 
 from app.database import get_supabase
 from app.config import settings
+from app.utils.paging import iter_keyset, chunked
+
+# growth_metrics 한 번에 upsert 할 행 수
+METRICS_BATCH_SIZE = 500
+METRICS_JOB = "growth_metrics"
 
-async def send_reflection_reminders():
-    """회고 리마인더 전송 (시간별 실행)"""
+def load_sent_reminder_links(supabase, user_ids: List[str], since: datetime) -> set:
+    """since 이후 이미 보낸 리마인더의 (user_id, link) 목록"""
+    sent = set()
+    # in_() 값이 URL 에 들어가므로 uuid 목록은 작게 나눔 (프록시 URL 길이 제한)
+    for batch in chunked(user_ids, settings.reminder_lookup_batch_size):
+        for page in iter_keyset(lambda: supabase.table("notifications")
+                .select("id, user_id, link")
+                .eq("type", "reminder")
+                .in_("user_id", batch)
+                .gte("created_at", since.isoformat())):
+            sent.update((n['user_id'], n['link']) for n in page)
+    return sent
+
+async def send_reflection_reminders(batch_size: int = None):
+    """회고 리마인더 전송 (시간별 실행)
+    
+    알림을 batch_size(기본 reminder_batch_size) 개씩 묶어 insert 한다.
+    같은 시간대에 다시 실행해도 이미 보낸 스페이스(user_id, link)에는 보내지 않는다.
+    """
     print(f"[{datetime.now()}] 회고 리마인더 전송 시작")
     
     try:
         supabase = get_supabase()
+        batch_size = batch_size or settings.reminder_batch_size
         
         # 다음 회고 날짜가 오늘인 활성 스페이스 조회
         now = datetime.now()
         today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
         today_end = now.replace(hour=23, minute=59, second=59, microsecond=999999)
+        hour_start = now.replace(minute=0, second=0, microsecond=0)
         
-        spaces_response = supabase.table("reflection_spaces")\
-            .select("*, users(email, name)")\
-            .eq("status", "active")\
-            .eq("reminder_enabled", True)\
-            .gte("next_reflection_date", today_start.isoformat())\
-            .lte("next_reflection_date", today_end.isoformat())\
-            .execute()
-        
-        spaces = spaces_response.data
+        spaces = []
+        for page in iter_keyset(lambda: supabase.table("reflection_spaces")
+                .select("*, users(email, name)")
+                .eq("status", "active")
+                .eq("reminder_enabled", True)
+                .gte("next_reflection_date", today_start.isoformat())
+                .lte("next_reflection_date", today_end.isoformat())):
+            spaces.extend(page)
         
         if not spaces:
             print("전송할 리마인더가 없습니다")
             return
         
-        print(f"{len(spaces)}개의 리마인더를 전송합니다")
+        # 이번 시간대에 이미 보낸 리마인더 제외
+        sent = load_sent_reminder_links(supabase, sorted({space['user_id'] for space in spaces}), hour_start)
         
-        # 알림 생성
+        notifications = []
         for space in spaces:
-            user = space.get('users', {})
-            user_id = space['user_id']
+            link = f"/spaces/{space['id']}/reflect"
+            if (space['user_id'], link) in sent:
+                continue
+            sent.add((space['user_id'], link))
             
-            notification_data = {
-                "user_id": user_id,
+            notifications.append({
+                "user_id": space['user_id'],
                 "type": "reminder",
                 "title": "회고 작성 시간입니다",
                 "message": f"'{space['name']}' 스페이스의 회고를 작성해주세요",
-                "link": f"/spaces/{space['id']}/reflect",
+                "link": link,
                 "is_read": False
-            }
-            
-            supabase.table("notifications").insert(notification_data).execute()
-            
-            print(f"  - {user.get('name', 'Unknown')} ({user.get('email')}): {space['name']}")
+            })
         
-        print(f"[{datetime.now()}] 회고 리마인더 전송 완료")
+        skipped = len(spaces) - len(notifications)
+        print(f"{len(notifications)}개의 리마인더를 전송합니다 (이번 시간대 중복 {skipped}개 제외)")
+        
+        # 알림 생성 (묶음 insert)
+        sent_count = 0
+        failed = 0
+        total_start = time.perf_counter()
+        for i, batch in enumerate(chunked(notifications, batch_size), start=1):
+            start = time.perf_counter()
+            try:
+                supabase.table("notifications").insert(batch).execute()
+                sent_count += len(batch)
+                status = "ok"
+            except Exception as e:
+                failed += len(batch)
+                status = f"실패: {str(e)}"
+            elapsed = time.perf_counter() - start
+            print(f"  - batch {i}: {len(batch)}건 {elapsed * 1000:.0f}ms "
+                  f"({len(batch) / max(elapsed, 1e-6):.0f}건/s) {status}")
+        
+        elapsed = time.perf_counter() - total_start
+        print(f"  - 전송 {sent_count}건, 실패 {failed}건, {sent_count / max(elapsed, 1e-6):.0f}건/s")
+        if failed:
+            # 실패한 묶음은 다음 실행에서 다시 전송됨 (성공한 알림은 중복 제외)
+            raise RuntimeError(f"{failed}건의 리마인더 전송 실패")
         
+        print(f"[{datetime.now()}] 회고 리마인더 전송 완료")
+    
     except Exception as e:
         print(f"[ERROR] 리마인더 전송 실패: {str(e)}")
         raise
 
-async def calculate_daily_metrics():
-    """일일 성장 메트릭 계산 (매일 자정 실행)"""
+def _parse_ts(value) -> datetime:
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+def load_metric_states(supabase) -> dict:
+    """사용자별 누적 집계 (growth_metric_state) 조회"""
+    states = {}
+    for page in iter_keyset(lambda: supabase.table("growth_metric_state")
+            .select("user_id, reflection_count, score_sum, score_count, keywords, checkpoint_date, checkpoint_created_at"),
+            key="user_id"):
+        for row in page:
+            states[row['user_id']] = {
+                **row,
+                "keywords": set(row.get('keywords') or []),
+                "checkpoint_created_at": _parse_ts(row.get('checkpoint_created_at'))
+            }
+    return states
+
+def fold_reflection(states: dict, r: dict) -> bool:
+    """회고 한 건을 사용자 누적 집계에 반영 (이미 반영된 회고면 False)"""
+    state = states.get(r['user_id'])
+    if state is None:
+        state = states[r['user_id']] = {
+            "user_id": r['user_id'],
+            "reflection_count": 0,
+            "score_sum": 0,
+            "score_count": 0,
+            "keywords": set(),
+            "checkpoint_date": None,
+            "checkpoint_created_at": None
+        }
+    elif (state.get('checkpoint_created_at') and r.get('created_at')
+            and r['reflection_date'] <= state['checkpoint_date']
+            and _parse_ts(r['created_at']) <= state['checkpoint_created_at']):
+        # 이전 실행이 사용자 집계는 저장했지만 전역 체크포인트 저장 전에 중단된 경우
+        return False
+    
+    state["reflection_count"] += 1
+    if r.get('progress_score'):
+        state["score_sum"] += r['progress_score']
+        state["score_count"] += 1
+    keywords = r.get('ai_keywords', [])
+    if isinstance(keywords, list):
+        state["keywords"].update(keywords)
+    return True
+
+def load_space_stats(supabase) -> dict:
+    """스페이스 완료율 / 완료 수 (사용자별 집계)"""
+    space_stats = {}
+    for page in iter_keyset(lambda: supabase.table("reflection_spaces")
+            .select("id, user_id, status, total_reflections, expected_reflections")
+            .in_("status", ["active", "completed"])):
+        for s in page:
+            stats = space_stats.setdefault(s['user_id'], {"actual": 0, "expected": 0, "completed": 0})
+            if s['status'] == "active":
+                stats["actual"] += s.get('total_reflections', 0)
+                stats["expected"] += s.get('expected_reflections', 1)
+            else:
+                stats["completed"] += 1
+    return space_stats
+
+def save_metric_states(supabase, states: dict, user_ids, checkpoint_date: str, checkpoint_created_at: datetime):
+    """변경된 사용자의 누적 집계와 사용자별 체크포인트 저장"""
+    rows = [
+        {
+            "user_id": user_id,
+            "reflection_count": states[user_id]["reflection_count"],
+            "score_sum": states[user_id]["score_sum"],
+            "score_count": states[user_id]["score_count"],
+            "keywords": sorted(states[user_id]["keywords"]),
+            "checkpoint_date": checkpoint_date,
+            "checkpoint_created_at": checkpoint_created_at.isoformat()
+        }
+        for user_id in user_ids
+    ]
+    for batch in chunked(rows, METRICS_BATCH_SIZE):
+        supabase.table("growth_metric_state").upsert(batch).execute()
+
+def save_growth_metrics(supabase, states: dict, space_stats: dict, day: str):
+    """누적 집계로 growth_metrics 행을 만들어 묶음 upsert"""
+    metrics = []
+    for user_id, state in states.items():
+        if not state["reflection_count"]:
+            continue
+        
+        # 평균 진행 점수
+        avg_progress = state["score_sum"] / state["score_count"] if state["score_count"] else 0
+        
+        # 완료율 계산
+        spaces = space_stats.get(user_id, {"actual": 0, "expected": 0, "completed": 0})
+        completion_rate = int((spaces["actual"] / spaces["expected"]) * 100) if spaces["expected"] > 0 else 0
+        
+        metrics.append({
+            "user_id": user_id,
+            "date": day,
+            "avg_progress_score": round(avg_progress, 2),
+            "total_reflections": state["reflection_count"],
+            "keyword_count": len(state["keywords"]),
+            "completion_rate": min(completion_rate, 100),
+            "project_completion_count": spaces["completed"]
+        })
+    
+    saved = 0
+    for batch in chunked(metrics, METRICS_BATCH_SIZE):
+        try:
+            supabase.table("growth_metrics").upsert(batch).execute()
+            saved += len(batch)
+        except Exception as e:
+            print(f"  - [ERROR] {len(batch)}명 저장 실패: {str(e)}")
+    
+    print(f"  - {saved}/{len(metrics)}명 저장")
+
+async def calculate_daily_metrics(rebuild: bool = False):
+    """일일 성장 메트릭 계산 (매일 자정 실행)
+    
+    사용자별 누적 집계(growth_metric_state)에 지난 체크포인트 이후 회고만 더한다.
+    체크포인트는 (reflection_date, created_at) 쌍이며, 이번 실행 범위는
+    reflection_date <= 어제 이고 created_at <= 실행 시각 인 회고 중 이전 범위에 없던 것이다.
+    rebuild=True 이거나 체크포인트가 없으면 전체 회고로 누적 집계를 다시 만든다.
+    """
     print(f"[{datetime.now()}] 일일 메트릭 계산 시작")
     
     try:
         supabase = get_supabase()
         
         # 어제 날짜
-        yesterday = (datetime.now() - timedelta(days=1)).date()
+        yesterday = (datetime.now() - timedelta(days=1)).date().isoformat()
+        run_started_at = datetime.now(timezone.utc)
         
-        # 모든 활성 사용자 조회
-        users_response = supabase.table("users").select("id").execute()
-        users = users_response.data
+        checkpoint = None
+        if not rebuild:
+            checkpoint_response = supabase.table("batch_checkpoints")\
+                .select("reflection_date, created_at")\
+                .eq("job", METRICS_JOB)\
+                .execute()
+            checkpoint = checkpoint_response.data[0] if checkpoint_response.data else None
         
-        print(f"{len(users)}명의 사용자 메트릭 계산")
+        if checkpoint:
+            states = load_metric_states(supabase)
+            window = f'created_at.gt."{checkpoint["created_at"]}",reflection_date.gt.{checkpoint["reflection_date"]}'
+            print(f"증분 계산: 체크포인트 {checkpoint['reflection_date']} / {checkpoint['created_at']} 이후")
+        else:
+            # 전역 체크포인트부터 지움: 다시 만드는 도중 중단되면 다음 실행도 전체 재계산
+            # (남아 있으면 비었거나 일부만 저장된 누적 집계에 증분만 더하게 됨)
+            supabase.table("batch_checkpoints").delete().eq("job", METRICS_JOB).execute()
+            # 삭제된 회고만 있던 사용자의 누적 집계가 남지 않도록 비우고 다시 만듦
+            supabase.table("growth_metric_state").delete().neq("user_id", "").execute()
+            states = {}
+            window = None
+            print("전체 재계산")
         
-        for user in users:
-            user_id = user['id']
-            
-            # 어제까지의 회고 데이터
-            reflections_response = supabase.table("reflections")\
-                .select("progress_score, ai_keywords")\
-                .eq("user_id", user_id)\
-                .lte("reflection_date", yesterday.isoformat())\
-                .execute()
-            
-            reflections = reflections_response.data
-            
-            if not reflections:
-                continue
-            
-            # 평균 진행 점수
-            scores = [r.get('progress_score', 0) for r in reflections if r.get('progress_score')]
-            avg_progress = sum(scores) / len(scores) if scores else 0
-            
-            # 키워드 수
-            all_keywords = set()
-            for r in reflections:
-                keywords = r.get('ai_keywords', [])
-                if isinstance(keywords, list):
-                    all_keywords.update(keywords)
-            
-            keyword_count = len(all_keywords)
-            
-            # 완료율 계산
-            spaces_response = supabase.table("reflection_spaces")\
-                .select("total_reflections, expected_reflections")\
-                .eq("user_id", user_id)\
-                .eq("status", "active")\
-                .execute()
-            
-            spaces = spaces_response.data
-            total_actual = sum(s.get('total_reflections', 0) for s in spaces)
-            total_expected = sum(s.get('expected_reflections', 1) for s in spaces)
-            completion_rate = int((total_actual / total_expected) * 100) if total_expected > 0 else 0
-            
-            # 프로젝트 완료 수
-            projects_response = supabase.table("reflection_spaces")\
-                .select("id", count="exact")\
-                .eq("user_id", user_id)\
-                .eq("status", "completed")\
-                .execute()
-            
-            project_completion_count = projects_response.count or 0
-            
-            # 메트릭 저장
-            metric_data = {
-                "user_id": user_id,
-                "date": yesterday.isoformat(),
-                "avg_progress_score": round(avg_progress, 2),
-                "total_reflections": len(reflections),
-                "keyword_count": keyword_count,
-                "completion_rate": min(completion_rate, 100),
-                "project_completion_count": project_completion_count
-            }
-            
-            # Upsert (존재하면 업데이트, 없으면 삽입)
-            try:
-                supabase.table("growth_metrics").upsert(metric_data).execute()
-                print(f"  - User {user_id}: 평균 {avg_progress:.1f}점, 완료율 {completion_rate}%")
-            except Exception as e:
-                print(f"  - [ERROR] User {user_id}: {str(e)}")
+        # 새 회고만 누적 집계에 반영
+        touched = set()
+        folded = 0
+        def build_query():
+            query = supabase.table("reflections")\
+                .select("id, user_id, progress_score, ai_keywords, reflection_date, created_at")\
+                .lte("reflection_date", yesterday)\
+                .lte("created_at", run_started_at.isoformat())
+            return query.or_(window) if window else query
         
-        print(f"[{datetime.now()}] 일일 메트릭 계산 완료")
+        for page in iter_keyset(build_query):
+            for r in page:
+                if fold_reflection(states, r):
+                    touched.add(r['user_id'])
+                    folded += 1
+        
+        print(f"{folded}개 회고 반영, {len(touched)}명 누적 집계 변경")
+        
+        # 사용자별 체크포인트를 함께 저장한 뒤 전역 체크포인트 이동 (저장이 모두 끝난 뒤에만)
+        save_metric_states(supabase, states, touched if checkpoint else states.keys(), yesterday, run_started_at)
+        supabase.table("batch_checkpoints").upsert({
+            "job": METRICS_JOB,
+            "reflection_date": yesterday,
+            "created_at": run_started_at.isoformat()
+        }).execute()
         
+        print(f"{len(states)}명의 사용자 메트릭 계산")
+        save_growth_metrics(supabase, states, load_space_stats(supabase), yesterday)
+        
+        print(f"[{datetime.now()}] 일일 메트릭 계산 완료")
+    
     except Exception as e:
         print(f"[ERROR] 메트릭 계산 실패: {str(e)}")
         raise
@@ -174,7 +325,7 @@ async def cleanup_expired_cache():
         deleted_count = len(response.data) if response.data else 0
         print(f"{deleted_count}개의 만료된 캐시 삭제")
         print(f"[{datetime.now()}] 캐시 정리 완료")
-        
+    
     except Exception as e:
         print(f"[ERROR] 캐시 정리 실패: {str(e)}")
         raise
@@ -197,7 +348,7 @@ async def update_space_status():
         updated_count = len(response.data) if response.data else 0
         print(f"{updated_count}개의 스페이스 완료 처리")
         print(f"[{datetime.now()}] 스페이스 상태 업데이트 완료")
-        
+    
     except Exception as e:
         print(f"[ERROR] 스페이스 상태 업데이트 실패: {str(e)}")
         raise
@@ -209,6 +360,7 @@ def main():
         print("Commands:")
         print("  send_reminders         - 회고 리마인더 전송 (시간별)")
         print("  calculate_daily_metrics - 일일 메트릭 계산 (매일 자정)")
+        print("  rebuild_metrics        - 메트릭 누적 집계 전체 재구성 (복구용)")
         print("  cleanup_cache          - 만료 캐시 정리 (매일)")
         print("  update_status          - 스페이스 상태 업데이트 (매일)")
         print("  run_all_daily          - 모든 일일 작업 실행")
@@ -220,6 +372,8 @@ def main():
         asyncio.run(send_reflection_reminders())
     elif command == "calculate_daily_metrics":
         asyncio.run(calculate_daily_metrics())
+    elif command == "rebuild_metrics":
+        asyncio.run(calculate_daily_metrics(rebuild=True))
     elif command == "cleanup_cache":
         asyncio.run(cleanup_expired_cache())
     elif command == "update_status":
@@ -0,0 +1,91 @@
+"""
+활동 텍스트 분류 벤치마크 (키워드별 `in` 스캔 vs 컴파일된 다중 패턴 매처)
+
+활동 설명 코퍼스를 만들어 기존 방식(패턴마다 텍스트를 다시 훑음)과
+crawlers/classify.py 의 한 번 스캔 방식의 분야/키워드/추천 학과 결과와 시간을 비교한다.
+
+실행: python -m app.benchmarks.activity_classifier [설명 수 ...]
+기본값: 1000 10000 50000
+"""
+
+import random
+import sys
+import os
+import time
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from app.crawlers.classify import (
+    FIELD_MAPPING, FIELD_KEYWORDS, COMMON_KEYWORDS, classify, get_recommended_majors
+)
+
+FILLER = [
+    '참가자', '모집', '기간', '시상', '우수', '혁신', '아이디어', '서비스', '제안', '지원', '혜택', '활동비',
+    '수료증', '발대식', '주최', '주관', '후원', '접수', '심사', '발표', '결과', 'the', 'and', 'for', 'with'
+]
+
+def make_corpus(n: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    patterns = [p for patterns in FIELD_MAPPING.values() for p in patterns]
+    patterns += [k for keywords in FIELD_KEYWORDS.values() for k in keywords] + COMMON_KEYWORDS
+    corpus = []
+    for _ in range(n):
+        words = rng.choices(FILLER, k=rng.randint(20, 120)) + rng.sample(patterns, rng.randint(0, 8))
+        rng.shuffle(words)
+        # 대소문자 섞기 (Python / python / PYTHON)
+        corpus.append(' '.join(w.upper() if rng.random() < 0.1 else w for w in words))
+    return corpus
+
+def scan_classify(text: str) -> dict:
+    """기존 방식: 패턴마다 텍스트를 다시 스캔"""
+    text_lower = text.lower()
+    fields = [
+        field for field, keywords in FIELD_MAPPING.items()
+        if any(keyword in text or keyword.lower() in text_lower for keyword in keywords)
+    ] or ['기타']
+    
+    keywords = {}
+    for field in fields:
+        for keyword in FIELD_KEYWORDS.get(field, []):
+            if keyword.lower() in text.lower():
+                keywords[keyword] = None
+    for keyword in COMMON_KEYWORDS:
+        if keyword in text:
+            keywords[keyword] = None
+    
+    return {
+        "fields": fields,
+        "keywords": list(keywords)[:10],
+        "recommended_majors": get_recommended_majors(fields)
+    }
+
+def timed(fn, repeat: int = 3) -> tuple:
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 50000]
+    
+    print(f"{'texts':>8} | {'avg chars':>9} | {'scan':>10} | {'matcher':>10} | {'speedup':>7} | equal")
+    print("-" * 66)
+    
+    for n in sizes:
+        corpus = make_corpus(n)
+        avg_chars = sum(len(text) for text in corpus) / len(corpus)
+        
+        scan_time, expected = timed(lambda: [scan_classify(text) for text in corpus])
+        matcher_time, actual = timed(lambda: [classify(text) for text in corpus])
+        
+        print(
+            f"{n:>8} | {avg_chars:>9.0f} | {scan_time * 1000:>8.1f}ms | {matcher_time * 1000:>8.1f}ms | "
+            f"{scan_time / matcher_time:>6.1f}x | {expected == actual}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+크롤링 날짜 파싱 벤치마크 (기존 parse_date vs crawlers/dates.py 의 DateNormalizer)
+
+fixtures/crawler_dates.json 의 실제 목록 형식 예시로 먼저 정확도를 확인하고,
+예시를 반복 샘플링한 목록(같은 문자열이 자주 반복됨)에서 두 방식의 시간을 비교한다.
+기존 방식은 호출마다 re.match 로 패턴을 찾고 연도를 2025 로 고정하며 대부분의 한국어 형식을 놓친다.
+
+실행: python -m app.benchmarks.crawler_dates [문자열 수 ...]
+기본값: 10000 100000 500000
+"""
+
+import json
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from app.crawlers.dates import DateNormalizer
+
+FIXTURES_PATH = os.path.join(os.path.dirname(__file__), 'fixtures', 'crawler_dates.json')
+
+def load_fixtures() -> tuple:
+    with open(FIXTURES_PATH, encoding='utf-8') as f:
+        fixtures = json.load(f)
+    return datetime.fromisoformat(fixtures['now']), fixtures['cases']
+
+def legacy_parse_date(date_str: str) -> str:
+    """기존 ActivityCrawler.parse_date"""
+    if not date_str:
+        return None
+    
+    try:
+        if re.match(r'\d{4}-\d{2}-\d{2}', date_str):
+            return date_str
+        if re.match(r'\d{4}\.\d{2}\.\d{2}', date_str):
+            return date_str.replace('.', '-')
+        if re.match(r'\d{2}/\d{2}', date_str):
+            month, day = date_str.split('/')
+            return f"2025-{month}-{day}"
+    except:
+        pass
+    
+    return None
+
+def check(now: datetime, cases: list) -> int:
+    """예시별 (시작일, 마감일) 확인, 틀린 수 반환"""
+    dates = DateNormalizer(now)
+    failures = 0
+    for case in cases:
+        actual = dates.parse_range(case['text'])
+        expected = (case['start'], case['end'])
+        legacy = legacy_parse_date(case['text'])
+        mark = '✅' if actual == expected else '❌'
+        failures += actual != expected
+        print(f"  {mark} {case['source']:<13} {case['text']!r:<50} → {actual}  (기존: {legacy})")
+    return failures
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 500000]
+    now, cases = load_fixtures()
+    
+    print(f"📅 형식 예시 {len(cases)}개 (기준 시각 {now.isoformat()})")
+    failures = check(now, cases)
+    legacy_hits = sum(legacy_parse_date(case['text']) == case['end'] for case in cases)
+    print(f"  정확도: 새 방식 {len(cases) - failures}/{len(cases)}, 기존 방식 마감일 {legacy_hits}/{len(cases)}")
+    print()
+    
+    texts = [case['text'] for case in cases]
+    print(f"{'strings':>8} | {'legacy':>10} | {'cold':>10} | {'memo':>10} | {'memo vs legacy':>14}")
+    print("-" * 64)
+    
+    for n in sizes:
+        rng = random.Random(42)
+        stream = rng.choices(texts, k=n)
+        
+        legacy_time = timed(lambda: [legacy_parse_date(text) for text in stream])
+        # 기억 없이 (문자열마다 새로 파싱)
+        cold_time = timed(lambda: [DateNormalizer(now)._parse_range(text) for text in stream])
+        # 실행마다 하나의 DateNormalizer (반복 문자열은 기억한 결과 사용)
+        def memo_run():
+            dates = DateNormalizer(now)
+            return [dates.parse_range(text) for text in stream]
+        memo_time = timed(memo_run)
+        
+        print(
+            f"{n:>8} | {legacy_time * 1000:>8.1f}ms | {cold_time * 1000:>8.1f}ms | {memo_time * 1000:>8.1f}ms | "
+            f"{legacy_time / memo_time:>13.1f}x"
+        )
+    
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
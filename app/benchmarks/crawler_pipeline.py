@@ -0,0 +1,462 @@
+"""
+크롤러 전체 파이프라인 벤치마크 (실제 사이트 / Supabase 없이)
+
+fixtures/crawler/ 의 목록/상세 페이지 HTML 을 로컬 aiohttp 서버로 다시 보내고,
+ActivityCrawler 의 가져오기 → 파싱(프로세스 풀) → 보강 → 저장 파이프라인을 그대로 실행한다.
+저장은 메모리 안의 대체 DB(StandInSupabase)로 하며 왕복 지연(--db-rtt-ms)을 흉내낼 수 있다.
+
+- 서버: 응답 지연(--latency-ms ± --jitter-ms), 오류 주입(--error-rate 비율로 503),
+        소스 간 중복 공고 비율(--duplicate-rate, 같은 제목/주최로 다른 사이트에 게시)
+- 측정: 활동/초 (수집 시작~저장 완료), 메모리 최대치(메인 프로세스 / 파싱 워커 RSS),
+        DB 왕복 수(활동당), HTTP 요청 수, 주입된 오류 수
+
+실행: python -m app.benchmarks.crawler_pipeline [--pages 5] [--per-page 20] [--latency-ms 0 50]
+                                                [--error-rate 0 0.05] [--db-rtt-ms 0] [--workers 0]
+                                                [--output result.json] [--baseline result.json --tolerance 0.2]
+--baseline 을 주면 같은 시나리오의 활동/초가 tolerance 이상 떨어지거나
+활동당 DB 왕복 수가 늘어났을 때 종료 코드 1 로 끝난다 (처리량 회귀 확인용).
+필요 패키지: aiohttp, bs4 (lxml 권장)
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import re
+import resource
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from typing import Callable, Dict, List, Optional
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from aiohttp import web
+
+from app.config import settings
+from app.crawlers.activity_crawler import ActivityCrawler
+from app.crawlers.http_client import SourceLimit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'crawler')
+SOURCES = ['linkareer', 'wevity', 'thinkpool', 'onoffmix']
+
+ORGANIZATIONS = [
+    '네이버', '카카오', '삼성전자', 'LG전자', '현대자동차', 'SK텔레콤', '한국관광공사', '한국데이터산업진흥원',
+    '중소벤처기업부', '과학기술정보통신부', '서울특별시', '한국광고총연합회', 'CJ ENM', '롯데', '포스코', 'KT'
+]
+TOPICS = [
+    '인공지능', '빅데이터', '스마트시티', '탄소중립', '메타버스', '헬스케어', '핀테크', '모빌리티', '로컬 관광',
+    '공공데이터', '친환경 패키지', '청년 주거', '디지털 교육', '반려동물', '문화유산', '푸드테크', '웹툰', 'ESG'
+]
+KINDS = ['공모전', '해커톤', '서포터즈', '아이디어 경진대회', '대외활동', '기자단', '영상 공모전', '창업 경진대회']
+WORDS = [
+    '혁신', '미래', '청년', '상상', '도전', '챌린지', '캠퍼스', '리그', '페스티벌', '어워드', '프로젝트',
+    '랩', '스쿨', '크루', '위크', '오픈', '그랜드', '글로벌', '넥스트', '드림'
+]
+
+_PERIOD = re.compile(r'\d{4}[.\-]\d{1,2}[.\-]\d{1,2}[^~\n]{0,12}~\s*[\d.\-]+')
+
+def load_fixtures() -> Dict[str, str]:
+    fixtures = {}
+    for name in ['listing'] + SOURCES:
+        with open(os.path.join(FIXTURES_DIR, f'{name}.html'), encoding='utf-8') as f:
+            fixtures[name] = f.read()
+    return fixtures
+
+def render(template: str, values: Dict[str, object]) -> str:
+    for key, value in values.items():
+        template = template.replace('{{' + key + '}}', str(value))
+    return template
+
+class FixtureServer:
+    """녹화된 HTML 을 소스별 목록/상세 경로로 돌려주는 로컬 서버
+    
+    /{source}/list/{page}       목록 (pages 페이지까지, 이후는 빈 목록)
+    /{source}/detail/{page}-{n} 상세 (공고 내용은 id 로 결정적으로 생성)
+    """
+    def __init__(self, pages: int, per_page: int, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, duplicate_rate: float = 0.1, seed: int = 42):
+        self.fixtures = load_fixtures()
+        self.pages = pages
+        self.per_page = per_page
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.duplicate_rate = duplicate_rate
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.injected_errors = 0
+        self.bytes_sent = 0
+        self._runner: Optional[web.AppRunner] = None
+        self.base_url = ''
+    
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_get('/{source}/list/{page}', self.listing)
+        app.router.add_get('/{source}/detail/{id}', self.detail)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f'http://127.0.0.1:{port}'
+        return self.base_url
+    
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+    
+    async def _delay_or_error(self) -> Optional[web.Response]:
+        self.requests += 1
+        delay = self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if self.rng.random() < self.error_rate:
+            self.injected_errors += 1
+            return web.Response(status=503, text='Service Unavailable')
+        return None
+    
+    def _html(self, text: str) -> web.Response:
+        self.bytes_sent += len(text.encode('utf-8'))
+        return web.Response(text=text, content_type='text/html')
+    
+    async def listing(self, request: web.Request) -> web.Response:
+        error = await self._delay_or_error()
+        if error:
+            return error
+        source, page = request.match_info['source'], int(request.match_info['page'])
+        ids = [f'{page}-{n}' for n in range(self.per_page)] if page <= self.pages else []
+        items = '\n'.join(
+            f'    <li class="item"><a href="/{source}/detail/{activity_id}" class="title">공고 {activity_id}</a>'
+            f'<span class="badge">D-{n % 30}</span></li>'
+            for n, activity_id in enumerate(ids)
+        )
+        pagination = ' '.join(f'<a href="/{source}/list/{p}">{p}</a>' for p in range(1, self.pages + 1))
+        return self._html(render(self.fixtures['listing'], {
+            'source': source, 'page': page, 'items': items, 'pagination': pagination
+        }))
+    
+    def activity(self, source: str, activity_id: str) -> Dict[str, object]:
+        """id 별 공고 내용 (duplicate_rate 만큼은 다른 소스와 같은 공고)"""
+        shared = zlib.crc32(f'dup:{activity_id}'.encode()) % 1000 < self.duplicate_rate * 1000
+        rng = random.Random(activity_id if shared else f'{source}:{activity_id}')
+        topic, kind = rng.choice(TOPICS), rng.choice(KINDS)
+        start_day = rng.randint(1, 20)
+        return {
+            'id': activity_id,
+            'title': f"{rng.choice(ORGANIZATIONS)} {' '.join(rng.sample(WORDS, 3))} {topic} {kind} {rng.randint(1, 30)}기",
+            'organization': rng.choice(ORGANIZATIONS),
+            'topic': topic,
+            'kind': kind,
+            'period': f'2025.03.{start_day:02d}(토) ~ 2025.04.{start_day + 5:02d}(일) 18:00',
+            'prize': rng.choice([100, 300, 500, 1000, 3000]),
+            'description': ' '.join(rng.choices(WORDS + TOPICS, k=40)) + '. Python, Figma, 마케팅 역량을 갖춘 팀 환영.',
+            'related1': f'{rng.randint(1, 9)}-{rng.randint(0, 19)}',
+            'related2': f'{rng.randint(1, 9)}-{rng.randint(0, 19)}'
+        }
+    
+    async def detail(self, request: web.Request) -> web.Response:
+        error = await self._delay_or_error()
+        if error:
+            return error
+        source, activity_id = request.match_info['source'], request.match_info['id']
+        return self._html(render(self.fixtures[source], self.activity(source, activity_id)))
+
+class StandInSupabase:
+    """크롤러가 쓰는 만큼의 supabase-py 쿼리 빌더를 메모리 테이블로 흉내내는 대체 DB
+    
+    execute() 한 번을 DB 왕복 한 번으로 세고, rtt_ms 만큼 (동기 클라이언트처럼) 기다린다.
+    """
+    PRIMARY_KEYS = {'activities': 'url', 'crawl_checkpoints': 'source'}
+    
+    def __init__(self, rtt_ms: float = 0.0):
+        self.rtt_ms = rtt_ms
+        self.tables: Dict[str, Dict[object, dict]] = {}
+        self.round_trips: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._next_id = 0
+    
+    def table(self, name: str) -> '_StandInQuery':
+        return _StandInQuery(self, name)
+    
+    def _execute(self, query: '_StandInQuery') -> '_StandInResponse':
+        if self.rtt_ms:
+            time.sleep(self.rtt_ms / 1000)
+        with self._lock:
+            key = f'{query.name}.{query.operation}'
+            self.round_trips[key] = self.round_trips.get(key, 0) + 1
+            table = self.tables.setdefault(query.name, {})
+            
+            if query.operation == 'upsert':
+                pk = query.on_conflict or self.PRIMARY_KEYS.get(query.name, 'id')
+                for row in query.rows:
+                    existing = table.get(row.get(pk))
+                    if existing is None:
+                        self._next_id += 1
+                        existing = {'id': self._next_id}
+                    table[row.get(pk)] = {**existing, **row}
+                return _StandInResponse([dict(row) for row in query.rows])
+            
+            rows = [row for row in table.values() if all(match(row) for match in query.filters)]
+            if query.order_by:
+                rows.sort(key=lambda row: row.get(query.order_by))
+            if query.limit_to is not None:
+                rows = rows[:query.limit_to]
+            columns = query.columns
+            return _StandInResponse([
+                row if columns is None else {column: row.get(column) for column in columns}
+                for row in rows
+            ])
+
+class _StandInResponse:
+    def __init__(self, data: List[dict]):
+        self.data = data
+
+class _StandInQuery:
+    def __init__(self, db: StandInSupabase, name: str):
+        self.db = db
+        self.name = name
+        self.operation = 'select'
+        self.columns: Optional[List[str]] = None
+        self.filters = []
+        self.order_by: Optional[str] = None
+        self.limit_to: Optional[int] = None
+        self.rows: List[dict] = []
+        self.on_conflict: Optional[str] = None
+    
+    def select(self, columns: str = '*'):
+        self.columns = None if columns.strip() == '*' else [column.strip() for column in columns.split(',')]
+        return self
+    
+    def eq(self, column: str, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+    
+    def gt(self, column: str, value):
+        self.filters.append(lambda row: row.get(column) is not None and row.get(column) > value)
+        return self
+    
+    def in_(self, column: str, values: List):
+        values = set(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+    
+    def is_(self, column: str, value: str):
+        self.filters.append(lambda row: row.get(column) is None if value == 'null' else row.get(column) == value)
+        return self
+    
+    def order(self, column: str, desc: bool = False):
+        self.order_by = column
+        return self
+    
+    def limit(self, count: int):
+        self.limit_to = count
+        return self
+    
+    def upsert(self, rows, on_conflict: Optional[str] = None):
+        self.operation = 'upsert'
+        self.rows = rows if isinstance(rows, list) else [rows]
+        self.on_conflict = on_conflict
+        return self
+    
+    def execute(self) -> _StandInResponse:
+        return self.db._execute(self)
+
+async def crawl_listing_and_details(crawler: ActivityCrawler, source: str, listing_urls: List[str],
+                                    is_detail_url: Callable[[str], bool]) -> List[dict]:
+    """목록 페이지와 상세 페이지를 가져와 파싱
+    
+    목록 페이지를 동시에 요청하고, 목록이 파싱되는 대로 상세 페이지 요청을 시작한다.
+    모든 요청은 소스별 동시 요청/속도 제한을 함께 따르고, 파싱은 프로세스 풀(parse_stage)에서 한다.
+    목록은 캐시 본문으로도 링크를 뽑고, 지난 크롤링과 같은 상세 페이지는 파싱하지 않는다.
+    반환값은 parse_page 결과 목록.
+    """
+    details: List[dict] = []
+    seen = set()
+    
+    async def crawl_detail(url: str):
+        try:
+            start = time.perf_counter()
+            html = await crawler.fetch_page_if_changed(url, source)
+            if html is not None:
+                details.append(await crawler.parse_stage.parse(url, html, (time.perf_counter() - start) * 1000))
+        except Exception as e:
+            print(f"  ❌ 상세 페이지 오류: {url} - {str(e)}")
+    
+    async def crawl_listing(url: str):
+        try:
+            start = time.perf_counter()
+            html = await crawler.fetch_page(url, source)
+            listing = await crawler.parse_stage.parse(url, html, (time.perf_counter() - start) * 1000)
+        except Exception as e:
+            print(f"  ❌ 목록 페이지 오류: {url} - {str(e)}")
+            return
+        
+        detail_urls = [u for u in listing["links"] if is_detail_url(u) and u not in seen]
+        seen.update(detail_urls)
+        await asyncio.gather(*(crawl_detail(u) for u in detail_urls))
+    
+    await asyncio.gather(*(crawl_listing(url) for url in listing_urls))
+    return details
+
+async def crawl_fixture_source(crawler: ActivityCrawler, base_url: str, source: str):
+    """실제 crawl_* 메서드와 같은 흐름: 체크포인트 페이지 넘기기 → 목록/상세 가져오기 + 파싱 → 활동"""
+    async def listing(page: int) -> List[Dict]:
+        pages = await crawl_listing_and_details(
+            crawler, source, [f'{base_url}/{source}/list/{page}'], lambda url: f'/{source}/detail/' in url
+        )
+        activities = []
+        for parsed in pages:
+            period = _PERIOD.search(parsed['text'])
+            activities.append({
+                'title': parsed['title'],
+                'organization': None,
+                'category': 'contest',
+                'description': parsed['description'],
+                'application_period': period.group() if period else None,
+                'fields': parsed['fields'],
+                'url': parsed['url'],
+                'source': source
+            })
+        return activities
+    
+    async for data in crawler.paginate(source, listing):
+        yield {**data, 'difficulty_level': 'intermediate'}
+
+def rss_mb(who: int) -> float:
+    # Linux 는 KB, macOS 는 byte 단위
+    rss = resource.getrusage(who).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+async def run_scenario(args, latency_ms: float, error_rate: float) -> dict:
+    server = FixtureServer(args.pages, args.per_page, latency_ms, args.jitter_ms, error_rate, args.duplicate_rate)
+    base_url = await server.start()
+    db = StandInSupabase(args.db_rtt_ms)
+    
+    crawler = ActivityCrawler(full=True, supabase=db)
+    # 사이트 예절용 속도 제한 대신 크롤러 자체의 처리량을 잼
+    crawler.http.limits = {
+        source: SourceLimit(concurrency=args.concurrency, rate=10000.0, burst=args.concurrency)
+        for source in SOURCES
+    }
+    sources = {source: crawl_fixture_source(crawler, base_url, source) for source in SOURCES}
+    
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            report = await crawler.run(sources)
+    finally:
+        await server.stop()
+    seconds = time.perf_counter() - start
+    
+    collected = sum(stats['collected'] for stats in report['pipeline'].values())
+    round_trips = sum(db.round_trips.values())
+    return {
+        'latency_ms': latency_ms,
+        'error_rate': error_rate,
+        'activities': collected,
+        'rows': len(db.tables.get('activities', {})),
+        'duplicates': sum(stats['duplicates'] for stats in report['sources'].values()),
+        'seconds': round(seconds, 3),
+        'activities_per_second': round(collected / seconds, 1) if seconds else 0.0,
+        'http_requests': server.requests,
+        'injected_errors': server.injected_errors,
+        'mb_served': round(server.bytes_sent / (1024 * 1024), 2),
+        'db_round_trips': round_trips,
+        'db_round_trips_per_activity': round(round_trips / collected, 3) if collected else 0.0,
+        'db_round_trip_detail': dict(sorted(db.round_trips.items())),
+        'rss_peak_mb': rss_mb(resource.RUSAGE_SELF),
+        'workers_rss_peak_mb': rss_mb(resource.RUSAGE_CHILDREN)
+    }
+
+def compare(results: List[dict], baseline_path: str, tolerance: float) -> List[str]:
+    """기준 결과 대비 회귀 목록"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {(r['latency_ms'], r['error_rate']): r for r in json.load(f)['results']}
+    regressions = []
+    for result in results:
+        before = baseline.get((result['latency_ms'], result['error_rate']))
+        if not before:
+            continue
+        name = f"latency {result['latency_ms']}ms / errors {result['error_rate']:.0%}"
+        if result['activities_per_second'] < before['activities_per_second'] * (1 - tolerance):
+            regressions.append(
+                f"{name}: 활동/초 {before['activities_per_second']} → {result['activities_per_second']}"
+            )
+        if result['db_round_trips_per_activity'] > before['db_round_trips_per_activity'] * (1 + tolerance):
+            regressions.append(
+                f"{name}: 활동당 DB 왕복 {before['db_round_trips_per_activity']} → {result['db_round_trips_per_activity']}"
+            )
+    return regressions
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='크롤러 파이프라인 오프라인 벤치마크')
+    parser.add_argument('--pages', type=int, default=5, help='소스별 목록 페이지 수')
+    parser.add_argument('--per-page', type=int, default=20, help='목록 페이지당 공고 수')
+    parser.add_argument('--latency-ms', type=float, nargs='+', default=[0.0, 50.0], help='서버 응답 지연 (시나리오별)')
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, nargs='+', default=[0.0, 0.05], help='503 응답 비율 (시나리오별)')
+    parser.add_argument('--duplicate-rate', type=float, default=0.1, help='다른 소스와 같은 공고 비율')
+    parser.add_argument('--db-rtt-ms', type=float, default=0.0, help='대체 DB 왕복 지연')
+    parser.add_argument('--concurrency', type=int, default=8, help='소스별 동시 요청 수')
+    parser.add_argument('--workers', type=int, default=0, help='파싱 워커 수 (0 이면 CPU 수)')
+    parser.add_argument('--output', help='결과 JSON 저장 경로 (다음 실행의 --baseline)')
+    parser.add_argument('--baseline', help='비교할 이전 결과 JSON')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='허용 회귀 비율')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    
+    # 디스크 캐시 / 보고서 / 재시도 대기는 벤치마크 환경에 맞춤
+    workdir = tempfile.mkdtemp(prefix='crawler-bench-')
+    settings.crawler_http_cache = False
+    settings.crawler_report_dir = workdir
+    settings.crawler_prometheus_path = ''
+    settings.crawler_max_pages = args.pages + 1
+    settings.crawler_backoff_seconds = 0.01
+    settings.crawler_flush_seconds = 0.1
+    if args.workers:
+        settings.crawler_parse_workers = args.workers
+    
+    total = args.pages * args.per_page * len(SOURCES)
+    print(f"🏁 소스 {len(SOURCES)}개 x {args.pages}페이지 x {args.per_page}개 = 공고 {total}개, DB RTT {args.db_rtt_ms}ms")
+    print(f"{'latency':>8} | {'errors':>6} | {'acts':>5} | {'acts/s':>8} | {'seconds':>7} | {'http':>5} | "
+          f"{'503':>4} | {'db rt':>5} | {'rt/act':>6} | {'dups':>4} | {'rss MB':>6} | {'workers MB':>10}")
+    print("-" * 108)
+    
+    results = []
+    for latency_ms in args.latency_ms:
+        for error_rate in args.error_rate:
+            result = asyncio.run(run_scenario(args, latency_ms, error_rate))
+            results.append(result)
+            print(
+                f"{latency_ms:>6.0f}ms | {error_rate:>6.0%} | {result['activities']:>5} | "
+                f"{result['activities_per_second']:>8.1f} | {result['seconds']:>7.2f} | {result['http_requests']:>5} | "
+                f"{result['injected_errors']:>4} | {result['db_round_trips']:>5} | "
+                f"{result['db_round_trips_per_activity']:>6.3f} | {result['duplicates']:>4} | "
+                f"{result['rss_peak_mb']:>6.1f} | {result['workers_rss_peak_mb']:>10.1f}"
+            )
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'args': vars(args), 'results': results}, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.output}")
+    
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ 처리량 회귀 ({args.tolerance:.0%} 초과)")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print(f"\n✅ 기준 결과 대비 회귀 없음 (허용 {args.tolerance:.0%})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+대시보드 통계 벤치마크 (개별 쿼리 순차 / 동시 실행 vs dashboard_stats RPC)
+
+로컬 Postgres 를 Supabase 대신 사용한다. bench_dashboard 스키마에 테이블을 만들고
+app/sql/dashboard_stats.sql 을 설치한 뒤 같은 사용자에 대해 세 방식의 지연을 비교한다.
+--rtt-ms 로 Supabase(HTTP) 왕복 지연을 흉내낼 수 있다.
+
+실행: python -m app.benchmarks.dashboard_stats [--dsn postgresql://localhost/postgres]
+                                               [--users 200] [--rows 500] [--rtt-ms 0] [--repeat 20]
+필요 패키지: psycopg2
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import psycopg2
+
+SQL_PATH = os.path.join(os.path.dirname(__file__), '..', 'sql', 'dashboard_stats.sql')
+
+SCHEMA = """
+drop schema if exists bench_dashboard cascade;
+create schema bench_dashboard;
+set search_path to bench_dashboard;
+
+create table logs (id serial primary key, user_id text not null, created_at timestamptz not null);
+create table projects (id serial primary key, user_id text not null, status text not null);
+create table user_keywords (id serial primary key, user_id text not null);
+create table reflections (
+    id serial primary key, user_id text not null,
+    reflection_date date not null, progress_score integer
+);
+create table reflection_spaces (id serial primary key, user_id text not null, status text not null);
+
+create index on logs (user_id, created_at);
+create index on projects (user_id);
+create index on user_keywords (user_id);
+create index on reflections (user_id, reflection_date);
+create index on reflection_spaces (user_id);
+"""
+
+def seed(conn, users: int, rows: int):
+    rng = random.Random(42)
+    now = datetime.now()
+    with conn.cursor() as cur:
+        cur.execute(SCHEMA)
+        for u in range(users):
+            user_id = f"user-{u}"
+            cur.executemany(
+                "insert into logs (user_id, created_at) values (%s, %s)",
+                [(user_id, now - timedelta(days=rng.randint(0, 365))) for _ in range(rows)]
+            )
+            cur.executemany(
+                "insert into reflections (user_id, reflection_date, progress_score) values (%s, %s, %s)",
+                [(user_id, (now - timedelta(days=rng.randint(0, 365))).date(), rng.choice([None, 0, 1, 2, 3, 4, 5]))
+                 for _ in range(rows)]
+            )
+            cur.executemany(
+                "insert into projects (user_id, status) values (%s, %s)",
+                [(user_id, rng.choice(['active', 'completed'])) for _ in range(rows // 10)]
+            )
+            cur.executemany(
+                "insert into user_keywords (user_id) values (%s)",
+                [(user_id,) for _ in range(rows // 10)]
+            )
+            cur.executemany(
+                "insert into reflection_spaces (user_id, status) values (%s, %s)",
+                [(user_id, rng.choice(['active', 'completed'])) for _ in range(rows // 20)]
+            )
+        with open(SQL_PATH, encoding='utf-8') as f:
+            cur.execute(f.read())
+        cur.execute("analyze")
+
+def params():
+    now = datetime.now()
+    return {
+        "week_start": now - timedelta(days=7),
+        "month_start": now - timedelta(days=30),
+        "week_date": (now - timedelta(days=7)).date(),
+        "month_date": (now - timedelta(days=30)).date()
+    }
+
+# routes/dashboard.py collect_stats_queries 와 같은 12개 쿼리
+QUERIES = {
+    "logs_count": "select count(*) from logs where user_id = %(user_id)s",
+    "projects_count": "select count(*) from projects where user_id = %(user_id)s",
+    "keywords_count": "select count(*) from user_keywords where user_id = %(user_id)s",
+    "reflections_count": "select count(*) from reflections where user_id = %(user_id)s",
+    "active_spaces": "select count(*) from reflection_spaces where user_id = %(user_id)s and status = 'active'",
+    "active_projects": "select count(*) from projects where user_id = %(user_id)s and status = 'active'",
+    "this_week_logs": "select count(*) from logs where user_id = %(user_id)s and created_at >= %(week_start)s",
+    "this_week_reflections": "select count(*) from reflections where user_id = %(user_id)s and reflection_date >= %(week_date)s",
+    "this_month_logs": "select count(*) from logs where user_id = %(user_id)s and created_at >= %(month_start)s",
+    "this_month_reflections": "select count(*) from reflections where user_id = %(user_id)s and reflection_date >= %(month_date)s",
+    "reflections_data": "select progress_score from reflections where user_id = %(user_id)s",
+    "recent_dates": "select reflection_date from reflections where user_id = %(user_id)s order by reflection_date desc limit 30"
+}
+
+def run_query(conn, sql: str, args: dict, rtt: float):
+    time.sleep(rtt)
+    with conn.cursor() as cur:
+        cur.execute(sql, args)
+        return cur.fetchall()
+
+def summarize(results: dict) -> dict:
+    scores = [row[0] for row in results["reflections_data"] if row[0]]
+    stats = {name: rows[0][0] for name, rows in results.items() if name not in ("reflections_data", "recent_dates")}
+    stats["avg_progress_score"] = round(sum(scores) / len(scores), 2) if scores else 0
+    stats["recent_dates"] = [row[0].isoformat() for row in results["recent_dates"]]
+    return stats
+
+def sequential(conn, user_id: str, rtt: float) -> dict:
+    args = {"user_id": user_id, **params()}
+    return summarize({name: run_query(conn, sql, args, rtt) for name, sql in QUERIES.items()})
+
+def concurrent(pool: ThreadPoolExecutor, conns: list, user_id: str, rtt: float) -> dict:
+    args = {"user_id": user_id, **params()}
+    futures = {
+        name: pool.submit(run_query, conns[i], sql, args, rtt)
+        for i, (name, sql) in enumerate(QUERIES.items())
+    }
+    return summarize({name: future.result() for name, future in futures.items()})
+
+def rpc(conn, user_id: str, rtt: float) -> dict:
+    p = params()
+    rows = run_query(
+        conn,
+        "select dashboard_stats(%s, %s, %s, %s, %s)",
+        (user_id, p["week_start"], p["month_start"], p["week_date"], p["month_date"]),
+        rtt
+    )
+    data = rows[0][0]
+    return {
+        "logs_count": data["total_logs"],
+        "projects_count": data["total_projects"],
+        "keywords_count": data["total_keywords"],
+        "reflections_count": data["total_reflections"],
+        "active_spaces": data["active_spaces"],
+        "active_projects": data["active_projects"],
+        "this_week_logs": data["this_week_logs"],
+        "this_week_reflections": data["this_week_reflections"],
+        "this_month_logs": data["this_month_logs"],
+        "this_month_reflections": data["this_month_reflections"],
+        "avg_progress_score": round(float(data["avg_progress_score"]), 2),
+        "recent_dates": data["recent_dates"]
+    }
+
+def connect(dsn: str):
+    conn = psycopg2.connect(dsn, options="-c search_path=bench_dashboard")
+    conn.autocommit = True
+    return conn
+
+def measure(fn, repeat: int) -> list:
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description="dashboard_stats RPC 벤치마크")
+    parser.add_argument("--dsn", default=os.environ.get("BENCH_DATABASE_URL", "postgresql://localhost/postgres"))
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=500, help="사용자별 로그/회고 수")
+    parser.add_argument("--rtt-ms", type=float, default=0.0, help="쿼리당 추가 왕복 지연 (Supabase HTTP 흉내)")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    
+    rtt = args.rtt_ms / 1000
+    conn = connect(args.dsn)
+    print(f"데이터 생성: 사용자 {args.users}명 x {args.rows}행")
+    seed(conn, args.users, args.rows)
+    
+    conns = [connect(args.dsn) for _ in QUERIES]
+    pool = ThreadPoolExecutor(max_workers=len(QUERIES))
+    
+    user = lambda i: f"user-{i % args.users}"
+    
+    # 결과 일치 확인
+    expected = sequential(conn, user(0), 0)
+    if rpc(conn, user(0), 0) != expected or concurrent(pool, conns, user(0), 0) != expected:
+        print("[ERROR] RPC 결과가 개별 쿼리 결과와 다릅니다")
+        sys.exit(1)
+    
+    print(f"\n{'mode':>12} | {'round trips':>11} | {'p50':>9} | {'p95':>9}")
+    print("-" * 52)
+    for name, trips, fn in [
+        ("sequential", len(QUERIES), lambda i: sequential(conn, user(i), rtt)),
+        ("concurrent", len(QUERIES), lambda i: concurrent(pool, conns, user(i), rtt)),
+        ("rpc", 1, lambda i: rpc(conn, user(i), rtt))
+    ]:
+        samples = sorted(measure(fn, args.repeat))
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        print(f"{name:>12} | {trips:>11} | {statistics.median(samples):>7.2f}ms | {p95:>7.2f}ms")
+    
+    with conn.cursor() as cur:
+        cur.execute("drop schema bench_dashboard cascade")
+
+if __name__ == "__main__":
+    main()
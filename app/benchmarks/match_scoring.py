@@ -0,0 +1,92 @@
+"""
+추천 매칭 점수 벤치마크 (활동별 루프 vs NumPy 일괄 계산)
+
+실행: python -m app.benchmarks.match_scoring [활동 수 ...]
+기본값: 1000 10000 100000
+"""
+
+import random
+import sys
+import os
+import time
+from datetime import date, timedelta
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from app.routes.activities import calculate_match_score
+from app.utils.match_scoring import ActivityMatrix, batch_match_scores
+
+FIELDS = ['IT', '기획', '디자인', '경영', '교육', '예술', '의료', '환경', '사회', '기타']
+KEYWORDS = [
+    'Python', 'Java', 'JavaScript', 'React', 'AI', '머신러닝', '딥러닝', '앱개발', '웹개발',
+    '기획서', '전략', '마케팅', 'SNS', '브랜딩', '포토샵', '일러스트', 'Figma', 'UX', 'UI',
+    '창업', '사업계획서', '투자', '경영전략', '대학생', '청년', '팀프로젝트', '개인참가', '온라인', '오프라인'
+]
+MAJORS = [
+    '전공무관', '컴퓨터공학', '소프트웨어공학', '정보통신공학', '인공지능학과', '경영학', '경제학',
+    '광고홍보학', '미디어커뮤니케이션', '시각디자인', '산업디자인', '회계학', '교육학', '사회복지학'
+]
+DIFFICULTIES = ['beginner', 'intermediate', 'advanced']
+
+def make_activities(n: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    return [
+        {
+            'id': str(i),
+            'fields': rng.sample(FIELDS, rng.randint(0, 3)),
+            'keywords': rng.sample(KEYWORDS, rng.randint(0, 10)),
+            'recommended_majors': rng.sample(MAJORS, rng.randint(0, 5)),
+            'difficulty_level': rng.choice(DIFFICULTIES + [None]),
+            'application_end_date': (date.today() + timedelta(days=rng.randint(0, 60))).isoformat()
+        }
+        for i in range(n)
+    ]
+
+def make_user(seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    return {
+        'major': rng.choice(MAJORS[1:]),
+        'skill_keywords': rng.sample(KEYWORDS, 5),
+        'interested_fields': rng.sample(FIELDS, 2),
+        'preferred_difficulty': rng.choice(DIFFICULTIES)
+    }
+
+def timed(fn, repeat: int = 3) -> tuple:
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+    user = make_user()
+
+    print(
+        f"{'activities':>10} | {'loop':>10} | {'encode':>10} | {'batch':>10} | "
+        f"{'scores only':>11} | {'top-20':>9} | {'speedup':>7} | equal"
+    )
+    print("-" * 100)
+
+    for n in sizes:
+        activities = make_activities(n)
+
+        loop_time, expected = timed(lambda: [calculate_match_score(user, a) for a in activities])
+
+        # 활동 인코딩은 카탈로그가 바뀔 때 한 번, 이후 사용자별 계산은 행렬 재사용
+        encode_time, matrix = timed(lambda: ActivityMatrix(activities))
+        batch_time, actual = timed(lambda: list(zip(matrix.scores(user).tolist(), matrix.reasons(user))))
+        scores_time, _ = timed(lambda: matrix.scores(user))
+        top_time, _ = timed(lambda: matrix.top_k(user, 20))
+
+        equal = expected == actual == batch_match_scores(user, activities)
+        print(
+            f"{n:>10} | {loop_time * 1000:>8.1f}ms | {encode_time * 1000:>8.1f}ms | {batch_time * 1000:>8.1f}ms | "
+            f"{scores_time * 1000:>9.2f}ms | {top_time * 1000:>7.2f}ms | {loop_time / scores_time:>6.1f}x | {equal}"
+        )
+
+if __name__ == "__main__":
+    main()
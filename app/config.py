@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 
 class Settings(BaseSettings):
     # Supabase Configuration
@@ -25,6 +25,78 @@ class Settings(BaseSettings):
     openai_api_key: str = ""
     openai_model: str = "gpt-4-turbo-preview"
     
+    # 추천 활동 인메모리 인덱스 (초 단위)
+    activity_index_refresh_seconds: int = 60
+    activity_index_full_rebuild_seconds: int = 3600
+    
+    # 사전 계산 추천 목록 (batch/recommendation_jobs.py) 사용자별 저장 개수
+    recommendation_materialized_limit: int = 200
+    
+    # Supabase 쿼리 동시 실행 스레드 수 (utils/fanout.py)
+    query_fanout_workers: int = 16
+    
+    # 대시보드 통계 집계 방식: auto(RPC 우선, 실패 시 개별 쿼리) | rpc | queries
+    dashboard_stats_mode: str = "auto"
+    dashboard_rpc_retry_seconds: int = 300
+    
+    # 사용자별 대시보드 통계 캐시 TTL (utils/stats_cache.py)
+    dashboard_cache_ttl_seconds: int = 60
+    # 캐시에 둘 최대 사용자 수 (넘으면 가장 오래 안 쓴 사용자부터 제거)
+    dashboard_cache_max_users: int = 10000
+    
+    # 회고 리마인더 알림 한 번에 insert 할 행 수 (batch/reflection_jobs.py)
+    reminder_batch_size: int = 500
+    # 이미 보낸 리마인더 조회 시 in_() 한 번에 넣을 사용자 수 (요청 URL 길이 제한)
+    reminder_lookup_batch_size: int = 100
+    
+    # 통합 검색 역색인 (utils/search_index.py): 파티션 재적재 주기 / 증분 조회 주기 / 메모리에 둘 사용자 수 / 종류별 결과 수
+    search_index_ttl_seconds: int = 600
+    search_index_sync_seconds: int = 30
+    search_index_max_users: int = 1000
+    search_result_limit: int = 20
+    # 검색 요청당 상한: 종류별 결과 수 / 색인 적재를 기다리는 시간 (넘으면 준비된 종류만으로 응답)
+    search_result_max_limit: int = 50
+    search_timeout_ms: int = 300
+    
+    # 이름 자동완성 (utils/autocomplete.py): 재적재 주기 / 종류별 후보 수 / 접두어 구간에서 훑을 최대 키 수
+    autocomplete_refresh_seconds: int = 300
+    autocomplete_limit: int = 8
+    autocomplete_scan_limit: int = 500
+    
+    # 키워드 마스터 캐시 재조회 주기 (utils/keyword_cache.py)
+    keyword_cache_ttl_seconds: int = 300
+    
+    # 크롤러 HTTP 클라이언트 (crawlers/http_client.py)
+    crawler_max_connections: int = 20
+    crawler_timeout_seconds: int = 20
+    crawler_max_retries: int = 3
+    crawler_backoff_seconds: float = 0.5
+    # 소스별 제한 덮어쓰기 (JSON) 예: {"wevity": {"concurrency": 1, "rate": 0.5, "burst": 1}}
+    crawler_source_limits: Dict[str, dict] = {}
+    # 조건부 GET 디스크 캐시 (crawlers/http_cache.py)
+    crawler_http_cache: bool = True
+    crawler_cache_dir: str = ".cache/crawler"
+    # 파싱 프로세스 풀 (crawlers/parse_pool.py), workers 0 이면 CPU 수
+    crawler_html_parser: str = "lxml"
+    crawler_parse_workers: int = 0
+    crawler_parse_queue_size: int = 100
+    # 스트리밍 파이프라인 (crawlers/pipeline.py)
+    crawler_pipeline_queue_size: int = 500
+    crawler_source_timeout_seconds: float = 600
+    crawler_flush_seconds: float = 2.0
+    # 저장 전 기존 content_hash 조회 시 in_() 한 번에 넣을 url 수 (요청 URL 길이 제한, upsert 묶음과 별도)
+    crawler_save_lookup_batch_size: int = 30
+    # 소스별 체크포인트 (crawlers/checkpoints.py): 실행당 최대 목록 페이지 / 기억할 최신 url 수
+    crawler_max_pages: int = 50
+    crawler_known_urls: int = 50
+    # 소스 간 중복 탐지 (crawlers/dedupe.py): MinHash 유사도 기준 / 마감일 허용 차이
+    crawler_dedupe: bool = True
+    crawler_dedupe_threshold: float = 0.6
+    crawler_dedupe_date_tolerance_days: int = 3
+    # 실행 보고서 (crawlers/metrics.py): JSON 저장 위치 / Prometheus 텍스트 파일 경로 (빈 값이면 쓰지 않음)
+    crawler_report_dir: str = "reports/crawler"
+    crawler_prometheus_path: str = ""
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
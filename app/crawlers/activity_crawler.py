@@ -1,15 +1,20 @@
 """
 공모전/프로젝트/동아리/서포터즈 크롤링 스크립트
 
-실행: python -m app.crawlers.activity_crawler
+실행: python -m app.crawlers.activity_crawler [--full] [--profile]
+  (기본은 소스별 체크포인트를 이용한 증분 크롤링, --full 은 처음부터 전체 크롤링)
+  --profile 은 파싱 단계를 cProfile 로 측정해 소스별 .prof 파일과 상위 함수를 보고서에 남긴다.
+  실행 보고서(소스별 지표)는 settings.crawler_report_dir 에 JSON 으로 저장된다.
+
+저장 시 activities.url 에 unique 제약, activities.content_hash(text) / duplicate_of(text) 컬럼이 필요하다.
 """
 
 import asyncio
-import aiohttp
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
-import re
-from typing import List, Dict
+from datetime import datetime, timedelta, timezone
+import time
+import json
+import hashlib
+from typing import AsyncIterator, Awaitable, Callable, List, Dict, Optional
 import sys
 import os
 
@@ -18,97 +23,103 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 
 from app.database import get_supabase
 from app.config import settings
+from app.utils.paging import chunked
+from app.crawlers.http_client import CrawlerHttpClient, source_of
+from app.crawlers.http_cache import HttpCache
+from app.crawlers.parse_pool import ParseStage
+from app.crawlers.pipeline import CrawlPipeline
+from app.crawlers.checkpoints import SourceCheckpoint, paginate
+from app.crawlers.dedupe import NearDuplicateIndex
+from app.crawlers.dates import DateNormalizer
+from app.crawlers.metrics import CrawlMetrics
+from app.crawlers.classify import extract_fields, extract_keywords, get_recommended_majors
+
+# upsert 한 번에 처리할 활동 수 (기존 해시 조회는 settings.crawler_save_lookup_batch_size 씩)
+SAVE_BATCH_SIZE = 200
 
 class ActivityCrawler:
-    def __init__(self):
-        self.supabase = get_supabase()
+    def __init__(self, full: bool = False, profile: bool = False, supabase=None):
+        # supabase: 다른 클라이언트로 저장할 때 (벤치마크의 로컬 대체 DB 등)
+        self.supabase = supabase or get_supabase()
+        # full=True 면 체크포인트를 무시하고 처음부터 전체 크롤링
+        self.full = full
+        self.profile = profile
+        # 소스별 페이지 / 상태 코드 / 단계별 지연 / 중복 / 저장 지표 (실행 보고서)
+        self.metrics = CrawlMetrics()
+        self.checkpoints: Dict[str, SourceCheckpoint] = {}
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        # 실행 동안 공유하는 커넥션 풀 + 소스별 동시 요청/속도 제한 + 조건부 GET 캐시
+        cache = HttpCache(settings.crawler_cache_dir) if settings.crawler_http_cache else None
+        self.http = CrawlerHttpClient(self.headers, cache=cache, metrics=self.metrics)
+        # HTML 파싱 + 분류는 프로세스 풀에서 (이벤트 루프를 막지 않도록), 처음 parse() 할 때 시작
+        self.parse_stage = ParseStage(metrics=self.metrics, profile=profile)
+        # 소스 간 중복 활동 색인 (run 시작 시 activities 로 구성)
+        self.dedupe = NearDuplicateIndex() if settings.crawler_dedupe else None
+        # 날짜 정규화 (연도 추론 기준 = 이번 실행 시각, 반복되는 문자열은 기억)
+        self.dates = DateNormalizer()
     
-    async def fetch_page(self, url: str) -> str:
+    async def fetch_page(self, url: str, source: str = None) -> str:
         """페이지 가져오기"""
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=self.headers) as response:
-                return await response.text()
+        return await self.http.fetch(source or source_of(url), url)
+    
+    async def fetch_page_if_changed(self, url: str, source: str = None) -> Optional[str]:
+        """지난 크롤링 이후 바뀐 페이지만 반환 (304 또는 본문이 같으면 None → 파싱 생략)"""
+        result = await self.http.fetch_result(source or source_of(url), url)
+        return result.text if result.changed else None
+    
+    def paginate(self, source: str, fetch_listing: Callable[[int], Awaitable[List[Dict]]]) -> AsyncIterator[Dict]:
+        """소스 체크포인트를 따라 목록 페이지 넘기기 (이어하기 + 이미 본 활동에서 중단)"""
+        checkpoint = self.checkpoints[source] = SourceCheckpoint(self.supabase, source, full=self.full)
+        return paginate(checkpoint, fetch_listing)
+    
+    def _by_source(self, activities: List[Dict]) -> Dict[str, List[str]]:
+        by_source: Dict[str, List[str]] = {}
+        for activity in activities:
+            by_source.setdefault(activity.get('source'), []).append(activity['url'])
+        return by_source
+    
+    def mark_written(self, activities: List[Dict]):
+        """저장된 활동을 소스별 체크포인트에 반영"""
+        for source, urls in self._by_source(activities).items():
+            if source in self.checkpoints:
+                self.checkpoints[source].written(urls)
+    
+    def mark_failed(self, activities: List[Dict]):
+        """보강/저장에 실패한 활동은 체크포인트가 기다리지 않게 함"""
+        for source, urls in self._by_source(activities).items():
+            if source in self.checkpoints:
+                self.checkpoints[source].failed(urls)
     
     def extract_fields(self, text: str) -> List[str]:
         """분야 추출"""
-        field_mapping = {
-            'IT': ['개발', '프로그래밍', '코딩', '소프트웨어', 'SW', '앱', '웹', '서버', '인공지능', 'AI', '머신러닝', '데이터', '빅데이터'],
-            '기획': ['기획', '전략', '마케팅', '브랜드', '사업', '비즈니스'],
-            '디자인': ['디자인', 'UX', 'UI', '그래픽', '시각', '영상', '편집'],
-            '경영': ['경영', '경제', '금융', '회계', '재무'],
-            '교육': ['교육', '멘토링', '강의', '튜터'],
-            '예술': ['예술', '미술', '음악', '공연', '문화'],
-            '의료': ['의료', '간호', '보건', '제약'],
-            '환경': ['환경', '에너지', '지속가능', '친환경'],
-            '사회': ['봉사', '복지', '사회', '공익']
-        }
-        
-        detected = set()
-        text_lower = text.lower()
-        
-        for field, keywords in field_mapping.items():
-            if any(keyword in text or keyword.lower() in text_lower for keyword in keywords):
-                detected.add(field)
-        
-        return list(detected) if detected else ['기타']
+        return extract_fields(text)
     
     def extract_keywords(self, text: str, fields: List[str]) -> List[str]:
         """키워드 추출"""
-        keywords = set()
-        
-        # 분야별 키워드
-        field_keywords = {
-            'IT': ['Python', 'Java', 'JavaScript', 'React', 'AI', '머신러닝', '딥러닝', '앱개발', '웹개발'],
-            '기획': ['기획서', '전략', '마케팅', 'SNS', '브랜딩'],
-            '디자인': ['포토샵', '일러스트', 'Figma', 'UX', 'UI'],
-            '경영': ['창업', '사업계획서', '투자', '경영전략']
-        }
-        
-        for field in fields:
-            if field in field_keywords:
-                for keyword in field_keywords[field]:
-                    if keyword.lower() in text.lower():
-                        keywords.add(keyword)
-        
-        # 일반 키워드
-        common_keywords = ['대학생', '청년', '팀프로젝트', '개인참가', '온라인', '오프라인']
-        for keyword in common_keywords:
-            if keyword in text:
-                keywords.add(keyword)
-        
-        return list(keywords)[:10]  # 최대 10개
+        return extract_keywords(text, fields)
     
     def parse_date(self, date_str: str) -> str:
-        """날짜 파싱"""
-        if not date_str:
-            return None
-        
-        try:
-            # YYYY-MM-DD 형식
-            if re.match(r'\d{4}-\d{2}-\d{2}', date_str):
-                return date_str
-            
-            # YYYY.MM.DD 형식
-            if re.match(r'\d{4}\.\d{2}\.\d{2}', date_str):
-                return date_str.replace('.', '-')
-            
-            # MM/DD 형식 (올해)
-            if re.match(r'\d{2}/\d{2}', date_str):
-                month, day = date_str.split('/')
-                return f"2025-{month}-{day}"
-            
-        except:
-            pass
-        
-        return None
+        """날짜 파싱 (기간이면 마감일)"""
+        return self.dates.parse(date_str)
+    
+    def normalize_dates(self, data: Dict) -> Dict:
+        """모집 기간 원문(application_period)과 날짜 필드를 ISO 날짜로 정규화"""
+        data = dict(data)
+        period = data.pop('application_period', None)
+        if period:
+            start, end = self.dates.parse_range(period)
+            data.setdefault('application_start_date', start)
+            data.setdefault('application_end_date', end)
+        for key in ('application_start_date', 'application_end_date'):
+            if data.get(key):
+                data[key] = self.parse_date(data[key])
+        return data
     
-    async def crawl_linkareer(self) -> List[Dict]:
+    async def crawl_linkareer(self) -> AsyncIterator[Dict]:
         """링커리어 크롤링"""
         print("🔍 링커리어 크롤링 시작...")
-        activities = []
         
         # 실제 크롤링 대신 샘플 데이터 (실제 구현 시 Selenium 필요)
         sample_data = [
@@ -138,26 +149,15 @@ class ActivityCrawler:
             }
         ]
         
-        for data in sample_data:
-            fields = data.get('fields', [])
-            activity = {
-                **data,
-                'keywords': self.extract_keywords(data['title'] + ' ' + data['description'], fields),
-                'tags': fields,
-                'status': 'active',
-                'crawled_at': datetime.now().isoformat(),
-                'difficulty_level': 'intermediate',
-                'recommended_majors': self.get_recommended_majors(fields)
-            }
-            activities.append(activity)
+        async def listing(page: int) -> List[Dict]:
+            return sample_data if page == 1 else []
         
-        print(f"  ✅ {len(activities)}개 활동 수집")
-        return activities
+        async for data in self.paginate('linkareer', listing):
+            yield {**data, 'difficulty_level': 'intermediate'}
     
-    async def crawl_wevity(self) -> List[Dict]:
+    async def crawl_wevity(self) -> AsyncIterator[Dict]:
         """위비티 크롤링"""
         print("🔍 위비티 크롤링 시작...")
-        activities = []
         
         sample_data = [
             {
@@ -186,26 +186,15 @@ class ActivityCrawler:
             }
         ]
         
-        for data in sample_data:
-            fields = data.get('fields', [])
-            activity = {
-                **data,
-                'keywords': self.extract_keywords(data['title'] + ' ' + data['description'], fields),
-                'tags': fields,
-                'status': 'active',
-                'crawled_at': datetime.now().isoformat(),
-                'difficulty_level': 'beginner',
-                'recommended_majors': self.get_recommended_majors(fields)
-            }
-            activities.append(activity)
+        async def listing(page: int) -> List[Dict]:
+            return sample_data if page == 1 else []
         
-        print(f"  ✅ {len(activities)}개 활동 수집")
-        return activities
+        async for data in self.paginate('wevity', listing):
+            yield {**data, 'difficulty_level': 'beginner'}
     
-    async def crawl_thinkpool(self) -> List[Dict]:
+    async def crawl_thinkpool(self) -> AsyncIterator[Dict]:
         """씽굿 크롤링"""
         print("🔍 씽굿 크롤링 시작...")
-        activities = []
         
         sample_data = [
             {
@@ -234,26 +223,15 @@ class ActivityCrawler:
             }
         ]
         
-        for data in sample_data:
-            fields = data.get('fields', [])
-            activity = {
-                **data,
-                'keywords': self.extract_keywords(data['title'] + ' ' + data['description'], fields),
-                'tags': fields,
-                'status': 'active',
-                'crawled_at': datetime.now().isoformat(),
-                'difficulty_level': 'intermediate',
-                'recommended_majors': self.get_recommended_majors(fields)
-            }
-            activities.append(activity)
+        async def listing(page: int) -> List[Dict]:
+            return sample_data if page == 1 else []
         
-        print(f"  ✅ {len(activities)}개 활동 수집")
-        return activities
+        async for data in self.paginate('thinkpool', listing):
+            yield {**data, 'difficulty_level': 'intermediate'}
     
-    async def crawl_onoffmix(self) -> List[Dict]:
+    async def crawl_onoffmix(self) -> AsyncIterator[Dict]:
         """온오프믹스 크롤링"""
         print("🔍 온오프믹스 크롤링 시작...")
-        activities = []
         
         sample_data = [
             {
@@ -270,115 +248,223 @@ class ActivityCrawler:
             }
         ]
         
-        for data in sample_data:
-            fields = data.get('fields', [])
-            activity = {
-                **data,
-                'keywords': self.extract_keywords(data['title'] + ' ' + data['description'], fields),
-                'tags': fields,
-                'status': 'active',
-                'crawled_at': datetime.now().isoformat(),
-                'difficulty_level': 'advanced',
-                'recommended_majors': self.get_recommended_majors(fields)
-            }
-            activities.append(activity)
+        async def listing(page: int) -> List[Dict]:
+            return sample_data if page == 1 else []
         
-        print(f"  ✅ {len(activities)}개 활동 수집")
-        return activities
+        async for data in self.paginate('onoffmix', listing):
+            yield {**data, 'difficulty_level': 'advanced'}
     
     def get_recommended_majors(self, fields: List[str]) -> List[str]:
         """분야별 추천 학과"""
-        major_mapping = {
-            'IT': ['컴퓨터공학', '소프트웨어공학', '정보통신공학', '인공지능학과'],
-            '기획': ['경영학', '경제학', '광고홍보학', '미디어커뮤니케이션'],
-            '디자인': ['시각디자인', '산업디자인', '인터랙션디자인', '영상디자인'],
-            '경영': ['경영학', '경제학', '회계학', '국제통상학'],
-            '교육': ['교육학', '사범대학'],
-            '의료': ['의학', '간호학', '약학', '보건학'],
-            '환경': ['환경공학', '에너지공학'],
-            '사회': ['사회복지학', '행정학', '정치외교학']
+        return get_recommended_majors(fields)
+    
+    @staticmethod
+    def content_hash(activity: Dict) -> str:
+        """수집 시각을 제외한 활동 내용 해시 (변경 감지용)"""
+        content = {key: value for key, value in activity.items() if key not in ('crawled_at', 'content_hash')}
+        payload = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def enrich(self, data: Dict) -> Dict:
+        """수집한 활동의 날짜 정규화 + 키워드 / 태그 / 추천 학과 추가"""
+        data = self.normalize_dates(data)
+        fields = data.get('fields', [])
+        return {
+            **data,
+            'keywords': self.extract_keywords(data['title'] + ' ' + data.get('description', ''), fields),
+            'tags': fields,
+            'status': 'active',
+            'crawled_at': datetime.now().isoformat(),
+            'recommended_majors': self.get_recommended_majors(fields)
         }
-        
-        majors = set(['전공무관'])  # 기본적으로 전공무관 포함
-        
-        for field in fields:
-            if field in major_mapping:
-                majors.update(major_mapping[field])
-        
-        return list(majors)[:5]  # 최대 5개
     
-    def save_to_supabase(self, activities: List[Dict]):
-        """Supabase에 저장"""
-        print(f"\n💾 Supabase에 저장 중... (총 {len(activities)}개)")
+    def save_batch(self, activities: List[Dict]) -> Dict[str, int]:
+        """활동 묶음 저장
+        
+        SAVE_BATCH_SIZE 개씩 묶어 기존 content_hash 를 url 로 조회하고 (url 이 길어서 조회는 더 작게 나눔),
+        새 활동과 내용이 바뀐 활동만 upsert(on_conflict=url) 한다.
+        """
+        counts = {"saved": 0, "updated": 0, "unchanged": 0, "duplicates": 0, "errors": 0, "requests": 0}
+        start = time.perf_counter()
         
-        saved = 0
-        updated = 0
-        errors = 0
+        # 다른 url 로 이미 저장된 같은 활동이면 duplicate_of 로 연결
+        if self.dedupe is not None:
+            counts["duplicates"] = self.dedupe.link(activities)
         
+        # 같은 url 이 여러 번 수집되면 마지막 것만 사용
+        by_url = {}
         for activity in activities:
+            by_url[activity['url']] = {**activity, 'content_hash': self.content_hash(activity)}
+        
+        for batch in chunked(list(by_url.values()), SAVE_BATCH_SIZE):
             try:
-                # URL 기준 중복 체크
-                existing = self.supabase.table("activities")\
-                    .select("id")\
-                    .eq("url", activity['url'])\
-                    .execute()
-                
-                if not existing.data:
-                    # 새 활동 추가
-                    self.supabase.table("activities").insert(activity).execute()
-                    saved += 1
-                else:
-                    # 기존 활동 업데이트
-                    self.supabase.table("activities")\
-                        .update(activity)\
-                        .eq("id", existing.data[0]['id'])\
+                existing = {}
+                for urls in chunked([activity['url'] for activity in batch], settings.crawler_save_lookup_batch_size):
+                    existing_response = self.supabase.table("activities")\
+                        .select("url, content_hash")\
+                        .in_("url", urls)\
                         .execute()
-                    updated += 1
-                    
+                    counts["requests"] += 1
+                    existing.update({row['url']: row.get('content_hash') for row in existing_response.data or []})
+                
+                changed = [activity for activity in batch if existing.get(activity['url']) != activity['content_hash']]
+                counts["unchanged"] += len(batch) - len(changed)
+                if not changed:
+                    continue
+                
+                # 증분 동기화(utils/activity_index.py)가 updated_at 으로 변경을 찾으므로 직접 갱신 (트리거 없음)
+                updated_at = datetime.now(timezone.utc).isoformat()
+                # 묶음 upsert 는 모든 행의 컬럼이 같아야 함 → 빠진 컬럼을 None 으로 채우면 기존 값을 덮어쓰므로
+                # 컬럼 구성이 같은 행끼리 나눠서 upsert
+                groups: Dict[frozenset, List[Dict]] = {}
+                for activity in changed:
+                    row = {**activity, 'updated_at': updated_at}
+                    groups.setdefault(frozenset(row), []).append(row)
+                for rows in groups.values():
+                    self.supabase.table("activities").upsert(rows, on_conflict="url").execute()
+                    counts["requests"] += 1
+                
+                new_count = sum(1 for activity in changed if activity['url'] not in existing)
+                counts["saved"] += new_count
+                counts["updated"] += len(changed) - new_count
+            
             except Exception as e:
-                print(f"  ❌ 오류: {activity['title']} - {str(e)}")
-                errors += 1
+                print(f"  ❌ 오류: {len(batch)}개 묶음 - {str(e)}")
+                counts["errors"] += len(batch)
         
-        print(f"  ✅ 저장: {saved}개")
-        print(f"  🔄 업데이트: {updated}개")
-        if errors:
-            print(f"  ❌ 오류: {errors}개")
+        self.metrics.record_save(activities, len(activities) - counts["errors"], time.perf_counter() - start)
+        return counts
+    
+    def print_save_counts(self, counts: Dict[str, int]):
+        print(f"  ✅ 저장: {counts.get('saved', 0)}개")
+        print(f"  🔄 업데이트: {counts.get('updated', 0)}개")
+        print(f"  ⏭️  변경 없음: {counts.get('unchanged', 0)}개")
+        if counts.get('duplicates'):
+            print(f"  🔗 중복 연결: {counts['duplicates']}개")
+        if counts.get('errors'):
+            print(f"  ❌ 오류: {counts['errors']}개")
+        if counts.get('callback_errors'):
+            print(f"  ❌ 체크포인트 알림 오류: {counts['callback_errors']}회")
+        print(f"  📡 요청 수: {counts.get('requests', 0)}회")
     
-    async def run(self):
-        """전체 크롤링 실행"""
+    def save_to_supabase(self, activities: List[Dict]):
+        """Supabase에 저장"""
+        print(f"\n💾 Supabase에 저장 중... (총 {len(activities)}개)")
+        counts = self.save_batch(activities)
+        self.print_save_counts(counts)
+        return counts
+    
+    def write_report(self, report: dict, cache_report: Dict[str, dict]):
+        """소스별 지표를 JSON 실행 보고서로 저장 (+ Prometheus 텍스트, --profile 이면 파싱 프로파일)"""
+        for source, stats in report["sources"].items():
+            self.metrics.set_items(source, stats["collected"])
+        
+        extra = {
+            "full": self.full,
+            "seconds": report["seconds"],
+            "pipeline": report["sources"],
+            "written": report["written"],
+            "cache": cache_report,
+            "stages": self.parse_stage.report()
+        }
+        if self.profile:
+            extra["profile"] = self.parse_stage.profile_report()
+            prefix = f"parse-{self.metrics.started_at.strftime('%Y%m%d-%H%M%S')}"
+            extra["profile_files"] = self.parse_stage.dump_profiles(settings.crawler_report_dir, prefix)
+        
+        run_report = self.metrics.report(**extra)
+        try:
+            path = self.metrics.write(run_report, settings.crawler_report_dir, settings.crawler_prometheus_path or None)
+        except OSError as e:
+            print(f"  ❌ 실행 보고서 저장 오류: {str(e)}")
+            return run_report
+        
+        print(f"\n📈 소스별 지표 (보고서: {path})")
+        for source, stats in run_report["sources"].items():
+            latency = stats["latency"]
+            print(f"  {source}: 페이지 {stats['pages']}개 ({stats['bytes'] / 1024:.0f}KB), 상태 {stats['status']}, "
+                  f"활동 {stats['items']}개, 중복 {stats['dedupe_ratio']:.0%}, 저장 {stats['written']}개")
+            print(f"     fetch p50/p99 {latency['fetch']['p50_ms']}/{latency['fetch']['p99_ms']}ms, "
+                  f"parse {latency['parse']['p50_ms']}/{latency['parse']['p99_ms']}ms, "
+                  f"save {latency['save']['p50_ms']}/{latency['save']['p99_ms']}ms")
+        print(f"  DB 저장 처리량: {run_report['save']['rows_per_second']}행/s")
+        for source, profile in run_report.get("profile", {}).items():
+            print(f"  🔬 {source} 파싱 프로파일: {profile['total_seconds']}s, 누적 시간 상위")
+            for row in profile["functions"][:5]:
+                print(f"     {row['cumtime']:>8.3f}s  {row['calls']:>7}회  {row['function']}")
+        return run_report
+    
+    def default_sources(self) -> Dict[str, AsyncIterator[Dict]]:
+        return {
+            "linkareer": self.crawl_linkareer(),
+            "wevity": self.crawl_wevity(),
+            "thinkpool": self.crawl_thinkpool(),
+            "onoffmix": self.crawl_onoffmix()
+        }
+    
+    async def run(self, sources: Optional[Dict[str, AsyncIterator[Dict]]] = None) -> dict:
+        """전체 크롤링 실행, 실행 보고서 반환
+        
+        소스별 수집 → 보강 → 묶음 저장을 스트리밍 파이프라인(crawlers/pipeline.py)으로 실행한다.
+        수집되는 대로 저장하고, 제한 시간을 넘긴 소스는 그 소스만 중단한다.
+        sources 를 주지 않으면 default_sources() (링커리어/위비티/씽굿/온오프믹스).
+        """
         print("=" * 60)
         print("🚀 활동 크롤링 시작")
         print("=" * 60)
         
-        all_activities = []
-        
-        # 병렬 크롤링
-        results = await asyncio.gather(
-            self.crawl_linkareer(),
-            self.crawl_wevity(),
-            self.crawl_thinkpool(),
-            self.crawl_onoffmix(),
-            return_exceptions=True
+        pipeline = CrawlPipeline(
+            enrich=self.enrich,
+            write_batch=self.save_batch,
+            batch_size=SAVE_BATCH_SIZE,
+            on_written=self.mark_written,
+            on_failed=self.mark_failed
         )
         
-        for result in results:
-            if isinstance(result, list):
-                all_activities.extend(result)
-            elif isinstance(result, Exception):
-                print(f"  ❌ 크롤링 오류: {str(result)}")
-        
-        print(f"\n📊 총 {len(all_activities)}개 활동 수집 완료")
+        if self.dedupe is not None:
+            start = time.perf_counter()
+            loaded = await asyncio.to_thread(self.dedupe.load, self.supabase)
+            print(f"🔗 중복 탐지 색인: {loaded}개 활동 ({time.perf_counter() - start:.1f}s)")
         
-        # Supabase에 저장
-        if all_activities:
-            self.save_to_supabase(all_activities)
+        # 병렬 크롤링 (세션은 모든 소스가 공유하고 끝나면 닫음)
+        # 파싱 풀은 HTML 을 가져와 파싱하는 수집기만 띄운다 (지금의 crawl_* 는 샘플 데이터라 띄우지 않고,
+        # 벤치마크의 fixture 크롤링이 사용). 띄웠으면 여기서 닫음
+        try:
+            async with self.http:
+                report = await pipeline.run(sources or self.default_sources())
+        finally:
+            await self.parse_stage.stop()
+        
+        for source, stats in report["sources"].items():
+            print(f"  ✅ {source}: {stats['collected']}개 활동 수집 ({stats['status']}, {stats['seconds']}s)")
+            checkpoint = self.checkpoints.get(source)
+            if checkpoint and not checkpoint.finished:
+                print(f"     ↪ 다음 실행은 {checkpoint.state.get('resume_page') or checkpoint.start_page}페이지부터 이어서 크롤링")
+            if checkpoint and checkpoint.failures:
+                print(f"     ⚠️ 보강/저장 실패 {checkpoint.failures}개 활동 (다음 실행에서 다시 시도)")
+        cache_report = self.http.cache_report()
+        for source, stats in self.http.stats.items():
+            print(f"  🌐 {source}: 요청 {stats['requests']}회, 재시도 {stats['retries']}회, 실패 {stats['errors']}회, "
+                  f"캐시 적중률 {cache_report[source]['hit_rate']:.0%} "
+                  f"(304 {stats['not_modified']}, 동일 본문 {stats['unchanged']}, 변경 {stats['fetched']})")
+        for stage, timing in self.parse_stage.report().items():
+            if timing['count']:
+                print(f"  ⏱️  {stage}: {timing['count']}건, 평균 {timing['avg_ms']}ms, p95 {timing['p95_ms']}ms, 합계 {timing['total_ms']}ms")
+        
+        collected = sum(stats['collected'] for stats in report["sources"].values())
+        print(f"\n📊 총 {collected}개 활동 수집 완료 ({report['seconds']}s)")
+        print("\n💾 Supabase 저장 결과")
+        self.print_save_counts(report["written"])
+        
+        run_report = self.write_report(report, cache_report)
         
         print("\n" + "=" * 60)
         print("✨ 크롤링 완료!")
         print("=" * 60)
+        return run_report
 
 async def main():
-    crawler = ActivityCrawler()
+    crawler = ActivityCrawler(full="--full" in sys.argv, profile="--profile" in sys.argv)
     await crawler.run()
 
 if __name__ == "__main__":
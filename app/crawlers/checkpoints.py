@@ -0,0 +1,165 @@
+"""
+소스별 크롤링 체크포인트 (이어하기 + 증분 크롤링)
+
+crawl_checkpoints 테이블: source(PK), state(jsonb), updated_at
+    state = {
+        "resume_page":     중단된 실행을 이어서 요청할 목록 페이지 (없으면 1페이지부터)
+        "pending_head":    진행 중인 실행이 처음 본 최신 활동 url (완료되면 known_urls 로 승격)
+        "known_urls":      지난 완료 실행까지 본 최신 활동 url (증분 크롤링 중단 기준)
+        "last_success_at": 마지막 완료 시각
+    }
+
+- 증분 크롤링: 목록 페이지에서 known_urls 에 있는 활동을 만나면 더 넘기지 않는다.
+- 체크포인트는 페이지의 활동이 모두 저장된 뒤에만 앞으로 옮긴다 (파이프라인 on_written).
+  중간에 죽어도 저장하지 못한 페이지부터 다시 요청한다.
+- 보강/저장에 실패한 활동(on_failed)이 있는 페이지는 넘기지 않고, 실행을 완료 처리하지도 않는다
+  (known_urls 유지 → 다음 실행이 그 페이지부터 다시 요청해 저장).
+"""
+
+import asyncio
+import threading
+from datetime import datetime, timezone
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set
+
+from app.config import settings
+
+CHECKPOINT_TABLE = "crawl_checkpoints"
+
+class SourceCheckpoint:
+    def __init__(self, supabase, source: str, full: bool = False):
+        self.supabase = supabase
+        self.source = source
+        self.state = {} if full else self._load()
+        self.known: Set[str] = set(self.state.get("known_urls") or [])
+        self.start_page = self.state.get("resume_page") or 1
+        self.head: List[str] = list(self.state.get("pending_head") or []) if self.start_page > 1 else []
+        self._collect_head = self.start_page == 1
+        self._outstanding: Dict[int, Set[str]] = {}
+        self._committed_page = self.start_page - 1
+        # 실패한 활동이 있는 페이지 (체크포인트가 넘어가지 않음)
+        self._failed_pages: Set[int] = set()
+        self._exhausted = False
+        self._closed = False
+        self.finished = False
+        self.failures = 0
+        # 목록 요청 쪽과 저장 쪽 스레드에서 함께 호출됨
+        self._lock = threading.Lock()
+    
+    def _load(self) -> dict:
+        response = self.supabase.table(CHECKPOINT_TABLE)\
+            .select("state")\
+            .eq("source", self.source)\
+            .execute()
+        return (response.data[0].get("state") if response.data else None) or {}
+    
+    def _save(self):
+        self.supabase.table(CHECKPOINT_TABLE).upsert({
+            "source": self.source,
+            "state": self.state,
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        }).execute()
+    
+    def page_emitted(self, page: int, urls: List[str]):
+        """목록 페이지에서 내보낸 활동 url 등록 (모두 저장되면 체크포인트 이동)"""
+        with self._lock:
+            # 처음부터 시작한 실행이면 앞쪽 페이지의 최신 url 을 다음 실행의 중단 기준으로 모음
+            if self._collect_head:
+                self.head = (self.head + urls)[:settings.crawler_known_urls]
+            self._outstanding[page] = set(urls)
+            self._advance()
+    
+    def exhausted(self):
+        """더 요청할 페이지가 없음 (끝 페이지 도달 또는 이미 본 활동 도달)"""
+        with self._lock:
+            self._exhausted = True
+            self._advance()
+    
+    def written(self, urls: List[str]):
+        """파이프라인이 저장을 마친 활동 url"""
+        with self._lock:
+            self._release(urls)
+    
+    def failed(self, urls: List[str]):
+        """보강/저장에 실패한 활동 url (그 페이지는 다음 실행에서 다시 요청)"""
+        with self._lock:
+            self.failures += len(urls)
+            for page, outstanding in self._outstanding.items():
+                if not outstanding.isdisjoint(urls):
+                    self._failed_pages.add(page)
+            self._release(urls)
+    
+    def _release(self, urls: List[str]):
+        for outstanding in self._outstanding.values():
+            outstanding.difference_update(urls)
+        self._advance()
+    
+    def _advance(self):
+        page = self._committed_page
+        while page + 1 in self._outstanding and not self._outstanding[page + 1] and page + 1 not in self._failed_pages:
+            page += 1
+            del self._outstanding[page]
+        
+        if self._exhausted and not any(self._outstanding.values()):
+            if not self._closed:
+                self._closed = True
+                if self.failures:
+                    self._keep_failed(page)
+                else:
+                    self._finish()
+            return
+        if page != self._committed_page:
+            self._committed_page = page
+            self.state = {**self.state, "resume_page": page + 1, "pending_head": self.head}
+            self._save()
+    
+    def _keep_failed(self, page: int):
+        """실패한 활동이 있으면 완료하지 않고 첫 실패 페이지부터 다시 요청하도록 남김"""
+        self._committed_page = page
+        if page:
+            self.state = {**self.state, "resume_page": page + 1, "pending_head": self.head}
+        else:
+            self.state = {**self.state, "resume_page": None, "pending_head": []}
+        self._save()
+    
+    def _finish(self):
+        known = list(dict.fromkeys(self.head + list(self.state.get("known_urls") or [])))
+        self.state = {
+            "resume_page": None,
+            "pending_head": [],
+            "known_urls": known[:settings.crawler_known_urls],
+            "last_success_at": datetime.now(timezone.utc).isoformat()
+        }
+        self._save()
+        self.finished = True
+
+async def paginate(checkpoint: SourceCheckpoint, fetch_listing: Callable[[int], Awaitable[List[Dict]]],
+                   max_pages: Optional[int] = None) -> AsyncIterator[Dict]:
+    """체크포인트 페이지부터 목록을 넘기며 활동을 내보냄 (이미 본 활동을 만나면 중단)
+    
+    fetch_listing(page) 는 최신순 목록 페이지의 활동 목록(url 포함)을 반환한다.
+    """
+    max_pages = max_pages or settings.crawler_max_pages
+    page = checkpoint.start_page
+    exhausted = False
+    while page < checkpoint.start_page + max_pages:
+        items = await fetch_listing(page)
+        new_items = []
+        reached_known = False
+        for item in items:
+            if item['url'] in checkpoint.known:
+                reached_known = True
+                break
+            new_items.append(item)
+        
+        await asyncio.to_thread(checkpoint.page_emitted, page, [item['url'] for item in new_items])
+        for item in new_items:
+            yield item
+        
+        if reached_known or not items:
+            exhausted = True
+            break
+        page += 1
+    
+    # max_pages 에서 멈춘 경우는 끝난 것이 아님 → resume_page / pending_head 를 남겨 다음 실행이 이어서 요청
+    if exhausted:
+        await asyncio.to_thread(checkpoint.exhausted)
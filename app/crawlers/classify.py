@@ -0,0 +1,99 @@
+"""
+활동 텍스트 분류 (분야 / 키워드 / 추천 학과)
+
+ActivityCrawler 와 파싱 프로세스 풀(crawlers/parse_pool.py)이 함께 사용하므로
+DB 연결 없이 import 할 수 있도록 크롤러에서 분리했다.
+매핑의 모든 패턴은 import 시 MultiPatternMatcher 하나로 컴파일하고, 텍스트는 한 번만 스캔한다.
+"""
+
+from typing import Dict, List, Optional, Set
+
+from app.utils.text_matcher import MultiPatternMatcher
+
+FIELD_MAPPING = {
+    'IT': ['개발', '프로그래밍', '코딩', '소프트웨어', 'SW', '앱', '웹', '서버', '인공지능', 'AI', '머신러닝', '데이터', '빅데이터'],
+    '기획': ['기획', '전략', '마케팅', '브랜드', '사업', '비즈니스'],
+    '디자인': ['디자인', 'UX', 'UI', '그래픽', '시각', '영상', '편집'],
+    '경영': ['경영', '경제', '금융', '회계', '재무'],
+    '교육': ['교육', '멘토링', '강의', '튜터'],
+    '예술': ['예술', '미술', '음악', '공연', '문화'],
+    '의료': ['의료', '간호', '보건', '제약'],
+    '환경': ['환경', '에너지', '지속가능', '친환경'],
+    '사회': ['봉사', '복지', '사회', '공익']
+}
+
+# 분야별 키워드
+FIELD_KEYWORDS = {
+    'IT': ['Python', 'Java', 'JavaScript', 'React', 'AI', '머신러닝', '딥러닝', '앱개발', '웹개발'],
+    '기획': ['기획서', '전략', '마케팅', 'SNS', '브랜딩'],
+    '디자인': ['포토샵', '일러스트', 'Figma', 'UX', 'UI'],
+    '경영': ['창업', '사업계획서', '투자', '경영전략']
+}
+
+# 일반 키워드
+COMMON_KEYWORDS = ['대학생', '청년', '팀프로젝트', '개인참가', '온라인', '오프라인']
+
+MAJOR_MAPPING = {
+    'IT': ['컴퓨터공학', '소프트웨어공학', '정보통신공학', '인공지능학과'],
+    '기획': ['경영학', '경제학', '광고홍보학', '미디어커뮤니케이션'],
+    '디자인': ['시각디자인', '산업디자인', '인터랙션디자인', '영상디자인'],
+    '경영': ['경영학', '경제학', '회계학', '국제통상학'],
+    '교육': ['교육학', '사범대학'],
+    '의료': ['의학', '간호학', '약학', '보건학'],
+    '환경': ['환경공학', '에너지공학'],
+    '사회': ['사회복지학', '행정학', '정치외교학']
+}
+
+# 분야 패턴 + 키워드를 한 번에 찾는 매처 (import 시 한 번 컴파일)
+_FIELD_PATTERNS = {field: {p.lower() for p in patterns} for field, patterns in FIELD_MAPPING.items()}
+_MATCHER = MultiPatternMatcher({
+    "fields": [p for patterns in FIELD_MAPPING.values() for p in patterns],
+    "keywords": [k for keywords in FIELD_KEYWORDS.values() for k in keywords] + COMMON_KEYWORDS
+})
+
+def _fields(found: Set[str]) -> List[str]:
+    detected = [field for field, patterns in _FIELD_PATTERNS.items() if patterns & found]
+    return detected if detected else ['기타']
+
+def _keywords(found: Set[str], fields: List[str]) -> List[str]:
+    keywords = {}  # 순서 유지 (get_recommended_majors 참고)
+    
+    for field in fields:
+        for keyword in FIELD_KEYWORDS.get(field, []):
+            if keyword.lower() in found:
+                keywords[keyword] = None
+    
+    for keyword in COMMON_KEYWORDS:
+        if keyword.lower() in found:
+            keywords[keyword] = None
+    
+    return list(keywords)[:10]  # 최대 10개
+
+def extract_fields(text: str) -> List[str]:
+    """분야 추출"""
+    return _fields(_MATCHER.matches(text))
+
+def extract_keywords(text: str, fields: List[str]) -> List[str]:
+    """키워드 추출"""
+    return _keywords(_MATCHER.matches(text), fields)
+
+def get_recommended_majors(fields: List[str]) -> List[str]:
+    """분야별 추천 학과"""
+    # 실행마다 같은 결과가 나오도록 set 대신 순서를 유지하는 dict 사용 (content_hash 비교)
+    majors = dict.fromkeys(['전공무관'])  # 기본적으로 전공무관 포함
+    
+    for field in fields:
+        if field in MAJOR_MAPPING:
+            majors.update(dict.fromkeys(MAJOR_MAPPING[field]))
+    
+    return list(majors)[:5]  # 최대 5개
+
+def classify(text: str, fields: Optional[List[str]] = None) -> Dict[str, List[str]]:
+    """텍스트를 한 번 스캔해 분야 / 키워드 / 추천 학과를 함께 계산 (fields 를 주면 분야 추출 생략)"""
+    found = _MATCHER.matches(text)
+    fields = fields if fields is not None else _fields(found)
+    return {
+        "fields": fields,
+        "keywords": _keywords(found, fields),
+        "recommended_majors": get_recommended_majors(fields)
+    }
@@ -0,0 +1,165 @@
+"""
+크롤링 날짜 정규화
+
+목록/상세 페이지의 날짜 문자열을 ISO 날짜(YYYY-MM-DD)로 바꾼다.
+정규식은 모듈 로드 시 한 번만 컴파일하고, 형식 표(_FORMATS)를 위에서부터 시도한다.
+
+지원 형식 (요일 "(토)", 시각 "18:00", "까지"/"마감" 같은 말은 무시):
+    2025-03-01, 2025.03.01, 2025/3/1, 2025. 3. 1., 2025년 3월 1일
+    25.03.01 (두 자리 연도)
+    3.15, 03/15, 3월 15일 (연도 없음 → 크롤링 시각 90일 전부터 1년 사이의 날짜)
+    D-7, 오늘, 내일 (크롤링 시각 기준)
+    기간: "2025.03.01 ~ 2025.03.15", "3.1(금) ~ 3.15(토)", "2025년 3월 1일 ~ 15일",
+          "~3.15(토)" (마감일만), "12.20 ~ 1.10" (해를 넘기는 기간)
+    상시 모집 → 날짜 없음
+
+한 번의 크롤링 동안 같은 문자열("D-7", "~3.15(토)" 등)이 반복되므로 결과를 인스턴스에 기억한다.
+연도 추론이 크롤링 시각에 의존하므로 DateNormalizer 는 실행마다 새로 만든다.
+
+사용 예:
+    dates = DateNormalizer()
+    dates.parse_range("2025.03.01(토) ~ 03.15(토) 18:00")  # ('2025-03-01', '2025-03-15')
+    dates.parse("~3.15(토)")                               # 올해 또는 내년의 3월 15일
+"""
+
+import re
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+# 연도 없는 날짜는 크롤링 시각 PAST_DAYS 일 전부터 1년 사이로 본다
+PAST_DAYS = 90
+
+# (연도 또는 None, 월 또는 None, 일)
+Partial = Tuple[Optional[int], Optional[int], int]
+
+_WEEKDAY = re.compile(r'\(\s*(?:[월화수목금토일]|mon|tue|wed|thu|fri|sat|sun)[a-z]*\s*\)', re.IGNORECASE)
+_TIME = re.compile(r'(?:오전|오후|AM|PM)?\s*\d{1,2}\s*:\s*\d{2}(?:\s*:\s*\d{2})?|\d{1,2}\s*시(?:\s*\d{1,2}\s*분)?', re.IGNORECASE)
+_WORDS = re.compile(r'까지|마감|접수|신청|모집|기간|[\[\]:：]')
+_ALWAYS = re.compile(r'상시|수시|선착순')
+# 기간 구분자: ~, 부터, 공백으로 둘러싼 -, 날짜 뒤에 다른 날짜가 바로 이어지는 -
+_RANGE_SEP = re.compile(
+    r'\s*(?:[~∼〜～–—]|부터|\s-\s|(?<=[\d.일])\s*-\s*(?=\d{4}\D|\d{1,2}\s*[./월]))\s*'
+)
+_DAY_ONLY = re.compile(r'^(\d{1,2})\s*일?\.?$')
+
+def _full(m) -> Partial:
+    return int(m.group(1)), int(m.group(2)), int(m.group(3))
+
+def _short_year(m) -> Partial:
+    return 2000 + int(m.group(1)), int(m.group(2)), int(m.group(3))
+
+def _month_day(m) -> Partial:
+    return None, int(m.group(1)), int(m.group(2))
+
+# 위에서부터 시도 (연도가 있는 형식이 먼저)
+_FORMATS: List[Tuple[re.Pattern, Callable]] = [
+    (re.compile(r'(\d{4})\s*[-./년]\s*(\d{1,2})\s*[-./월]\s*(\d{1,2})'), _full),
+    (re.compile(r'(?<!\d)(\d{2})[-./](\d{1,2})[-./](\d{1,2})(?!\d)'), _short_year),
+    (re.compile(r'(?<!\d)(\d{1,2})\s*(?:[./]|월)\s*(\d{1,2})(?!\d)'), _month_day),
+]
+_RELATIVE = re.compile(r'D\s*-\s*(\d+)|(오늘)|(내일)', re.IGNORECASE)
+
+def _clean(text: str) -> str:
+    text = _WEEKDAY.sub(' ', text)
+    text = _TIME.sub(' ', text)
+    return _WORDS.sub(' ', text).strip(' .,')
+
+def _valid(year: int, month: int, day: int) -> Optional[date]:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+class DateNormalizer:
+    def __init__(self, now: Optional[datetime] = None):
+        """now: 연도 추론 / D-n 기준 시각 (기본값: 지금)"""
+        self.today = (now or datetime.now()).date()
+        self._memo: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+    
+    def _partial(self, text: str) -> Optional[Partial]:
+        relative = _RELATIVE.search(text)
+        if relative:
+            days = int(relative.group(1)) if relative.group(1) else (0 if relative.group(2) else 1)
+            target = self.today + timedelta(days=days)
+            return target.year, target.month, target.day
+        for pattern, build in _FORMATS:
+            m = pattern.search(text)
+            if m:
+                return build(m)
+        return None
+    
+    def _nearest(self, month: int, day: int) -> Optional[date]:
+        """연도 없는 월/일 → 크롤링 시각 PAST_DAYS 일 전부터 1년 사이에 오는 날짜
+        
+        목록의 날짜는 대부분 앞으로의 마감일이지만, 이미 시작한 기간의 시작일처럼 조금 지난 날짜도 있다.
+        """
+        window_start = self.today - timedelta(days=PAST_DAYS)
+        candidates = [d for d in (_valid(self.today.year + offset, month, day) for offset in (-1, 0, 1)) if d]
+        for candidate in candidates:
+            if window_start <= candidate < window_start + timedelta(days=365):
+                return candidate
+        # 2월 29일 등 창 안에 없으면 가장 가까운 날짜
+        return min(candidates, key=lambda d: abs((d - self.today).days)) if candidates else None
+    
+    def _resolve(self, partial: Partial, anchor: Optional[date] = None, after: bool = True) -> Optional[date]:
+        """anchor 가 있으면 연도 없는 날짜를 anchor 이후(after) / 이전 중 가장 가까운 해로 정함"""
+        year, month, day = partial
+        if year is not None:
+            return _valid(year, month, day)
+        if anchor is None:
+            return self._nearest(month, day)
+        
+        month = month or anchor.month
+        resolved = _valid(anchor.year, month, day)
+        if resolved is None:
+            return None
+        if after and resolved < anchor:
+            return _valid(anchor.year + 1, month, day)
+        if not after and resolved > anchor:
+            return _valid(anchor.year - 1, month, day)
+        return resolved
+    
+    def _parse_range(self, text: str) -> Tuple[Optional[date], Optional[date]]:
+        if _ALWAYS.search(text):
+            return None, None
+        
+        parts = [_clean(part) for part in _RANGE_SEP.split(text, maxsplit=1)]
+        if len(parts) == 1 or not parts[0]:
+            # 단일 날짜 / "~3.15" 는 마감일로 본다
+            partial = self._partial(parts[-1])
+            return None, (self._resolve(partial) if partial else None)
+        
+        start_partial = self._partial(parts[0])
+        day_only = _DAY_ONLY.match(parts[1])
+        end_partial = (None, None, int(day_only.group(1))) if day_only else self._partial(parts[1])
+        if start_partial is None or end_partial is None:
+            return None, (self._resolve(end_partial) if end_partial and end_partial[1] else None)
+        
+        if end_partial[0] is None and start_partial[0] is not None:
+            start = self._resolve(start_partial)
+            end = self._resolve(end_partial, anchor=start) if start else None
+        elif end_partial[1] is None:
+            # "3월 1일 ~ 15일" 처럼 월도 없는 마감일은 시작일의 달을 따름
+            start = self._resolve(start_partial)
+            end = self._resolve(end_partial, anchor=start) if start else None
+        else:
+            end = self._resolve(end_partial)
+            start = self._resolve(start_partial, anchor=end, after=False) if end else self._resolve(start_partial)
+        return start, end
+    
+    def parse_range(self, text: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        """기간 문자열 → (시작일, 마감일) ISO 문자열, 알 수 없으면 None"""
+        if not text:
+            return None, None
+        cached = self._memo.get(text)
+        if cached is None:
+            start, end = self._parse_range(text)
+            cached = self._memo[text] = (
+                start.isoformat() if start else None,
+                end.isoformat() if end else None
+            )
+        return cached
+    
+    def parse(self, text: Optional[str]) -> Optional[str]:
+        """날짜 문자열 → ISO 날짜 (기간이면 마감일)"""
+        return self.parse_range(text)[1]
@@ -0,0 +1,182 @@
+"""
+소스 간 중복 활동 탐지 (MinHash + LSH)
+
+같은 공모전이 링커리어/위비티/온오프믹스에 서로 다른 url 로 올라오므로 url 이 아니라
+제목 + 주최 기관의 문자 n-gram 으로 MinHash 서명을 만들고, LSH 밴드 버킷으로 후보를 찾는다.
+후보는 서명 일치율(Jaccard 추정치)이 threshold 이상이고 마감일이 date_tolerance_days 안이면 중복으로 본다.
+
+- 서명: NUM_PERM 개 해시 (NumPy 로 여러 활동을 한 번에 계산), BANDS x ROWS 밴드
+  (BANDS=16, ROWS=4 → 유사도 약 0.5 부터 후보가 되기 시작)
+- 조회는 밴드 버킷 16번 + 후보 비교라 카탈로그 크기와 거의 무관하다.
+- 색인은 크롤러 시작 시 activities 에서 원본(duplicate_of 가 없는 활동)으로 만들고,
+  크롤링 중 새 활동을 추가하며 유지한다.
+
+중복으로 판단된 활동은 activities.duplicate_of 에 원본 url 을 기록한다 (추천 색인에서 제외).
+"""
+
+import re
+import zlib
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.utils.paging import iter_keyset
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+_PRIME = np.uint64((1 << 31) - 1)
+
+_rng = np.random.RandomState(20250101)
+_A = _rng.randint(1, (1 << 31) - 1, NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, (1 << 31) - 1, NUM_PERM).astype(np.uint64)
+
+_NOISE = re.compile(r'[\s\[\]\(\)<>【】「」『』{}·•ㆍ,.:;!?~\-_/|"\'`]+')
+
+def _normalize(text: str) -> str:
+    return _NOISE.sub('', (text or '').lower())
+
+def _shingles(activity: Dict) -> np.ndarray:
+    """제목 문자 3-gram + 주최 기관 문자 2-gram 해시"""
+    title = _normalize(activity.get('title'))
+    organization = _normalize(activity.get('organization'))
+    grams = {title[i:i + 3] for i in range(max(len(title) - 2, 1))} if title else set()
+    grams |= {'o:' + organization[i:i + 2] for i in range(max(len(organization) - 1, 1))} if organization else set()
+    return np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grams), dtype=np.uint64, count=len(grams))
+
+def signatures(activities: List[Dict], chunk_size: int = 2000) -> Tuple[np.ndarray, np.ndarray]:
+    """여러 활동의 MinHash 서명 (n x NUM_PERM) 과 유효 여부 (제목/기관이 비어 있으면 False)
+    
+    chunk_size 개씩 n-gram 해시를 이어 붙여 한 번에 계산하고 reduceat 으로 활동별 최솟값을 구한다.
+    """
+    hashes = [_shingles(activity) for activity in activities]
+    lengths = np.array([len(h) for h in hashes], dtype=np.int64)
+    sigs = np.zeros((len(activities), NUM_PERM), dtype=np.uint64)
+    
+    for start in range(0, len(activities), chunk_size):
+        end = min(start + chunk_size, len(activities))
+        chunk_lengths = lengths[start:end]
+        filled = chunk_lengths > 0
+        if not filled.any():
+            continue
+        flat = np.concatenate([h for h in hashes[start:end] if len(h)])
+        offsets = np.concatenate(([0], np.cumsum(chunk_lengths[filled])[:-1]))
+        values = (np.outer(_A, flat) + _B[:, None]) % _PRIME
+        sigs[start:end][filled] = np.minimum.reduceat(values, offsets, axis=1).T
+    return sigs, lengths > 0
+
+def signature(activity: Dict) -> Optional[np.ndarray]:
+    """MinHash 서명 (제목/기관이 비어 있으면 None)"""
+    sigs, valid = signatures([activity])
+    return sigs[0] if valid[0] else None
+
+def _band_keys(sigs: np.ndarray) -> np.ndarray:
+    """서명 (n x NUM_PERM) → 밴드별 버킷 키 (n x BANDS), ROWS 개 값을 하나의 정수로 섞음"""
+    rows = sigs.reshape(len(sigs), BANDS, ROWS)
+    keys = np.zeros((len(sigs), BANDS), dtype=np.uint64)
+    for r in range(ROWS):
+        keys = keys * np.uint64(1000003) + rows[:, :, r]
+    return keys
+
+def _end_date(activity: Dict) -> Optional[date]:
+    value = activity.get('application_end_date')
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+class NearDuplicateIndex:
+    def __init__(self, threshold: Optional[float] = None, date_tolerance_days: Optional[int] = None):
+        self.threshold = threshold if threshold is not None else settings.crawler_dedupe_threshold
+        self.date_tolerance_days = date_tolerance_days if date_tolerance_days is not None else settings.crawler_dedupe_date_tolerance_days
+        self.entries: Dict[str, Tuple[np.ndarray, Optional[date], List[int]]] = {}
+        self._buckets: List[Dict[int, List[str]]] = [{} for _ in range(BANDS)]
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def _insert(self, key: str, sig: np.ndarray, end: Optional[date], bands: List[int]):
+        self.entries[key] = (sig, end, bands)
+        for band, bucket_key in enumerate(bands):
+            self._buckets[band].setdefault(bucket_key, []).append(key)
+    
+    def add(self, key: str, activity: Dict, sig: Optional[np.ndarray] = None):
+        """원본 활동 등록 (key 는 url)"""
+        sig = sig if sig is not None else signature(activity)
+        if sig is None or key in self.entries:
+            return
+        self._insert(key, sig, _end_date(activity), _band_keys(sig[None, :])[0].tolist())
+    
+    def add_many(self, activities: List[Dict], key: str = 'url'):
+        """원본 활동 여러 개 등록 (서명을 한 번에 계산)"""
+        sigs, valid = signatures(activities)
+        bands = _band_keys(sigs).tolist()
+        for i, activity in enumerate(activities):
+            if valid[i] and activity.get(key) and activity[key] not in self.entries:
+                self._insert(activity[key], sigs[i], _end_date(activity), bands[i])
+    
+    def remove(self, key: str):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        for band, bucket_key in enumerate(entry[2]):
+            bucket = self._buckets[band].get(bucket_key)
+            if bucket and key in bucket:
+                bucket.remove(key)
+                if not bucket:
+                    del self._buckets[band][bucket_key]
+    
+    def find(self, activity: Dict, sig: Optional[np.ndarray] = None, exclude: Optional[str] = None) -> Optional[Tuple[str, float]]:
+        """가장 비슷한 원본 (key, 추정 유사도), 없으면 None"""
+        sig = sig if sig is not None else signature(activity)
+        if sig is None:
+            return None
+        
+        candidates = set()
+        for band, bucket_key in enumerate(_band_keys(sig[None, :])[0].tolist()):
+            candidates.update(self._buckets[band].get(bucket_key, ()))
+        candidates.discard(exclude)
+        
+        end = _end_date(activity)
+        best = None
+        for key in candidates:
+            other_sig, other_end, _ = self.entries[key]
+            if end and other_end and abs((end - other_end).days) > self.date_tolerance_days:
+                continue
+            similarity = float(np.mean(sig == other_sig))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (key, similarity)
+        return best
+    
+    def link(self, activities: List[Dict]) -> int:
+        """묶음의 각 활동을 색인과 비교해 중복이면 duplicate_of 설정, 아니면 원본으로 등록
+        
+        이미 색인된 url 은 자기 자신과 비교하지 않는다. 중복 수 반환.
+        """
+        duplicates = 0
+        sigs, valid = signatures(activities)
+        for i, activity in enumerate(activities):
+            url = activity['url']
+            sig = sigs[i] if valid[i] else None
+            match = self.find(activity, sig, exclude=url)
+            if match:
+                # 원본이던 활동이 다른 활동의 중복이 되면 원본 목록에서 뺌 (연쇄 연결 방지)
+                self.remove(url)
+                activity['duplicate_of'] = match[0]
+                duplicates += 1
+            else:
+                activity['duplicate_of'] = None
+                self.add(url, activity, sig)
+        return duplicates
+    
+    def load(self, supabase) -> int:
+        """activities 의 원본 활동으로 색인 구성, 등록 수 반환"""
+        for page in iter_keyset(lambda: supabase.table("activities")
+                .select("id, url, title, organization, application_end_date")
+                .is_("duplicate_of", "null")):
+            self.add_many(page)
+        return len(self.entries)
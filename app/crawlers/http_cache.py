@@ -0,0 +1,58 @@
+"""
+크롤러 디스크 HTTP 캐시 (조건부 GET)
+
+url 별로 ETag / Last-Modified / 본문 해시와 본문을 settings.crawler_cache_dir 아래에 저장한다.
+다음 요청에서 If-None-Match / If-Modified-Since 를 보내고,
+304 이거나 본문 해시가 같으면 변경 없음으로 보고 파싱을 건너뛸 수 있게 한다.
+
+파일 구조: <cache_dir>/<url sha1 앞 2자리>/<url sha1>.json  (메타 + 본문)
+get/put 은 동기 파일 입출력이므로 비동기 코드에서는 asyncio.to_thread 로 호출한다 (crawlers/http_client.py).
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+def body_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class HttpCache:
+    def __init__(self, directory: str):
+        self.directory = directory
+    
+    def _path(self, url: str) -> str:
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+    
+    def get(self, url: str) -> Optional[dict]:
+        """저장된 항목 {"etag", "last_modified", "body_hash", "body"} (없으면 None)"""
+        try:
+            with open(self._path(url), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def conditional_headers(self, entry: Optional[dict]) -> Dict[str, str]:
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def put(self, url: str, body: str, etag: Optional[str], last_modified: Optional[str], digest: str):
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        # 중간에 중단돼도 깨진 파일이 남지 않도록 임시 파일에 쓰고 교체
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "url": url,
+                "etag": etag,
+                "last_modified": last_modified,
+                "body_hash": digest,
+                "body": body
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
@@ -0,0 +1,228 @@
+"""
+크롤러 공용 HTTP 클라이언트
+
+- 크롤러 실행 동안 하나의 aiohttp 세션(커넥션 풀, keep-alive, DNS 캐시)을 재사용
+- 소스(사이트)별 동시 요청 수 제한과 token bucket 속도 제한
+- 429 / 5xx / 네트워크 오류는 지수 백오프 + jitter 로 재시도 (Retry-After 우선)
+- cache(HttpCache)를 주면 조건부 GET 으로 변경 여부 확인 (FetchResult.changed)
+- metrics(CrawlMetrics)를 주면 소스별 상태 코드 / 페이지 크기 / 지연 기록
+
+소스별 제한은 DEFAULT_SOURCE_LIMITS 를 기본으로 하고 settings.crawler_source_limits 로 덮어쓴다.
+    예: CRAWLER_SOURCE_LIMITS='{"wevity": {"concurrency": 1, "rate": 0.5}}'
+
+사용 예:
+    async with CrawlerHttpClient(headers) as http:
+        html = await http.fetch("linkareer", "https://linkareer.com/list/contest")
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, replace
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from app.config import settings
+from app.crawlers.http_cache import HttpCache, body_hash
+from app.crawlers.metrics import CrawlMetrics
+
+# 재시도할 HTTP 상태 코드
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+@dataclass
+class SourceLimit:
+    concurrency: int = 2    # 동시 요청 수
+    rate: float = 1.0       # 초당 요청 수 (token bucket 충전 속도)
+    burst: int = 2          # 연속으로 보낼 수 있는 요청 수 (버킷 크기)
+
+DEFAULT_SOURCE_LIMITS: Dict[str, SourceLimit] = {
+    "linkareer": SourceLimit(concurrency=4, rate=2.0, burst=4),
+    "wevity": SourceLimit(concurrency=2, rate=1.0, burst=2),
+    "thinkpool": SourceLimit(concurrency=2, rate=1.0, burst=2),
+    "onoffmix": SourceLimit(concurrency=4, rate=2.0, burst=4)
+}
+
+@dataclass
+class FetchResult:
+    url: str
+    text: str
+    changed: bool   # False 면 지난 크롤링과 본문이 같음 (304 또는 본문 해시 동일)
+    status: int
+
+class RetryableStatus(Exception):
+    def __init__(self, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+class TokenBucket:
+    """초당 rate 개씩 채워지고 최대 burst 개까지 쌓이는 토큰 버킷"""
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+def load_source_limits() -> Dict[str, SourceLimit]:
+    """기본 소스별 제한에 설정값(crawler_source_limits)을 덮어씀"""
+    limits = dict(DEFAULT_SOURCE_LIMITS)
+    for source, overrides in settings.crawler_source_limits.items():
+        limits[source] = replace(limits.get(source, SourceLimit()), **overrides)
+    return limits
+
+class CrawlerHttpClient:
+    def __init__(self, headers: Optional[dict] = None, limits: Optional[Dict[str, SourceLimit]] = None,
+                 cache: Optional[HttpCache] = None, metrics: Optional[CrawlMetrics] = None):
+        self.headers = headers or {}
+        self.cache = cache
+        self.metrics = metrics
+        self.limits = limits if limits is not None else load_source_limits()
+        self.max_retries = settings.crawler_max_retries
+        self.backoff = settings.crawler_backoff_seconds
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+    
+    async def __aenter__(self):
+        await self.open()
+        return self
+    
+    async def __aexit__(self, *exc):
+        await self.close()
+    
+    async def open(self):
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=settings.crawler_max_connections,
+                ttl_dns_cache=300
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=settings.crawler_timeout_seconds)
+            )
+    
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+    
+    def _limit(self, source: str):
+        if source not in self._semaphores:
+            limit = self.limits.get(source, SourceLimit())
+            self._semaphores[source] = asyncio.Semaphore(limit.concurrency)
+            self._buckets[source] = TokenBucket(limit.rate, limit.burst)
+            self.stats[source] = {
+                "requests": 0, "retries": 0, "errors": 0,
+                "fetched": 0, "not_modified": 0, "unchanged": 0
+            }
+        return self._semaphores[source], self._buckets[source]
+    
+    def _backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """full jitter 지수 백오프 (Retry-After 가 있으면 그 이상 대기)"""
+        delay = random.uniform(0, self.backoff * (2 ** attempt))
+        return max(delay, retry_after or 0)
+    
+    async def fetch_result(self, source: str, url: str) -> FetchResult:
+        """소스 제한 안에서 url 을 가져옴 (재시도 + 조건부 GET 캐시)"""
+        await self.open()
+        semaphore, bucket = self._limit(source)
+        stats = self.stats[source]
+        # 캐시 파일 읽기/쓰기는 이벤트 루프를 막지 않도록 스레드에서
+        entry = await asyncio.to_thread(self.cache.get, url) if self.cache else None
+        start = time.perf_counter()
+        
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                async with semaphore:
+                    await bucket.acquire()
+                    stats["requests"] += 1
+                    headers = self.cache.conditional_headers(entry) if self.cache else {}
+                    async with self.session.get(url, headers=headers) as response:
+                        if self.metrics:
+                            self.metrics.record_response(source, response.status)
+                        if response.status == 304 and entry:
+                            stats["not_modified"] += 1
+                            if self.metrics:
+                                self.metrics.record_fetch(source, 0, (time.perf_counter() - start) * 1000)
+                            return FetchResult(url, entry["body"], changed=False, status=304)
+                        if response.status in RETRY_STATUSES:
+                            header = response.headers.get("Retry-After", "")
+                            raise RetryableStatus(response.status, float(header) if header.isdigit() else None)
+                        response.raise_for_status()
+                        body = await response.read()
+                        text = body.decode(response.get_encoding())
+                        etag = response.headers.get("ETag")
+                        last_modified = response.headers.get("Last-Modified")
+                break
+            except RetryableStatus as e:
+                error, retry_after = e, e.retry_after
+            except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+                error = e
+                if self.metrics:
+                    self.metrics.record_response(source, "error")
+            
+            if attempt == self.max_retries:
+                stats["errors"] += 1
+                raise error
+            
+            # 대기는 동시 요청 슬롯을 반납한 뒤에
+            stats["retries"] += 1
+            await asyncio.sleep(self._backoff_delay(attempt, retry_after))
+        
+        if self.metrics:
+            self.metrics.record_fetch(source, len(body), (time.perf_counter() - start) * 1000)
+        if not self.cache:
+            stats["fetched"] += 1
+            return FetchResult(url, text, changed=True, status=200)
+        
+        # 검증자(ETag 등)가 없는 사이트도 본문 해시로 변경 여부 판단
+        digest = body_hash(text)
+        changed = not entry or entry.get("body_hash") != digest
+        stats["fetched" if changed else "unchanged"] += 1
+        if changed or etag != entry.get("etag") or last_modified != entry.get("last_modified"):
+            await asyncio.to_thread(self.cache.put, url, text, etag, last_modified, digest)
+        return FetchResult(url, text, changed=changed, status=200)
+    
+    async def fetch(self, source: str, url: str) -> str:
+        """url 본문 (캐시로 변경 없음이 확인돼도 본문 반환)"""
+        return (await self.fetch_result(source, url)).text
+    
+    def cache_report(self) -> Dict[str, dict]:
+        """소스별 캐시 적중률 (304 + 본문 해시 동일 / 성공 응답)"""
+        report = {}
+        for source, stats in self.stats.items():
+            hits = stats["not_modified"] + stats["unchanged"]
+            total = hits + stats["fetched"]
+            report[source] = {
+                "not_modified": stats["not_modified"],
+                "unchanged": stats["unchanged"],
+                "fetched": stats["fetched"],
+                "hit_rate": round(hits / total, 3) if total else 0.0
+            }
+        return report
+
+def source_of(url: str) -> str:
+    """url 의 호스트로 소스 이름 추정 (DEFAULT_SOURCE_LIMITS 에 없으면 호스트 그대로)"""
+    host = urlparse(url).hostname or ""
+    for source in DEFAULT_SOURCE_LIMITS:
+        if source in host:
+            return source
+    return host
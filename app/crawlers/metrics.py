@@ -0,0 +1,183 @@
+"""
+크롤러 소스별 지표 + 실행 보고서
+
+소스(사이트)마다 다음을 모은다.
+- 가져온 페이지 수 / 바이트 / HTTP 상태 코드별 응답 수 (네트워크 오류는 "error")
+- 단계별 지연 (fetch: 요청~응답, parse: 워커 안 파싱+분류, save: 활동이 속한 저장 묶음) p50/p90/p99
+- 수집한 활동 수, 중복으로 연결된 활동 수(dedupe 비율), 저장한 행 수
+- 전체 DB 저장 처리량 (행/초)
+
+실행이 끝나면 JSON 보고서(settings.crawler_report_dir)로 남기고,
+settings.crawler_prometheus_path 가 있으면 Prometheus 텍스트 형식(node_exporter textfile collector 용)으로도 쓴다.
+
+수집 단계(이벤트 루프)와 저장 단계(스레드)에서 함께 기록하므로 잠금을 사용한다.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Union
+
+LATENCY_STAGES = ("fetch", "parse", "save")
+QUANTILES = (0.5, 0.9, 0.99)
+
+def percentile(ordered: List[float], q: float) -> float:
+    """정렬된 표본의 q 분위수 (nearest-rank)"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+def _latency_summary(samples: List[float]) -> dict:
+    ordered = sorted(samples)
+    summary = {"count": len(ordered), "sum_ms": round(sum(ordered), 1)}
+    for q in QUANTILES:
+        summary[f"p{int(q * 100)}_ms"] = round(percentile(ordered, q), 1)
+    return summary
+
+def _write_atomic(path: str, text: str):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+class CrawlMetrics:
+    def __init__(self):
+        self.started_at = datetime.now(timezone.utc)
+        self.sources: Dict[str, dict] = {}
+        self.save = {"batches": 0, "rows": 0, "seconds": 0.0}
+        self._lock = threading.Lock()
+    
+    def _source(self, source: str) -> dict:
+        if source not in self.sources:
+            self.sources[source] = {
+                "pages": 0, "bytes": 0, "status": {},
+                "items": 0, "duplicates": 0, "written": 0,
+                "latency": {stage: [] for stage in LATENCY_STAGES}
+            }
+        return self.sources[source]
+    
+    def record_response(self, source: str, status: Union[int, str]):
+        """HTTP 응답 (재시도한 응답 포함) 또는 네트워크 오류("error")"""
+        with self._lock:
+            histogram = self._source(source)["status"]
+            histogram[str(status)] = histogram.get(str(status), 0) + 1
+    
+    def record_fetch(self, source: str, size: int, ms: float):
+        """성공한 페이지 (200 / 304) 크기와 재시도를 포함한 지연"""
+        with self._lock:
+            stats = self._source(source)
+            stats["pages"] += 1
+            stats["bytes"] += size
+            stats["latency"]["fetch"].append(ms)
+    
+    def record_parse(self, source: str, ms: float):
+        with self._lock:
+            self._source(source)["latency"]["parse"].append(ms)
+    
+    def record_save(self, activities: List[Dict], written: int, seconds: float):
+        """저장 묶음 하나: 소스별 중복/저장 행 수와 묶음 지연"""
+        by_source: Dict[str, List[Dict]] = {}
+        for activity in activities:
+            by_source.setdefault(activity.get("source") or "unknown", []).append(activity)
+        
+        with self._lock:
+            self.save["batches"] += 1
+            self.save["rows"] += written
+            self.save["seconds"] += seconds
+            failed = written < len(activities)
+            for source, items in by_source.items():
+                stats = self._source(source)
+                stats["duplicates"] += sum(1 for activity in items if activity.get("duplicate_of"))
+                if not failed:
+                    stats["written"] += len(items)
+                stats["latency"]["save"].append(seconds * 1000)
+    
+    def set_items(self, source: str, count: int):
+        with self._lock:
+            self._source(source)["items"] = count
+    
+    def report(self, **extra) -> dict:
+        """JSON 보고서 (extra 는 최상위에 그대로 추가)"""
+        with self._lock:
+            sources = {}
+            for source, stats in sorted(self.sources.items()):
+                sources[source] = {
+                    "pages": stats["pages"],
+                    "bytes": stats["bytes"],
+                    "status": dict(sorted(stats["status"].items())),
+                    "items": stats["items"],
+                    "duplicates": stats["duplicates"],
+                    "dedupe_ratio": round(stats["duplicates"] / stats["items"], 3) if stats["items"] else 0.0,
+                    "written": stats["written"],
+                    "latency": {stage: _latency_summary(samples) for stage, samples in stats["latency"].items()}
+                }
+            save = dict(self.save)
+        
+        save["seconds"] = round(save["seconds"], 3)
+        save["rows_per_second"] = round(save["rows"] / save["seconds"], 1) if save["seconds"] else 0.0
+        return {
+            "started_at": self.started_at.isoformat(),
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            **extra,
+            "sources": sources,
+            "save": save
+        }
+    
+    @staticmethod
+    def prometheus(report: dict) -> str:
+        """report() 결과를 Prometheus 텍스트 형식으로"""
+        lines: List[str] = []
+        
+        def metric(name: str, kind: str, help_text: str, samples: List[tuple]):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{val}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        
+        sources = report["sources"]
+        metric("crawler_pages_fetched_total", "counter", "Pages fetched (200 or 304).",
+               [({"source": s}, v["pages"]) for s, v in sources.items()])
+        metric("crawler_bytes_fetched_total", "counter", "Response body bytes fetched.",
+               [({"source": s}, v["bytes"]) for s, v in sources.items()])
+        metric("crawler_http_responses_total", "counter", "HTTP responses by status (error = network failure).",
+               [({"source": s, "status": status}, count) for s, v in sources.items() for status, count in v["status"].items()])
+        metric("crawler_items_total", "counter", "Activities produced.",
+               [({"source": s}, v["items"]) for s, v in sources.items()])
+        metric("crawler_duplicates_total", "counter", "Activities linked as cross-source duplicates.",
+               [({"source": s}, v["duplicates"]) for s, v in sources.items()])
+        metric("crawler_dedupe_ratio", "gauge", "Duplicates / items.",
+               [({"source": s}, v["dedupe_ratio"]) for s, v in sources.items()])
+        metric("crawler_rows_written_total", "counter", "Activities written to the database.",
+               [({"source": s}, v["written"]) for s, v in sources.items()])
+        
+        latency = []
+        for s, v in sources.items():
+            for stage, summary in v["latency"].items():
+                for q in QUANTILES:
+                    latency.append(({"source": s, "stage": stage, "quantile": q}, summary[f"p{int(q * 100)}_ms"]))
+        metric("crawler_stage_latency_ms", "summary", "Per-stage latency in milliseconds.", latency)
+        lines.extend(
+            f'crawler_stage_latency_ms_{suffix}{{source="{s}",stage="{stage}"}} {summary[key]}'
+            for s, v in sources.items() for stage, summary in v["latency"].items()
+            for suffix, key in (("sum", "sum_ms"), ("count", "count"))
+        )
+        
+        metric("crawler_db_write_rows_per_second", "gauge", "Database write throughput.",
+               [({}, report["save"]["rows_per_second"])])
+        if "seconds" in report:
+            metric("crawler_run_seconds", "gauge", "Wall time of the crawl run.", [({}, report["seconds"])])
+        return "\n".join(lines) + "\n"
+    
+    def write(self, report: dict, directory: str, prometheus_path: Optional[str] = None) -> str:
+        """JSON 보고서(crawl-<시각>.json + latest.json) 저장, prometheus_path 가 있으면 텍스트도 저장"""
+        name = f"crawl-{self.started_at.strftime('%Y%m%d-%H%M%S')}.json"
+        path = os.path.join(directory, name)
+        payload = json.dumps(report, ensure_ascii=False, indent=2)
+        _write_atomic(path, payload)
+        _write_atomic(os.path.join(directory, "latest.json"), payload)
+        if prometheus_path:
+            _write_atomic(prometheus_path, self.prometheus(report))
+        return path
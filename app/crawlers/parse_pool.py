@@ -0,0 +1,210 @@
+"""
+크롤러 파싱 단계 (프로세스 풀)
+
+BeautifulSoup 파싱과 분야/키워드 분류는 CPU 작업이라 이벤트 루프에서 하면
+진행 중인 다른 요청이 모두 멈춘다. 가져온 페이지를 크기 제한 큐(crawler_parse_queue_size)에 넣고
+ProcessPoolExecutor 워커가 파싱한다. 큐가 차면 submit 이 기다리므로 가져오기 속도도 함께 조절된다.
+
+- 파서: settings.crawler_html_parser (lxml | html.parser, lxml 이 없으면 html.parser)
+- 단계별 시간: fetch(요청) / queue_wait(큐 대기) / parse(워커 안 파싱+분류) 를 따로 기록
+- profile=True 면 워커에서 cProfile 로 파싱을 측정해 소스별로 합친다 (profile_report / dump_profiles)
+
+사용 예:
+    async with ParseStage() as stage:
+        page = await stage.parse(url, html, fetch_ms=...)
+    print(stage.report())
+"""
+
+import asyncio
+import cProfile
+import os
+import pstats
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+from app.config import settings
+from app.crawlers.classify import extract_fields, extract_keywords, get_recommended_majors
+from app.crawlers.http_client import source_of
+from app.crawlers.metrics import CrawlMetrics
+
+def resolve_parser(name: str) -> str:
+    """사용할 수 있는 BeautifulSoup 파서 이름 (lxml 이 설치되지 않았으면 html.parser)"""
+    try:
+        BeautifulSoup("", name)
+        return name
+    except FeatureNotFound:
+        return "html.parser"
+
+def parse_page(url: str, html: str, parser: str) -> dict:
+    """HTML 파싱 + 텍스트 분류 (워커 프로세스에서 실행)"""
+    start = time.perf_counter()
+    soup = BeautifulSoup(html, parser)
+    
+    def meta(*names: str) -> str:
+        for name in names:
+            tag = soup.find("meta", attrs={"property": name}) or soup.find("meta", attrs={"name": name})
+            if tag and tag.get("content"):
+                return tag["content"].strip()
+        return ""
+    
+    title = meta("og:title") or (soup.title.get_text(strip=True) if soup.title else "")
+    description = meta("og:description", "description")
+    links = list(dict.fromkeys(urljoin(url, a["href"]) for a in soup.find_all("a", href=True)))
+    
+    for tag in soup(["script", "style", "noscript"]):
+        tag.decompose()
+    text = soup.get_text(" ", strip=True)
+    
+    fields = extract_fields(f"{title} {description} {text}")
+    return {
+        "url": url,
+        "title": title,
+        "description": description,
+        "text": text,
+        "links": links,
+        "fields": fields,
+        "keywords": extract_keywords(f"{title} {description}", fields),
+        "recommended_majors": get_recommended_majors(fields),
+        "parse_ms": (time.perf_counter() - start) * 1000
+    }
+
+def profile_parse_page(url: str, html: str, parser: str) -> Tuple[dict, dict]:
+    """parse_page + cProfile 통계 (워커 프로세스에서 실행, 통계는 pickle 가능한 dict)"""
+    profiler = cProfile.Profile()
+    page = profiler.runcall(parse_page, url, html, parser)
+    profiler.create_stats()
+    return page, profiler.stats
+
+class _RawStats:
+    """워커에서 받은 통계 dict 를 pstats.Stats.add 에 넘기기 위한 감싸개"""
+    def __init__(self, stats: dict):
+        self.stats = stats
+    
+    def create_stats(self):
+        pass
+
+class ParseStage:
+    def __init__(self, parser: Optional[str] = None, workers: Optional[int] = None, queue_size: Optional[int] = None,
+                 metrics: Optional[CrawlMetrics] = None, profile: bool = False):
+        self.parser = resolve_parser(parser or settings.crawler_html_parser)
+        self.workers = workers or settings.crawler_parse_workers or os.cpu_count() or 1
+        self.queue_size = queue_size or settings.crawler_parse_queue_size
+        self.metrics = metrics
+        self.profile = profile
+        self.profiles: Dict[str, pstats.Stats] = {}
+        self.timings: Dict[str, List[float]] = {"fetch": [], "queue_wait": [], "parse": []}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._consumers: List[asyncio.Task] = []
+    
+    async def __aenter__(self):
+        await self.start()
+        return self
+    
+    async def __aexit__(self, *exc):
+        await self.stop()
+    
+    async def start(self):
+        if self._executor is not None:
+            return
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        # 워커 수만큼 소비자를 두어 프로세스마다 한 건씩 처리
+        self._consumers = [asyncio.create_task(self._consume()) for _ in range(self.workers)]
+    
+    async def stop(self):
+        if self._executor is None:
+            return
+        for _ in self._consumers:
+            await self._queue.put(None)
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._executor.shutdown()
+        self._executor = None
+        self._consumers = []
+    
+    async def _consume(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            
+            url, html, enqueued_at, future = item
+            self.timings["queue_wait"].append((time.perf_counter() - enqueued_at) * 1000)
+            try:
+                if self.profile:
+                    page, stats = await loop.run_in_executor(self._executor, profile_parse_page, url, html, self.parser)
+                    self._add_profile(source_of(url), stats)
+                else:
+                    page = await loop.run_in_executor(self._executor, parse_page, url, html, self.parser)
+                self.timings["parse"].append(page["parse_ms"])
+                if self.metrics:
+                    self.metrics.record_parse(source_of(url), page["parse_ms"])
+                future.set_result(page)
+            except Exception as e:
+                future.set_exception(e)
+    
+    async def submit(self, url: str, html: str, fetch_ms: Optional[float] = None) -> asyncio.Future:
+        """파싱 큐에 넣고 결과 future 반환 (큐가 차 있으면 자리가 날 때까지 대기)"""
+        await self.start()
+        if fetch_ms is not None:
+            self.timings["fetch"].append(fetch_ms)
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((url, html, time.perf_counter(), future))
+        return future
+    
+    async def parse(self, url: str, html: str, fetch_ms: Optional[float] = None) -> dict:
+        return await (await self.submit(url, html, fetch_ms))
+    
+    def _add_profile(self, source: str, stats: dict):
+        if source not in self.profiles:
+            self.profiles[source] = pstats.Stats(_RawStats(stats))
+        else:
+            self.profiles[source].add(_RawStats(stats))
+    
+    def profile_report(self, top: int = 15) -> Dict[str, dict]:
+        """소스별 파싱 프로파일: 전체 호출 수 / 시간과 누적 시간 상위 함수"""
+        report = {}
+        for source, profile in self.profiles.items():
+            rows = sorted(profile.stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+            report[source] = {
+                "total_calls": profile.total_calls,
+                "total_seconds": round(profile.total_tt, 3),
+                "functions": [
+                    {
+                        "function": f"{os.path.basename(filename)}:{line}({name})",
+                        "calls": calls,
+                        "tottime": round(tottime, 4),
+                        "cumtime": round(cumtime, 4)
+                    }
+                    for (filename, line, name), (_, calls, tottime, cumtime, _) in rows
+                ]
+            }
+        return report
+    
+    def dump_profiles(self, directory: str, prefix: str = "parse") -> List[str]:
+        """소스별 .prof 파일 저장 (python -m pstats / snakeviz 로 확인)"""
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for source, profile in self.profiles.items():
+            path = os.path.join(directory, f"{prefix}-{source}.prof")
+            profile.dump_stats(path)
+            paths.append(path)
+        return paths
+    
+    def report(self) -> Dict[str, dict]:
+        """단계별 건수 / 합계 / 평균 / p95 (ms)"""
+        report = {}
+        for stage, samples in self.timings.items():
+            ordered = sorted(samples)
+            report[stage] = {
+                "count": len(ordered),
+                "total_ms": round(sum(ordered), 1),
+                "avg_ms": round(sum(ordered) / len(ordered), 1) if ordered else 0.0,
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1) if ordered else 0.0
+            }
+        return report
@@ -0,0 +1,163 @@
+"""
+크롤링 스트리밍 파이프라인
+
+소스별 수집(가져오기+파싱) → 보강(분야/키워드/추천 학과) → 묶음 저장 단계를
+크기 제한 큐로 연결한다. 수집된 활동은 소스가 끝나기를 기다리지 않고 바로 저장되며,
+저장이 밀리면 큐가 차서 앞 단계가 기다린다 (backpressure).
+
+- 소스마다 제한 시간(source_timeout)을 두고, 시간이 지나면 그 소스만 중단한다.
+  큐에 넣으려고 기다린 시간은 제한 시간에 포함하지 않는다.
+- 저장 단계는 batch_size 개가 모이거나 flush_seconds 동안 새 항목이 없으면 저장한다.
+  오류 없이 저장된 묶음은 on_written 으로, 보강/저장에 실패한 활동은 on_failed 로 알린다 (crawlers/checkpoints.py).
+  알림 콜백의 오류는 기록만 하고(written["callback_errors"]) 저장은 계속한다.
+- 보강/저장 단계가 예외로 죽으면 나머지 단계를 취소하고 run() 이 그 예외를 올린다 (큐가 차서 멈추지 않게).
+
+사용 예:
+    pipeline = CrawlPipeline(enrich=crawler.enrich, write_batch=crawler.save_batch)
+    report = await pipeline.run({"linkareer": crawler.crawl_linkareer(), ...})
+"""
+
+import asyncio
+import time
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from app.config import settings
+
+_DONE = object()
+
+class CrawlPipeline:
+    def __init__(self, enrich: Callable[[Dict], Dict], write_batch: Callable[[List[Dict]], Dict[str, int]],
+                 batch_size: int = 200, queue_size: Optional[int] = None,
+                 source_timeout: Optional[float] = None, flush_seconds: Optional[float] = None,
+                 on_written: Optional[Callable[[List[Dict]], None]] = None,
+                 on_failed: Optional[Callable[[List[Dict]], None]] = None):
+        self.enrich = enrich
+        self.write_batch = write_batch
+        self.on_written = on_written
+        self.on_failed = on_failed
+        self.batch_size = batch_size
+        self.queue_size = queue_size or settings.crawler_pipeline_queue_size
+        self.source_timeout = source_timeout or settings.crawler_source_timeout_seconds
+        self.flush_seconds = flush_seconds or settings.crawler_flush_seconds
+        self.sources: Dict[str, dict] = {}
+        self.written: Dict[str, int] = {}
+    
+    async def _produce(self, name: str, items: AsyncIterator[Dict], out: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        stats = self.sources[name] = {"collected": 0, "status": "ok", "seconds": 0.0}
+        budget = self.source_timeout
+        iterator = items.__aiter__()
+        started = loop.time()
+        try:
+            while True:
+                start = loop.time()
+                try:
+                    item = await asyncio.wait_for(iterator.__anext__(), budget)
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    stats["status"] = "timeout"
+                    print(f"  ⏰ {name}: 제한 시간 {self.source_timeout}s 초과, {stats['collected']}개까지 저장")
+                    break
+                budget -= loop.time() - start
+                
+                stats["collected"] += 1
+                await out.put(item)
+        except Exception as e:
+            stats["status"] = "error"
+            print(f"  ❌ {name} 크롤링 오류: {str(e)}")
+        finally:
+            stats["seconds"] = round(loop.time() - started, 2)
+    
+    async def _enrich(self, inp: asyncio.Queue, out: asyncio.Queue):
+        while True:
+            item = await inp.get()
+            if item is _DONE:
+                await out.put(_DONE)
+                return
+            try:
+                await out.put(self.enrich(item))
+            except Exception as e:
+                print(f"  ❌ 보강 오류: {item.get('url')} - {str(e)}")
+                await self._notify(self.on_failed, [item])
+    
+    async def _notify(self, callback: Optional[Callable[[List[Dict]], None]], batch: List[Dict]):
+        """on_written / on_failed 호출 (체크포인트 저장 실패 등은 기록만 하고 파이프라인은 계속)"""
+        if not callback:
+            return
+        try:
+            await asyncio.to_thread(callback, batch)
+        except Exception as e:
+            print(f"  ❌ 저장 알림 오류: {len(batch)}개 활동 - {str(e)}")
+            self.written["callback_errors"] = self.written.get("callback_errors", 0) + 1
+    
+    async def _flush(self, batch: List[Dict]):
+        # supabase 클라이언트는 동기 방식이라 스레드에서 실행
+        try:
+            counts = await asyncio.to_thread(self.write_batch, batch)
+        except Exception as e:
+            print(f"  ❌ 저장 오류: {len(batch)}개 묶음 - {str(e)}")
+            counts = {"errors": len(batch)}
+        for key, value in counts.items():
+            self.written[key] = self.written.get(key, 0) + value
+        
+        # 오류 없이 저장된 묶음만 알림 (체크포인트 이동 등), 실패한 묶음은 on_failed 로
+        if not counts.get("errors"):
+            await self._notify(self.on_written, batch)
+        else:
+            await self._notify(self.on_failed, batch)
+    
+    async def _write(self, inp: asyncio.Queue):
+        batch: List[Dict] = []
+        while True:
+            try:
+                item = await asyncio.wait_for(inp.get(), self.flush_seconds)
+            except asyncio.TimeoutError:
+                if batch:
+                    await self._flush(batch)
+                    batch = []
+                continue
+            
+            if item is _DONE:
+                if batch:
+                    await self._flush(batch)
+                return
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                await self._flush(batch)
+                batch = []
+    
+    @staticmethod
+    async def _wait(targets: List[asyncio.Task], stages: List[asyncio.Task]):
+        """targets 가 모두 끝날 때까지 기다림, 그 전에 어느 단계든 예외로 끝나면 그 예외를 올림"""
+        pending = set(stages)
+        while not all(task.done() for task in targets):
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.cancelled() and task.exception():
+                    raise task.exception()
+    
+    async def run(self, sources: Dict[str, AsyncIterator[Dict]]) -> dict:
+        """소스별 수집 결과와 저장 결과 반환"""
+        start = time.perf_counter()
+        raw: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        enriched: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        
+        enricher = asyncio.create_task(self._enrich(raw, enriched))
+        writer = asyncio.create_task(self._write(enriched))
+        producers = [asyncio.create_task(self._produce(name, items, raw)) for name, items in sources.items()]
+        stages = [*producers, enricher, writer]
+        try:
+            await self._wait(producers, stages)
+            stages.append(asyncio.create_task(raw.put(_DONE)))
+            await self._wait([enricher, writer], stages)
+        finally:
+            # 한 단계가 죽었으면 나머지(수집/보강)를 취소 (정상 종료면 모두 끝나 있음)
+            for task in stages:
+                task.cancel()
+        
+        return {
+            "sources": self.sources,
+            "written": self.written,
+            "seconds": round(time.perf_counter() - start, 2)
+        }
@@ -1,8 +1,11 @@
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import List, Optional
 from datetime import datetime, date
 from ..database import get_supabase
+from ..config import settings
 from ..auth import get_current_user
+from ..utils.activity_index import activity_index
 from ..schemas import (
     ActivityCreate,
     ActivityResponse,
@@ -77,20 +80,49 @@ def calculate_days_left(end_date) -> int:
     delta = (end_date - today).days
     return max(0, delta)
 
-@router.get("/activities", response_model=SuccessResponse)
-async def list_recommended_activities(
-    category: Optional[str] = Query(None),
-    fields: Optional[str] = Query(None),
-    limit: int = Query(20, ge=1, le=100),
-    page: int = Query(1, ge=1),
-    status: str = Query("active"),
-    sort: str = Query("recommended"),
-    current_user: dict = Depends(get_current_user),
-    supabase = Depends(get_supabase)
-):
-    """개인화 추천 활동 조회"""
-    user_id = current_user['id']
+def load_materialized_page(supabase, user_id: str, offset: int, limit: int) -> Optional[list]:
+    """배치 작업이 미리 계산한 추천 목록에서 한 페이지 구성 (없거나 저장 범위를 넘으면 None)"""
+    response = supabase.table("user_recommendations")\
+        .select("entries")\
+        .eq("user_id", user_id)\
+        .execute()
     
+    if not response.data:
+        return None
+    
+    entries = response.data[0].get('entries') or []
+    
+    # 활동 본문은 인메모리 색인에서 채움 (마감/비활성 활동 제외, 색인 갱신은 호출하는 쪽에서)
+    today = date.today().isoformat()
+    
+    scored_activities = []
+    for entry in entries:
+        activity = activity_index.activities.get(entry['activity_id'])
+        if not activity or str(activity.get('application_end_date') or '')[:10] < today:
+            continue
+        scored_activities.append({
+            **activity,
+            'match_score': entry['match_score'],
+            'match_reasons': entry['match_reasons'],
+            'days_left': calculate_days_left(activity.get('application_end_date'))
+        })
+    
+    if offset + limit > len(scored_activities) and len(entries) >= settings.recommendation_materialized_limit:
+        return None
+    
+    return scored_activities[offset:offset + limit]
+
+def compute_recommended_page(
+    supabase,
+    user_id: str,
+    category: Optional[str],
+    fields_list: Optional[List[str]],
+    offset: int,
+    limit: int,
+    status: str,
+    sort: str
+) -> list:
+    """사용자 정보/설정을 읽어 추천 페이지를 실시간 계산"""
     # 사용자 정보 및 설정 조회
     user_response = supabase.table("users")\
         .select("major")\
@@ -113,45 +145,96 @@ async def list_recommended_activities(
             'preferred_difficulty': user_prefs.get('preferred_difficulty')
         })
     
-    # 활동 조회
-    query = supabase.table("activities")\
-        .select("*")\
-        .eq("status", status)\
-        .gte("application_end_date", date.today().isoformat())
-    
-    if category:
-        query = query.eq("category", category)
-    
-    if fields:
-        fields_list = fields.split(',')
-        query = query.overlaps("fields", fields_list)
+    if sort == "recommended" and status == "active":
+        # 인메모리 색인으로 전체 카탈로그 기준 Top-K 추천 (색인 갱신은 호출하는 쪽에서)
+        top = activity_index.top_k(
+            user_data,
+            offset + limit,
+            calculate_match_score,
+            category=category,
+            fields=fields_list
+        )
+        
+        scored_activities = [
+            {
+                **activity,
+                'match_score': match_score,
+                'match_reasons': match_reasons,
+                'days_left': calculate_days_left(activity.get('application_end_date'))
+            }
+            for match_score, match_reasons, activity in top[offset:]
+        ]
+    else:
+        # 활동 조회
+        query = supabase.table("activities")\
+            .select("*")\
+            .eq("status", status)\
+            .gte("application_end_date", date.today().isoformat())
+        
+        if category:
+            query = query.eq("category", category)
+        
+        if fields_list:
+            query = query.overlaps("fields", fields_list)
+        
+        # 페이지네이션
+        query = query.range(offset, offset + limit - 1)
+        
+        activities_response = query.execute()
+        activities = activities_response.data or []
+        
+        # 추천 점수 계산
+        scored_activities = []
+        for activity in activities:
+            match_score, match_reasons = calculate_match_score(user_data, activity)
+            activity_with_score = {
+                **activity,
+                'match_score': match_score,
+                'match_reasons': match_reasons,
+                'days_left': calculate_days_left(activity.get('application_end_date'))
+            }
+            scored_activities.append(activity_with_score)
+        
+        # 정렬
+        if sort == "recommended":
+            scored_activities.sort(key=lambda x: x['match_score'], reverse=True)
+        elif sort == "deadline":
+            scored_activities.sort(key=lambda x: x['days_left'])
+        elif sort == "popular":
+            scored_activities.sort(key=lambda x: x.get('bookmark_count', 0), reverse=True)
+    
+    return scored_activities
+
+@router.get("/activities", response_model=SuccessResponse)
+async def list_recommended_activities(
+    category: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    page: int = Query(1, ge=1),
+    status: str = Query("active"),
+    sort: str = Query("recommended"),
+    current_user: dict = Depends(get_current_user),
+    supabase = Depends(get_supabase)
+):
+    """개인화 추천 활동 조회"""
+    user_id = current_user['id']
     
-    # 페이지네이션
+    fields_list = fields.split(',') if fields else None
     offset = (page - 1) * limit
-    query = query.range(offset, offset + limit - 1)
+    scored_activities = None
     
-    activities_response = query.execute()
-    activities = activities_response.data or []
+    if sort == "recommended" and status == "active":
+        # 인메모리 색인 갱신은 DB 를 읽으므로 이벤트 루프 밖에서 (전체 재적재 중에도 이전 색인으로 응답)
+        await asyncio.to_thread(activity_index.refresh, supabase)
     
-    # 추천 점수 계산
-    scored_activities = []
-    for activity in activities:
-        match_score, match_reasons = calculate_match_score(user_data, activity)
-        activity_with_score = {
-            **activity,
-            'match_score': match_score,
-            'match_reasons': match_reasons,
-            'days_left': calculate_days_left(activity.get('application_end_date'))
-        }
-        scored_activities.append(activity_with_score)
+    if sort == "recommended" and status == "active" and not category and not fields_list:
+        # 배치 작업(recommendation_jobs)이 미리 계산한 추천 목록 조회
+        scored_activities = load_materialized_page(supabase, user_id, offset, limit)
     
-    # 정렬
-    if sort == "recommended":
-        scored_activities.sort(key=lambda x: x['match_score'], reverse=True)
-    elif sort == "deadline":
-        scored_activities.sort(key=lambda x: x['days_left'])
-    elif sort == "popular":
-        scored_activities.sort(key=lambda x: x.get('bookmark_count', 0), reverse=True)
+    if scored_activities is None:
+        scored_activities = compute_recommended_page(
+            supabase, user_id, category, fields_list, offset, limit, status, sort
+        )
     
     # 북마크 정보 추가
     if scored_activities:
@@ -480,6 +563,12 @@ async def save_preferences(
         .upsert(prefs_data)\
         .execute()
     
+    # 사전 계산된 추천 목록 무효화 (다음 배치 실행 시 재계산)
+    supabase.table("user_recommendations")\
+        .delete()\
+        .eq("user_id", user_id)\
+        .execute()
+    
     return SuccessResponse(
         data={"preferences": response.data[0]},
         message="설정이 저장되었습니다",
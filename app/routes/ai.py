@@ -5,10 +5,31 @@ from pydantic import BaseModel
 from app.database import get_supabase
 from app.schemas import SuccessResponse
 from app.utils.auth import get_current_user_id
+from app.utils.text_matcher import MultiPatternMatcher
 import os
 
 router = APIRouter()
 
+# 간단한 키워드 매핑 (실제로는 Gemini API 사용)
+ACTIVITY_TYPE_TAGS = {
+    "contest": ["기획", "발표", "팀워크", "아이디어"],
+    "club": ["협업", "리더십", "네트워킹", "팀빌딩"],
+    "project": ["개발", "문제해결", "디자인", "기획"],
+    "internship": ["업무", "실무경험", "커뮤니케이션", "전문성"],
+    "study": ["학습", "성장", "집중", "자기계발"],
+    "etc": ["경험", "활동", "참여", "도전"]
+}
+
+# memo 에 포함되면 추가하는 태그: {태그: [단어, ...]} (순서대로 추가)
+memo_tag_matcher = MultiPatternMatcher({
+    "발표": ["발표", "프레젠테이션"],
+    "회의": ["회의"],
+    "기획": ["기획"],
+    "디자인": ["디자인"],
+    "개발": ["코딩", "개발"],
+    "데이터분석": ["분석", "데이터"]
+})
+
 class TagSuggestionRequest(BaseModel):
     """AI 태그 제안 요청"""
     activity_type: str
@@ -21,37 +42,15 @@ async def suggest_tags(
 ):
     """AI 태그 제안 (회고 v3 시스템용)"""
     try:
-        # 간단한 키워드 매핑 (실제로는 Gemini API 사용)
-        activity_keywords = {
-            "contest": ["기획", "발표", "팀워크", "아이디어"],
-            "club": ["협업", "리더십", "네트워킹", "팀빌딩"],
-            "project": ["개발", "문제해결", "디자인", "기획"],
-            "internship": ["업무", "실무경험", "커뮤니케이션", "전문성"],
-            "study": ["학습", "성장", "집중", "자기계발"],
-            "etc": ["경험", "활동", "참여", "도전"]
-        }
-        
         # memo에서 키워드 추출 (간단한 버전)
-        memo_lower = request.memo.lower()
         suggested = []
         
         # 활동 유형 기반 태그
-        base_tags = activity_keywords.get(request.activity_type, ["활동"])
+        base_tags = ACTIVITY_TYPE_TAGS.get(request.activity_type, ["활동"])
         suggested.extend(base_tags[:3])
         
-        # memo에 특정 단어 포함 시 추가 태그
-        if "발표" in request.memo or "프레젠테이션" in request.memo:
-            suggested.append("발표")
-        if "회의" in request.memo:
-            suggested.append("회의")
-        if "기획" in request.memo:
-            suggested.append("기획")
-        if "디자인" in request.memo:
-            suggested.append("디자인")
-        if "코딩" in request.memo or "개발" in request.memo:
-            suggested.append("개발")
-        if "분석" in request.memo or "데이터" in request.memo:
-            suggested.append("데이터분석")
+        # memo에 특정 단어 포함 시 추가 태그 (한 번 스캔)
+        suggested.extend(memo_tag_matcher.labels(request.memo))
         
         # 중복 제거 및 최대 5개
         unique_tags = list(dict.fromkeys(suggested))[:5]
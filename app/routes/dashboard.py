@@ -1,90 +1,160 @@
-from fastapi import APIRouter, HTTPException, Header
+from fastapi import APIRouter, HTTPException, Header, Response
 from datetime import datetime, timedelta
+import time
 from app.database import get_supabase
+from app.config import settings
 from app.schemas import SuccessResponse
+from app.utils.fanout import QueryFanout
+from app.utils.stats_cache import stats_cache
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
-@router.get("/stats", response_model=SuccessResponse)
-async def get_dashboard_stats(
-    x_user_id: str = Header(..., alias="x-user-id")
-):
-    """대시보드 통계"""
-    try:
-        supabase = get_supabase()
-        
+# dashboard_stats RPC(app/sql/dashboard_stats.sql)가 없을 때 다시 시도하기까지 대기
+_rpc_unavailable_until = 0.0
+
+async def collect_stats_rpc(supabase, user_id: str, fanout: QueryFanout) -> dict:
+    """dashboard_stats RPC 한 번으로 집계"""
+    now = datetime.now()
+    results = await fanout.run({
+        "dashboard_stats_rpc": supabase.rpc("dashboard_stats", {
+            "p_user_id": user_id,
+            "p_week_start": (now - timedelta(days=7)).isoformat(),
+            "p_month_start": (now - timedelta(days=30)).isoformat(),
+            "p_week_date": (now - timedelta(days=7)).date().isoformat(),
+            "p_month_date": (now - timedelta(days=30)).date().isoformat()
+        })
+    })
+    
+    stats = dict(results["dashboard_stats_rpc"].data)
+    stats["recent_dates"] = [{"reflection_date": d} for d in stats.get("recent_dates") or []]
+    return stats
+
+async def collect_stats_queries(supabase, user_id: str, fanout: QueryFanout) -> dict:
+    """개별 쿼리를 동시에 실행해 집계 (RPC 미설치 환경용)"""
+    week_ago = (datetime.now() - timedelta(days=7)).isoformat()
+    month_ago = (datetime.now() - timedelta(days=30)).isoformat()
+    
+    # 서로 독립적인 쿼리는 동시에 실행
+    results = await fanout.run({
         # 전체 통계
-        logs_count = supabase.table("logs").select("id", count="exact").eq("user_id", x_user_id).execute()
-        projects_count = supabase.table("projects").select("id", count="exact").eq("user_id", x_user_id).execute()
-        keywords_count = supabase.table("user_keywords").select("id", count="exact").eq("user_id", x_user_id).execute()
-        reflections_count = supabase.table("reflections").select("id", count="exact").eq("user_id", x_user_id).execute()
+        "logs_count": supabase.table("logs").select("id", count="exact").eq("user_id", user_id),
+        "projects_count": supabase.table("projects").select("id", count="exact").eq("user_id", user_id),
+        "keywords_count": supabase.table("user_keywords").select("id", count="exact").eq("user_id", user_id),
+        "reflections_count": supabase.table("reflections").select("id", count="exact").eq("user_id", user_id),
         
         # 회고 스페이스 통계
-        active_spaces = supabase.table("reflection_spaces")\
+        "active_spaces": supabase.table("reflection_spaces")\
             .select("id", count="exact")\
-            .eq("user_id", x_user_id)\
-            .eq("status", "active")\
-            .execute()
+            .eq("user_id", user_id)\
+            .eq("status", "active"),
         
         # 활성 프로젝트
-        active_projects = supabase.table("projects").select("id", count="exact").eq("user_id", x_user_id).eq("status", "active").execute()
+        "active_projects": supabase.table("projects").select("id", count="exact").eq("user_id", user_id).eq("status", "active"),
         
         # 이번 주 통계
-        week_ago = (datetime.now() - timedelta(days=7)).isoformat()
-        this_week_logs = supabase.table("logs").select("id", count="exact").eq("user_id", x_user_id).gte("created_at", week_ago).execute()
-        this_week_reflections = supabase.table("reflections")\
+        "this_week_logs": supabase.table("logs").select("id", count="exact").eq("user_id", user_id).gte("created_at", week_ago),
+        "this_week_reflections": supabase.table("reflections")\
             .select("id", count="exact")\
-            .eq("user_id", x_user_id)\
-            .gte("reflection_date", (datetime.now() - timedelta(days=7)).date().isoformat())\
-            .execute()
+            .eq("user_id", user_id)\
+            .gte("reflection_date", (datetime.now() - timedelta(days=7)).date().isoformat()),
         
         # 이번 달 통계
-        month_ago = (datetime.now() - timedelta(days=30)).isoformat()
-        this_month_logs = supabase.table("logs").select("id", count="exact").eq("user_id", x_user_id).gte("created_at", month_ago).execute()
-        this_month_reflections = supabase.table("reflections")\
+        "this_month_logs": supabase.table("logs").select("id", count="exact").eq("user_id", user_id).gte("created_at", month_ago),
+        "this_month_reflections": supabase.table("reflections")\
             .select("id", count="exact")\
-            .eq("user_id", x_user_id)\
-            .gte("reflection_date", (datetime.now() - timedelta(days=30)).date().isoformat())\
-            .execute()
+            .eq("user_id", user_id)\
+            .gte("reflection_date", (datetime.now() - timedelta(days=30)).date().isoformat()),
         
         # 평균 진행 점수
-        reflections_data = supabase.table("reflections")\
+        "reflections_data": supabase.table("reflections")\
             .select("progress_score")\
-            .eq("user_id", x_user_id)\
-            .execute()
-        
-        scores = [r.get('progress_score', 0) for r in reflections_data.data if r.get('progress_score')]
-        avg_progress = sum(scores) / len(scores) if scores else 0
+            .eq("user_id", user_id),
         
         # 연속 작성일 계산
-        recent_dates = supabase.table("reflections")\
+        "recent_dates": supabase.table("reflections")\
             .select("reflection_date")\
-            .eq("user_id", x_user_id)\
+            .eq("user_id", user_id)\
             .order("reflection_date", desc=True)\
-            .limit(30)\
-            .execute()
+            .limit(30)
+    })
+    
+    scores = [r.get('progress_score', 0) for r in results["reflections_data"].data if r.get('progress_score')]
+    
+    return {
+        "total_logs": results["logs_count"].count or 0,
+        "total_projects": results["projects_count"].count or 0,
+        "total_keywords": results["keywords_count"].count or 0,
+        "total_reflections": results["reflections_count"].count or 0,
+        "active_projects": results["active_projects"].count or 0,
+        "active_spaces": results["active_spaces"].count or 0,
+        "avg_progress_score": sum(scores) / len(scores) if scores else 0,
+        "this_week_logs": results["this_week_logs"].count or 0,
+        "this_week_reflections": results["this_week_reflections"].count or 0,
+        "this_month_logs": results["this_month_logs"].count or 0,
+        "this_month_reflections": results["this_month_reflections"].count or 0,
+        "recent_dates": results["recent_dates"].data
+    }
+
+async def collect_stats(supabase, user_id: str, fanout: QueryFanout) -> dict:
+    """설정(dashboard_stats_mode)에 따라 RPC 또는 개별 쿼리로 집계"""
+    global _rpc_unavailable_until
+    
+    mode = settings.dashboard_stats_mode
+    if mode == "rpc":
+        return await collect_stats_rpc(supabase, user_id, fanout)
+    
+    if mode == "auto" and time.monotonic() >= _rpc_unavailable_until:
+        try:
+            return await collect_stats_rpc(supabase, user_id, fanout)
+        except Exception as e:
+            print(f"[WARN] dashboard_stats RPC 사용 불가, 개별 쿼리로 대체: {str(e)}")
+            _rpc_unavailable_until = time.monotonic() + settings.dashboard_rpc_retry_seconds
+    
+    return await collect_stats_queries(supabase, user_id, fanout)
+
+@router.get("/stats", response_model=SuccessResponse)
+async def get_dashboard_stats(
+    response: Response,
+    x_user_id: str = Header(..., alias="x-user-id")
+):
+    """대시보드 통계"""
+    try:
+        cached = stats_cache.get(x_user_id, "dashboard_stats")
+        if cached is not None:
+            response.headers["X-Cache"] = "HIT"
+            return SuccessResponse(data=cached, timestamp=datetime.now())
         
-        streak_days = calculate_streak(recent_dates.data)
+        supabase = get_supabase()
         
-        return SuccessResponse(
-            data={
-                "total_logs": logs_count.count or 0,
-                "total_projects": projects_count.count or 0,
-                "total_keywords": keywords_count.count or 0,
-                "total_reflections": reflections_count.count or 0,
-                "active_projects": active_projects.count or 0,
-                "active_spaces": active_spaces.count or 0,
-                "reflection_streak": streak_days,
-                "avg_progress_score": round(avg_progress, 2),
-                "this_week": {
-                    "logs": this_week_logs.count or 0,
-                    "reflections": this_week_reflections.count or 0
-                },
-                "this_month": {
-                    "logs": this_month_logs.count or 0,
-                    "reflections": this_month_reflections.count or 0
-                }
+        fanout = QueryFanout()
+        stats = await collect_stats(supabase, x_user_id, fanout)
+        response.headers["Server-Timing"] = fanout.server_timing()
+        response.headers["X-Cache"] = "MISS"
+        
+        streak_days = calculate_streak(stats["recent_dates"])
+        
+        data = {
+            "total_logs": stats["total_logs"],
+            "total_projects": stats["total_projects"],
+            "total_keywords": stats["total_keywords"],
+            "total_reflections": stats["total_reflections"],
+            "active_projects": stats["active_projects"],
+            "active_spaces": stats["active_spaces"],
+            "reflection_streak": streak_days,
+            "avg_progress_score": round(float(stats["avg_progress_score"]), 2),
+            "this_week": {
+                "logs": stats["this_week_logs"],
+                "reflections": stats["this_week_reflections"]
             },
+            "this_month": {
+                "logs": stats["this_month_logs"],
+                "reflections": stats["this_month_reflections"]
+            }
+        }
+        stats_cache.set(x_user_id, "dashboard_stats", data)
+        
+        return SuccessResponse(
+            data=data,
             timestamp=datetime.now()
         )
     except Exception as e:
@@ -123,33 +193,38 @@ def calculate_streak(reflections_data):
 
 @router.get("/recent-activity", response_model=SuccessResponse)
 async def get_recent_activity(
+    response: Response,
     x_user_id: str = Header(..., alias="x-user-id")
 ):
     """최근 활동 조회"""
     try:
         supabase = get_supabase()
         
-        # 최근 로그
-        recent_logs = supabase.table("logs").select("""
+        fanout = QueryFanout()
+        results = await fanout.run({
+            # 최근 로그
+            "recent_logs": supabase.table("logs").select("""
             id,
             title,
             created_at,
             projects (name)
-        """).eq("user_id", x_user_id).order("created_at", desc=True).limit(5).execute()
-        
-        # 최근 회고
-        recent_reflections = supabase.table("reflections").select("""
+        """).eq("user_id", x_user_id).order("created_at", desc=True).limit(5),
+            
+            # 최근 회고
+            "recent_reflections": supabase.table("reflections").select("""
             id,
             ai_feedback,
             mood,
             reflection_date,
             created_at,
             reflection_spaces (name)
-        """).eq("user_id", x_user_id).order("created_at", desc=True).limit(5).execute()
+        """).eq("user_id", x_user_id).order("created_at", desc=True).limit(5)
+        })
+        response.headers["Server-Timing"] = fanout.server_timing()
         
         activities = []
         
-        for log in recent_logs.data:
+        for log in results["recent_logs"].data:
             project_name = log.get("projects", {}).get("name", "알 수 없음") if log.get("projects") else "알 수 없음"
             activities.append({
                 "type": "log",
@@ -158,7 +233,7 @@ async def get_recent_activity(
                 "created_at": log["created_at"]
             })
         
-        for reflection in recent_reflections.data:
+        for reflection in results["recent_reflections"].data:
             space_name = reflection.get("reflection_spaces", {}).get("name", "알 수 없음") if reflection.get("reflection_spaces") else "알 수 없음"
             snippet = reflection.get("ai_feedback", "")[:50] + "..." if reflection.get("ai_feedback") else "회고 작성"
             activities.append({
@@ -182,45 +257,77 @@ async def get_recent_activity(
 
 @router.get("/reflection-overview", response_model=SuccessResponse)
 async def get_reflection_overview(
+    response: Response,
     x_user_id: str = Header(..., alias="x-user-id")
 ):
     """회고 개요 (대시보드용)"""
     try:
+        cached = stats_cache.get(x_user_id, "reflection_overview")
+        if cached is not None:
+            response.headers["X-Cache"] = "HIT"
+            return SuccessResponse(data=cached, timestamp=datetime.now())
+        
         supabase = get_supabase()
         
-        # 활성 스페이스 목록
-        spaces = supabase.table("reflection_spaces")\
-            .select("id, name, type, total_reflections, expected_reflections, next_reflection_date")\
-            .eq("user_id", x_user_id)\
-            .eq("status", "active")\
-            .order("next_reflection_date")\
-            .limit(5)\
-            .execute()
-        
-        # 최근 회고
-        recent_reflections = supabase.table("reflections")\
-            .select("id, mood, progress_score, reflection_date, reflection_spaces(name)")\
-            .eq("user_id", x_user_id)\
-            .order("reflection_date", desc=True)\
-            .limit(5)\
-            .execute()
+        fanout = QueryFanout()
+        results = await fanout.run({
+            # 활성 스페이스 목록
+            "spaces": supabase.table("reflection_spaces")\
+                .select("id, name, type, total_reflections, expected_reflections, next_reflection_date")\
+                .eq("user_id", x_user_id)\
+                .eq("status", "active")\
+                .order("next_reflection_date")\
+                .limit(5),
+            
+            # 최근 회고
+            "recent_reflections": supabase.table("reflections")\
+                .select("id, mood, progress_score, reflection_date, reflection_spaces(name)")\
+                .eq("user_id", x_user_id)\
+                .order("reflection_date", desc=True)\
+                .limit(5)
+        })
+        response.headers["Server-Timing"] = fanout.server_timing()
+        response.headers["X-Cache"] = "MISS"
         
         # 오늘 작성해야 할 회고
         today = datetime.now().date()
         due_today = [
-            space for space in spaces.data 
+            space for space in results["spaces"].data 
             if space.get('next_reflection_date') and 
             datetime.fromisoformat(space['next_reflection_date']).date() <= today
         ]
         
+        data = {
+            "active_spaces": results["spaces"].data,
+            "recent_reflections": results["recent_reflections"].data,
+            "due_today_count": len(due_today),
+            "due_today": due_today
+        }
+        stats_cache.set(x_user_id, "reflection_overview", data)
+        
         return SuccessResponse(
-            data={
-                "active_spaces": spaces.data,
-                "recent_reflections": recent_reflections.data,
-                "due_today_count": len(due_today),
-                "due_today": due_today
-            },
+            data=data,
             timestamp=datetime.now()
         )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/cache-metrics", response_model=SuccessResponse)
+async def get_cache_metrics():
+    """대시보드 통계 캐시 적중률"""
+    return SuccessResponse(
+        data=stats_cache.metrics(),
+        timestamp=datetime.now()
+    )
+
+@router.post("/cache/invalidate", response_model=SuccessResponse)
+async def invalidate_dashboard_cache(
+    x_user_id: str = Header(..., alias="x-user-id")
+):
+    """대시보드 통계 캐시 무효화 (회고 작성 등 외부에서 데이터가 바뀐 경우)"""
+    stats_cache.invalidate(x_user_id)
+    
+    return SuccessResponse(
+        message="캐시가 무효화되었습니다",
+        timestamp=datetime.now()
+    )
@@ -1,19 +1,43 @@
-from fastapi import APIRouter, HTTPException, Header
+from fastapi import APIRouter, HTTPException, Header, Query, Response
 from datetime import datetime
+from typing import Optional
 from app.database import get_supabase
 from app.schemas import SuccessResponse
+from app.utils.keyword_cache import keyword_cache
+from app.utils.stats_cache import stats_cache
 
 router = APIRouter(prefix="/keywords", tags=["keywords"])
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
 @router.get("", response_model=SuccessResponse)
-async def list_keywords():
-    """키워드 마스터 목록 조회"""
+async def list_keywords(
+    response: Response,
+    since: Optional[str] = Query(None),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match")
+):
+    """키워드 마스터 목록 조회
+    
+    프로세스 캐시(utils/keyword_cache.py)에서 반환한다. ETag 가 If-None-Match 와 같으면 304,
+    since=<version> 이면 그 버전 이후 추가/수정/삭제된 키워드만 반환한다 (모르는 버전이면 full=True 로 전체).
+    """
     try:
         supabase = get_supabase()
-        response = supabase.table("keywords").select("*").execute()
+        version, keywords = keyword_cache.get(supabase)
+        etag = f'"{version}"'
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "no-cache"
+        data = keyword_cache.delta(supabase, since) if since else {"version": version, "keywords": keywords}
         
         return SuccessResponse(
-            data={"keywords": response.data},
+            data=data,
             timestamp=datetime.now()
         )
     except Exception as e:
@@ -61,6 +85,9 @@ async def add_user_keyword(keyword_id: str, x_user_id: str = Header(..., alias="
                 "keyword_id": keyword_id,
                 "experience_count": 1
             }).execute()
+            stats_cache.bump(x_user_id, "dashboard_stats", ("total_keywords",))
+        # 자동완성 키워드 가산점(경험 수) 다시 읽기
+        stats_cache.invalidate(x_user_id, "keyword_experience")
         
         return SuccessResponse(
             data={"user_keyword": response.data[0]},
@@ -80,6 +107,9 @@ async def remove_user_keyword(keyword_id: str, x_user_id: str = Header(..., alia
         if not response.data:
             raise HTTPException(status_code=404, detail="User keyword not found")
         
+        stats_cache.bump(x_user_id, "dashboard_stats", ("total_keywords",), -1)
+        stats_cache.invalidate(x_user_id, "keyword_experience")
+        
         return SuccessResponse(
             message="Keyword removed successfully",
             timestamp=datetime.now()
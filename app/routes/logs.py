@@ -3,6 +3,8 @@ from datetime import datetime
 from typing import Optional
 from app.database import get_supabase
 from app.schemas import LogCreate, LogUpdate, SuccessResponse
+from app.utils.stats_cache import stats_cache
+from app.utils.search_index import search_index
 
 router = APIRouter(prefix="/logs", tags=["logs"])
 
@@ -22,6 +24,13 @@ async def create_log(log: LogCreate, x_user_id: str = Header(..., alias="x-user-
             "tags": log.tags,
         }).execute()
         
+        # 캐시된 대시보드 카운터 갱신
+        stats_cache.bump(x_user_id, "dashboard_stats", ("total_logs",))
+        stats_cache.bump(x_user_id, "dashboard_stats", ("this_week", "logs"))
+        stats_cache.bump(x_user_id, "dashboard_stats", ("this_month", "logs"))
+        stats_cache.bump(x_user_id, "user_stats", ("totalLogs",))
+        search_index.upsert("logs", response.data[0], x_user_id)
+        
         return SuccessResponse(
             data={"log": response.data[0]},
             message="Log created successfully",
@@ -95,6 +104,7 @@ async def update_log(log_id: str, log_update: LogUpdate, x_user_id: str = Header
         if not response.data:
             raise HTTPException(status_code=404, detail="Log not found")
         
+        search_index.upsert("logs", response.data[0], x_user_id)
         return SuccessResponse(
             data={"log": response.data[0]},
             message="Log updated successfully",
@@ -113,6 +123,11 @@ async def delete_log(log_id: str, x_user_id: str = Header(..., alias="x-user-id"
         if not response.data:
             raise HTTPException(status_code=404, detail="Log not found")
         
+        search_index.remove("logs", log_id, x_user_id)
+        # 주/월 카운트는 삭제된 로그의 작성일에 따라 달라지므로 통계 캐시 무효화
+        stats_cache.invalidate(x_user_id, "dashboard_stats")
+        stats_cache.bump(x_user_id, "user_stats", ("totalLogs",), -1)
+        
         return SuccessResponse(
             message="Log deleted successfully",
             timestamp=datetime.now()
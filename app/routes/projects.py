@@ -3,6 +3,8 @@ from datetime import datetime
 from typing import Optional
 from app.database import get_supabase
 from app.schemas import ProjectCreate, ProjectUpdate, SuccessResponse
+from app.utils.stats_cache import stats_cache
+from app.utils.search_index import search_index
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
@@ -22,6 +24,13 @@ async def create_project(project: ProjectCreate, x_user_id: str = Header(..., al
             "thumbnail_url": project.thumbnail_url,
         }).execute()
         
+        # 캐시된 대시보드 카운터 갱신
+        stats_cache.bump(x_user_id, "dashboard_stats", ("total_projects",))
+        if response.data[0].get("status", "active") == "active":
+            stats_cache.bump(x_user_id, "dashboard_stats", ("active_projects",))
+        stats_cache.bump(x_user_id, "user_stats", ("totalActivities",))
+        search_index.upsert("projects", response.data[0], x_user_id)
+        
         return SuccessResponse(
             data={"project": response.data[0]},
             message="Project created successfully",
@@ -94,6 +103,11 @@ async def update_project(project_id: str, project_update: ProjectUpdate, x_user_
         if not response.data:
             raise HTTPException(status_code=404, detail="Project not found")
         
+        search_index.upsert("projects", response.data[0], x_user_id)
+        # 상태가 바뀌면 활성 프로젝트 수가 달라짐
+        if "status" in update_data:
+            stats_cache.invalidate(x_user_id, "dashboard_stats")
+        
         return SuccessResponse(
             data={"project": response.data[0]},
             message="Project updated successfully",
@@ -112,6 +126,10 @@ async def delete_project(project_id: str, x_user_id: str = Header(..., alias="x-
         if not response.data:
             raise HTTPException(status_code=404, detail="Project not found")
         
+        search_index.remove("projects", project_id, x_user_id)
+        stats_cache.invalidate(x_user_id, "dashboard_stats")
+        stats_cache.bump(x_user_id, "user_stats", ("totalActivities",), -1)
+        
         return SuccessResponse(
             message="Project deleted successfully",
             timestamp=datetime.now()
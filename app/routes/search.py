@@ -1,120 +1,81 @@
-from fastapi import APIRouter, HTTPException, Header, Query
+from fastapi import APIRouter, HTTPException, Header, Query, Response
 from datetime import datetime
+from typing import Optional
+from app.config import settings
 from app.database import get_supabase
 from app.schemas import SuccessResponse
+from app.utils.fanout import QueryFanout
+from app.utils.search_index import ENTITIES, search_index
+from app.utils.autocomplete import KINDS, autocomplete_index
 
 router = APIRouter(prefix="/search", tags=["search"])
 
 @router.get("", response_model=SuccessResponse)
 async def search(
+    response: Response,
     x_user_id: str = Header(..., alias="x-user-id"),
     q: str = Query(..., min_length=1),
-    type: str = Query("all")
+    type: str = Query("all"),
+    limit: Optional[int] = Query(None, ge=1, le=settings.search_result_max_limit),
+    cursor: Optional[str] = Query(None)
 ):
-    """통합 검색"""
+    """통합 검색
+    
+    로그/프로젝트/키워드/회고/회고 스페이스/템플릿을 메모리 역색인(utils/search_index.py)에서 한 번에 찾는다.
+    한글은 2~3글자 n-gram, 영문/숫자는 단어 단위(마지막 단어는 접두어)로 맞추고 관련도 순으로 정렬한다.
+    
+    - limit: 종류별 결과 수, next_cursor 를 cursor 로 넘기면 다음 페이지가 남은 종류만 이어서 반환
+    - pending: 색인 적재가 search_timeout_ms 안에 끝나지 않아 이번 응답에서 빠진 종류 (잠시 후 다시 검색)
+    """
     try:
-        supabase = get_supabase()
-        results = {
-            "logs": [],
-            "projects": [],
-            "keywords": [],
-            "reflections": [],
-            "spaces": [],
-            "templates": []
-        }
-        
-        if type in ["all", "logs"]:
-            # 로그 검색
-            logs = supabase.table("logs").select("id, title, content").eq("user_id", x_user_id).ilike("title", f"%{q}%").execute()
-            results["logs"] = [
-                {
-                    "id": log["id"],
-                    "title": log["title"],
-                    "snippet": log.get("content", "")[:100] + "..." if log.get("content") else ""
-                }
-                for log in logs.data
-            ]
-        
-        if type in ["all", "projects"]:
-            # 프로젝트 검색
-            projects = supabase.table("projects").select("id, name").eq("user_id", x_user_id).ilike("name", f"%{q}%").execute()
-            results["projects"] = [
-                {
-                    "id": project["id"],
-                    "name": project["name"]
-                }
-                for project in projects.data
-            ]
+        if type != "all" and type not in ENTITIES:
+            raise ValueError(f"Unknown search type: {type}")
+        types = list(ENTITIES) if type == "all" else [type]
         
-        if type in ["all", "keywords"]:
-            # 키워드 검색
-            keywords = supabase.table("keywords").select("id, name").ilike("name", f"%{q}%").execute()
-            results["keywords"] = [
-                {
-                    "id": keyword["id"],
-                    "name": keyword["name"]
-                }
-                for keyword in keywords.data
-            ]
-        
-        if type in ["all", "reflections"]:
-            # 회고 검색 (AI 피드백 또는 답변 내용)
-            reflections = supabase.table("reflections")\
-                .select("id, space_id, ai_feedback, reflection_date, mood")\
-                .eq("user_id", x_user_id)\
-                .or_(f"ai_feedback.ilike.%{q}%")\
-                .limit(10)\
-                .execute()
-            
-            results["reflections"] = [
-                {
-                    "id": r["id"],
-                    "space_id": r.get("space_id"),
-                    "snippet": r.get("ai_feedback", "")[:100] + "..." if r.get("ai_feedback") else "",
-                    "date": r.get("reflection_date"),
-                    "mood": r.get("mood")
-                }
-                for r in reflections.data
-            ]
+        supabase = get_supabase()
+        # 종류별 테이블을 동시에 적재/증분 조회하고, 제한 시간이 지나면 준비된 종류로 먼저 응답
+        fanout = QueryFanout()
+        pending = await search_index.ensure(
+            supabase, x_user_id, fanout, timeout=settings.search_timeout_ms / 1000
+        )
+        results, next_cursor = search_index.search(x_user_id, q, types, limit=limit, cursor=cursor)
+        if fanout.timings:
+            response.headers["Server-Timing"] = fanout.server_timing()
         
-        if type in ["all", "spaces"]:
-            # 회고 스페이스 검색
-            spaces = supabase.table("reflection_spaces")\
-                .select("id, name, type, status")\
-                .eq("user_id", x_user_id)\
-                .ilike("name", f"%{q}%")\
-                .execute()
-            
-            results["spaces"] = [
-                {
-                    "id": s["id"],
-                    "name": s["name"],
-                    "type": s.get("type"),
-                    "status": s.get("status")
-                }
-                for s in spaces.data
-            ]
+        return SuccessResponse(
+            data={
+                **results,
+                "next_cursor": next_cursor,
+                "pending": [entity for entity in types if entity in pending]
+            },
+            timestamp=datetime.now()
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/autocomplete", response_model=SuccessResponse)
+async def autocomplete(
+    x_user_id: str = Header(..., alias="x-user-id"),
+    q: str = Query(..., min_length=1),
+    types: str = Query("keywords,templates,spaces"),
+    limit: Optional[int] = Query(None, ge=1, le=settings.search_result_max_limit)
+):
+    """키워드 / 템플릿 / 회고 스페이스 이름 자동완성
+    
+    접두어와 초성("ㄷㅇㅌ" → 데이터분석)으로 찾고, 키워드는 사용자의 경험 수가 많을수록 위로 올린다.
+    """
+    try:
+        kinds = [kind.strip() for kind in types.split(",") if kind.strip()]
+        unknown = [kind for kind in kinds if kind not in KINDS]
+        if unknown:
+            raise ValueError(f"Unknown autocomplete type: {', '.join(unknown)}")
         
-        if type in ["all", "templates"]:
-            # 템플릿 검색
-            templates = supabase.table("reflection_templates")\
-                .select("id, name, category, description")\
-                .eq("is_active", True)\
-                .or_(f"name.ilike.%{q}%,description.ilike.%{q}%")\
-                .execute()
-            
-            results["templates"] = [
-                {
-                    "id": t["id"],
-                    "name": t["name"],
-                    "category": t.get("category"),
-                    "description": t.get("description")
-                }
-                for t in templates.data
-            ]
+        supabase = get_supabase()
+        autocomplete_index.ensure(supabase)
+        boosts = autocomplete_index.keyword_boosts(supabase, x_user_id) if "keywords" in kinds else None
         
         return SuccessResponse(
-            data=results,
+            data=autocomplete_index.suggest(q, x_user_id, kinds, limit=limit, boosts=boosts),
             timestamp=datetime.now()
         )
     except Exception as e:
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, UploadFile, File
+from fastapi import APIRouter, Depends, UploadFile, File, Response
 from datetime import datetime
 from app.database import get_supabase
 from pydantic import BaseModel
 from typing import Optional
 from app.utils.auth import get_current_user_id
+from app.utils.fanout import QueryFanout
+from app.utils.stats_cache import stats_cache
 
 router = APIRouter()
 
@@ -19,13 +21,23 @@ class BaselineMoodUpdate(BaseModel):
     baseline_mood: str  # tired | neutral | positive
 
 @router.get("/me")
-async def get_current_user(user_id: str = Depends(get_current_user_id)):
+async def get_current_user(response: Response, user_id: str = Depends(get_current_user_id)):
     """내 정보 조회"""
     try:
         supabase = get_supabase()
         
-        # 사용자 조회
-        user_response = supabase.table("users").select("*").eq("id", user_id).execute()
+        # 사용자 조회와 통계 집계를 동시에 실행 (통계는 캐시에 없을 때만)
+        stats = stats_cache.get(user_id, "user_stats")
+        queries = {"user": supabase.table("users").select("*").eq("id", user_id)}
+        if stats is None:
+            queries["activities_count"] = supabase.table("projects").select("id", count="exact").eq("user_id", user_id)
+            queries["logs_count"] = supabase.table("logs").select("id", count="exact").eq("user_id", user_id)
+        
+        fanout = QueryFanout()
+        results = await fanout.run(queries)
+        response.headers["Server-Timing"] = fanout.server_timing()
+        
+        user_response = results["user"]
         
         if not user_response.data:
             return {
@@ -40,12 +52,15 @@ async def get_current_user(user_id: str = Depends(get_current_user_id)):
         user = user_response.data[0]
         
         # 통계 정보 집계
-        activities_count = supabase.table("projects").select("id", count="exact").eq("user_id", user_id).execute().count or 0
-        logs_count = supabase.table("logs").select("id", count="exact").eq("user_id", user_id).execute().count or 0
-        
-        # 연속 기록 계산 (streak)
-        # TODO: 실제 연속 기록 계산 로직 구현
-        streak = 0
+        if stats is None:
+            stats = {
+                "totalActivities": results["activities_count"].count or 0,
+                "totalLogs": results["logs_count"].count or 0,
+                # 연속 기록 계산 (streak)
+                # TODO: 실제 연속 기록 계산 로직 구현
+                "streak": 0
+            }
+            stats_cache.set(user_id, "user_stats", stats)
         
         return {
             "success": True,
@@ -57,11 +72,7 @@ async def get_current_user(user_id: str = Depends(get_current_user_id)):
                 "major": user.get("major"),
                 "profileImage": user.get("profile_image"),
                 "baselineMood": user.get("baseline_mood"),
-                "stats": {
-                    "totalActivities": activities_count,
-                    "totalLogs": logs_count,
-                    "streak": streak
-                },
+                "stats": stats,
                 "createdAt": user["created_at"]
             },
             "error": None
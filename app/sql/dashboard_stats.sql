@@ -0,0 +1,83 @@
+-- 대시보드 통계 집계 RPC (routes/dashboard.py get_dashboard_stats)
+--
+-- 테이블별로 한 번만 스캔하면서 전체/기간별 카운트, 평균 진행 점수,
+-- 연속 작성일 계산용 최근 30개 회고 날짜를 한 번의 호출로 반환한다.
+--
+-- 호출: supabase.rpc("dashboard_stats", {
+--     "p_user_id": ..., "p_week_start": ..., "p_month_start": ...,
+--     "p_week_date": ..., "p_month_date": ...
+-- })
+
+create or replace function dashboard_stats(
+    p_user_id text,
+    p_week_start timestamptz,
+    p_month_start timestamptz,
+    p_week_date date,
+    p_month_date date
+)
+returns json
+language sql
+stable
+as $$
+    with
+    l as (
+        select
+            count(*) as total,
+            count(*) filter (where created_at >= p_week_start) as this_week,
+            count(*) filter (where created_at >= p_month_start) as this_month
+        from logs
+        where user_id = p_user_id
+    ),
+    p as (
+        select
+            count(*) as total,
+            count(*) filter (where status = 'active') as active
+        from projects
+        where user_id = p_user_id
+    ),
+    k as (
+        select count(*) as total
+        from user_keywords
+        where user_id = p_user_id
+    ),
+    r as (
+        select
+            count(*) as total,
+            count(*) filter (where reflection_date >= p_week_date) as this_week,
+            count(*) filter (where reflection_date >= p_month_date) as this_month,
+            -- Python 쪽과 같이 0/NULL 점수는 평균에서 제외
+            avg(progress_score) filter (where progress_score <> 0) as avg_progress
+        from reflections
+        where user_id = p_user_id
+    ),
+    s as (
+        select count(*) as active
+        from reflection_spaces
+        where user_id = p_user_id and status = 'active'
+    ),
+    d as (
+        select coalesce(json_agg(reflection_date order by reflection_date desc), '[]'::json) as dates
+        from (
+            select reflection_date
+            from reflections
+            where user_id = p_user_id
+            order by reflection_date desc
+            limit 30
+        ) recent
+    )
+    select json_build_object(
+        'total_logs', l.total,
+        'total_projects', p.total,
+        'total_keywords', k.total,
+        'total_reflections', r.total,
+        'active_projects', p.active,
+        'active_spaces', s.active,
+        'avg_progress_score', coalesce(r.avg_progress, 0),
+        'this_week_logs', l.this_week,
+        'this_week_reflections', r.this_week,
+        'this_month_logs', l.this_month,
+        'this_month_reflections', r.this_month,
+        'recent_dates', d.dates
+    )
+    from l, p, k, r, s, d;
+$$;
@@ -0,0 +1,22 @@
+-- 사용자별 추천 목록 사전 계산 결과 (batch/recommendation_jobs.py materialize)
+--
+-- 배치 작업이 사용자마다 점수순 상위 recommendation_materialized_limit 개 활동을 한 행으로 저장하고,
+-- GET /api/v1/recommendations/activities (routes/activities.py load_materialized_page) 가
+-- 필터 없는 추천 정렬 요청을 이 행 하나로 응답한다.
+--
+-- - catalog_version: 계산 시점 activities.updated_at 최댓값 (바뀌면 전체 사용자 재계산)
+-- - 추천 설정 저장(save_preferences) 시 해당 사용자 행을 삭제 → 다음 배치까지 실시간 계산
+--
+-- 설치: Supabase SQL Editor 에서 실행 (여러 번 실행해도 안전)
+
+create table if not exists user_recommendations (
+    user_id text primary key,
+    entries jsonb not null default '[]'::jsonb,
+    catalog_version text,
+    computed_at timestamptz not null default now()
+);
+
+-- 배치 작업이 읽는 activities.updated_at (catalog_version) / users, user_preferences 의 updated_at
+alter table activities add column if not exists updated_at timestamptz default now();
+alter table users add column if not exists updated_at timestamptz default now();
+alter table user_preferences add column if not exists updated_at timestamptz default now();
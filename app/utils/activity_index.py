@@ -0,0 +1,198 @@
+"""
+추천 활동 인메모리 인덱스
+
+activities 테이블의 모집 중(active) 활동을 프로세스 메모리에 적재하고
+분야(fields) / 키워드(keywords) / 추천 학과(recommended_majors) / 난이도 역색인을 유지한다.
+
+- 갱신: updated_at 이 마지막 동기화 시각 이후인 행만 (updated_at, id) keyset 으로 다시 읽어 증분 반영
+- 삭제된 행은 증분 조회로 알 수 없으므로 full_rebuild_interval 마다 전체 재적재
+  (새 색인을 따로 만든 뒤 한 번에 교체, 그동안과 실패 시에는 이전 색인으로 응답)
+- refresh() 는 DB 를 읽으므로 라우트에서는 스레드로 호출 (asyncio.to_thread)
+- 추천: 사용자 프로필과 겹치는 역색인 후보만 점수 계산 → 전체 카탈로그 기준 Top-K
+"""
+
+import heapq
+import threading
+import time
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from app.config import settings
+from app.utils.paging import iter_keyset, iter_keyset_after
+
+class ActivityIndex:
+    def __init__(self, refresh_interval: int = 60, full_rebuild_interval: int = 3600):
+        self.refresh_interval = refresh_interval
+        self.full_rebuild_interval = full_rebuild_interval
+
+        self.activities: Dict[str, dict] = {}
+        self.by_field: Dict[str, Set[str]] = {}
+        self.by_keyword: Dict[str, Set[str]] = {}
+        self.by_major: Dict[str, Set[str]] = {}
+        self.by_difficulty: Dict[str, Set[str]] = {}
+
+        self.last_synced_at: Optional[str] = None
+        self.last_refresh = 0.0
+        self.last_full_rebuild = 0.0
+        # _lock: 색인 읽기/변경, _refresh_lock: 한 번에 한 요청만 DB 에서 다시 읽음
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 색인 관리
+    # ------------------------------------------------------------------
+
+    def _postings(self, activity: dict) -> Iterable[Tuple[Dict[str, Set[str]], str]]:
+        for field in activity.get('fields') or []:
+            yield self.by_field, field
+        for keyword in activity.get('keywords') or []:
+            yield self.by_keyword, keyword
+        for major in activity.get('recommended_majors') or []:
+            yield self.by_major, major
+        if activity.get('difficulty_level'):
+            yield self.by_difficulty, activity['difficulty_level']
+
+    def remove(self, activity_id: str):
+        """활동을 색인에서 제거"""
+        old = self.activities.pop(activity_id, None)
+        if not old:
+            return
+
+        for postings, term in self._postings(old):
+            ids = postings.get(term)
+            if ids is None:
+                continue
+            ids.discard(activity_id)
+            if not ids:
+                del postings[term]
+
+    def upsert(self, activity: dict):
+        """활동 추가/수정 (active 가 아니거나 다른 활동의 중복이면 색인에서 제외)"""
+        activity_id = activity['id']
+        self.remove(activity_id)
+
+        if activity.get('status') != 'active' or activity.get('duplicate_of'):
+            return
+
+        self.activities[activity_id] = activity
+        for postings, term in self._postings(activity):
+            postings.setdefault(term, set()).add(activity_id)
+
+    def _swap(self, other: "ActivityIndex"):
+        """다른 곳에서 만든 색인으로 교체 (_lock 안에서 호출)"""
+        self.activities = other.activities
+        self.by_field = other.by_field
+        self.by_keyword = other.by_keyword
+        self.by_major = other.by_major
+        self.by_difficulty = other.by_difficulty
+
+    def refresh(self, supabase, force: bool = False) -> int:
+        """변경된 활동만 다시 읽어 색인 갱신, 반영한 행 수 반환 (전체 재적재는 새 색인을 만들어 교체)"""
+        now = time.monotonic()
+        if not force and now - self.last_refresh < self.refresh_interval:
+            return 0
+
+        with self._refresh_lock:
+            # 다른 요청이 먼저 갱신했으면 건너뜀
+            if not force and time.monotonic() - self.last_refresh < self.refresh_interval:
+                return 0
+
+            full = force or self.last_synced_at is None or now - self.last_full_rebuild >= self.full_rebuild_interval
+            target = ActivityIndex() if full else self
+
+            # 기준 시각은 읽기 전에 고정하고 모든 페이지를 반영한 뒤에 옮김
+            since = None if full else self.last_synced_at
+            newest = since
+            build_query = lambda: supabase.table("activities").select("*")
+            pages = iter_keyset(build_query) if since is None else iter_keyset_after(build_query, "updated_at", since)
+
+            applied = 0
+            for rows in pages:
+                with target._lock:
+                    for row in rows:
+                        target.upsert(row)
+                        if row.get('updated_at') and (newest is None or row['updated_at'] > newest):
+                            newest = row['updated_at']
+                applied += len(rows)
+
+            with self._lock:
+                if full:
+                    self._swap(target)
+                    self.last_full_rebuild = now
+                self.last_synced_at = newest
+
+            self.last_refresh = time.monotonic()
+            return applied
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def candidates(self, user_data: dict) -> Set[str]:
+        """사용자 프로필과 한 항목이라도 겹치는 활동 ID (점수 > 0 이 될 수 있는 활동)"""
+        result: Set[str] = set()
+
+        if user_data.get('major'):
+            result |= self.by_major.get(user_data['major'], set())
+            result |= self.by_major.get('전공무관', set())
+        for keyword in user_data.get('skill_keywords') or []:
+            result |= self.by_keyword.get(keyword, set())
+        for field in user_data.get('interested_fields') or []:
+            result |= self.by_field.get(field, set())
+        if user_data.get('preferred_difficulty'):
+            result |= self.by_difficulty.get(user_data['preferred_difficulty'], set())
+
+        return result
+
+    def _is_eligible(self, activity: dict, today: str, category: Optional[str], fields: Optional[Set[str]]) -> bool:
+        end_date = activity.get('application_end_date')
+        if not end_date or str(end_date)[:10] < today:
+            return False
+        if category and activity.get('category') != category:
+            return False
+        if fields and not fields & set(activity.get('fields') or []):
+            return False
+        return True
+
+    def top_k(
+        self,
+        user_data: dict,
+        k: int,
+        score_fn: Callable[[dict, dict], Tuple[float, dict]],
+        category: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[Tuple[float, dict, dict]]:
+        """전체 카탈로그 기준 매칭 점수 상위 k개 (score, reasons, activity)"""
+        today = date.today().isoformat()
+        fields_set = set(fields) if fields else None
+
+        # 갱신 스레드가 색인을 바꾸는 중이면 기다림 (후보 id 와 활동 본문이 같은 색인에서 나오도록)
+        with self._lock:
+            scored = []
+            candidate_ids = self.candidates(user_data)
+            for activity_id in candidate_ids:
+                activity = self.activities[activity_id]
+                if not self._is_eligible(activity, today, category, fields_set):
+                    continue
+                score, reasons = score_fn(user_data, activity)
+                if score > 0:
+                    scored.append((score, reasons, activity))
+
+            top = heapq.nlargest(k, scored, key=lambda item: item[0])
+
+            # 매칭 후보가 부족하면 0점 활동으로 채움
+            if len(top) < k:
+                for activity_id, activity in self.activities.items():
+                    if activity_id in candidate_ids:
+                        continue
+                    if not self._is_eligible(activity, today, category, fields_set):
+                        continue
+                    top.append((0.0, {}, activity))
+                    if len(top) >= k:
+                        break
+
+            return top
+
+activity_index = ActivityIndex(
+    refresh_interval=settings.activity_index_refresh_seconds,
+    full_rebuild_interval=settings.activity_index_full_rebuild_seconds
+)
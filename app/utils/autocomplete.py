@@ -0,0 +1,249 @@
+"""
+키워드 / 회고 템플릿 / 회고 스페이스 이름 자동완성 (입력 중 검색)
+
+이름을 정렬된 배열에 넣고 bisect 로 접두어 구간만 훑어서 찾는다 (항목 수와 거의 무관하게 1ms 미만).
+
+- 키: 공백을 뺀 소문자 이름, 이름 안 단어(공백/기호 뒤) 시작 위치부터의 나머지도 키로 넣어 "분석" → "데이터 분석"
+- 초성: 한글 음절을 초성으로 바꾼 키 배열을 따로 두고, 질의에 자모가 있으면 초성 배열에서 찾은 뒤
+        완성된 음절 위치는 원래 글자와 같은지 확인 ("ㄷㅇㅌ" → 데이터분석, "데ㅇ" → 데이터분석)
+- 범위: 키워드/템플릿은 공용, 스페이스는 키 앞에 user_id 를 붙여 사용자 자신의 스페이스만
+- 순위: 이름 전체 일치 > 이름 시작 일치 > 단어 시작 일치, 키워드는 사용자의 user_keywords.experience_count 로 가산점
+- 갱신: 첫 요청에서 적재하고 refresh_interval 마다 백그라운드 스레드에서 다시 적재 (그동안은 이전 배열로 응답),
+        API 쓰기는 upsert/remove 로 바로 반영
+"""
+
+import math
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.config import settings
+from app.utils.paging import iter_keyset
+from app.utils.stats_cache import stats_cache
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_CHOSEONG_SET = frozenset(CHOSEONG)
+_SEPARATOR = re.compile(r'[\s\-_/·,.()\[\]]+')
+
+# 일치 종류별 기본 점수 / 경험 수 가산점 배수 (log1p)
+EXACT, NAME_PREFIX, WORD_PREFIX = 3.0, 2.0, 1.0
+BOOST_WEIGHT = 1.0
+
+# 키 배열 원소: (키, 항목 id, 이름 안 시작 위치)
+Entry = Tuple[str, str, int]
+
+def normalize(text: Optional[str]) -> str:
+    """소문자 + 공백/구분 기호 제거"""
+    return _SEPARATOR.sub("", (text or "").lower())
+
+def choseong(text: str) -> str:
+    """한글 음절 → 초성, 나머지 글자는 그대로 (글자 수 유지)"""
+    return "".join(
+        CHOSEONG[(ord(char) - 0xAC00) // 588] if "가" <= char <= "힣" else char
+        for char in text
+    )
+
+def _word_starts(name: str) -> List[int]:
+    """정규화한 이름 안에서 단어가 시작하는 위치 (0 포함)"""
+    starts, position = [], 0
+    for word in _SEPARATOR.split((name or "").lower()):
+        if word:
+            starts.append(position)
+            position += len(word)
+    return starts or [0]
+
+class _KindIndex:
+    """한 종류(키워드/템플릿/스페이스) 이름의 정렬 배열 두 개 (원래 키 / 초성 키)"""
+    def __init__(self):
+        # 항목 id → (결과 항목, 정규화한 이름, 범위)
+        self.items: Dict[str, Tuple[dict, str, str]] = {}
+        self.full: List[Entry] = []
+        self.cho: List[Entry] = []
+    
+    def _entries(self, item_id: str) -> Iterable[Tuple[Entry, Entry]]:
+        payload, name, scope = self.items[item_id]
+        cho = choseong(name)
+        for start in _word_starts(payload["name"]):
+            if start < len(name):
+                yield (f"{scope}\0{name[start:]}", item_id, start), (f"{scope}\0{cho[start:]}", item_id, start)
+    
+    def build(self, items: Dict[str, Tuple[dict, str, str]]):
+        self.items = items
+        full, cho = [], []
+        for item_id in items:
+            for full_entry, cho_entry in self._entries(item_id):
+                full.append(full_entry)
+                cho.append(cho_entry)
+        full.sort()
+        cho.sort()
+        self.full, self.cho = full, cho
+    
+    def add(self, item_id: str, item: Tuple[dict, str, str]):
+        self.remove(item_id)
+        self.items[item_id] = item
+        for full_entry, cho_entry in self._entries(item_id):
+            insort(self.full, full_entry)
+            insort(self.cho, cho_entry)
+    
+    def remove(self, item_id: str):
+        if self.items.pop(item_id, None) is None:
+            return
+        self.full = [entry for entry in self.full if entry[1] != item_id]
+        self.cho = [entry for entry in self.cho if entry[1] != item_id]
+    
+    def lookup(self, query: str, scope: str, scan_limit: int) -> Dict[str, float]:
+        """질의(정규화) 와 접두어가 맞는 항목 id → 기본 점수"""
+        jamo = any(char in _CHOSEONG_SET for char in query)
+        entries = self.cho if jamo else self.full
+        prefix = f"{scope}\0{choseong(query) if jamo else query}"
+        
+        matches: Dict[str, float] = {}
+        index = bisect_left(entries, (prefix,))
+        scanned = 0
+        while index < len(entries) and entries[index][0].startswith(prefix) and scanned < scan_limit:
+            _, item_id, start = entries[index]
+            index += 1
+            scanned += 1
+            name = self.items[item_id][1]
+            # 초성 배열에서 찾은 경우 완성된 음절은 원래 글자와 같아야 함
+            if jamo and any(char != name[start + i] for i, char in enumerate(query) if char not in _CHOSEONG_SET):
+                continue
+            if start:
+                score = WORD_PREFIX
+            else:
+                score = EXACT if len(query) == len(name) else NAME_PREFIX
+            matches[item_id] = max(matches.get(item_id, 0.0), score)
+        return matches
+
+# 종류 → (테이블, 컬럼, 결과 항목, 사용자별 여부, 적재 조건)
+KINDS = {
+    "keywords": ("keywords", "id, name, category",
+                 lambda row: {"id": row["id"], "name": row["name"], "category": row.get("category")}, False, None),
+    "templates": ("reflection_templates", "id, name, category",
+                  lambda row: {"id": row["id"], "name": row["name"], "category": row.get("category")}, False,
+                  ("is_active", True)),
+    "spaces": ("reflection_spaces", "id, user_id, name, type, status",
+               lambda row: {"id": row["id"], "name": row["name"], "type": row.get("type"), "status": row.get("status")},
+               True, None),
+}
+
+class AutocompleteIndex:
+    def __init__(self, refresh_interval: int = 300, limit: int = 8, scan_limit: int = 500):
+        self.refresh_interval = refresh_interval
+        self.limit = limit
+        self.scan_limit = scan_limit
+        self._kinds: Dict[str, _KindIndex] = {kind: _KindIndex() for kind in KINDS}
+        self.loaded_at = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+    
+    # ------------------------------------------------------------------
+    # 적재 / 갱신
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _item(kind: str, row: dict) -> Tuple[dict, str, str]:
+        _, _, payload, per_user, _ = KINDS[kind]
+        return payload(row), normalize(row.get("name")), (str(row.get("user_id") or "") if per_user else "")
+    
+    def load(self, supabase):
+        """세 종류를 다시 읽어 배열을 만든 뒤 한 번에 교체"""
+        kinds = {}
+        for kind, (table, columns, _, _, active) in KINDS.items():
+            def build_query(table=table, columns=columns, active=active):
+                query = supabase.table(table).select(columns)
+                return query.eq(*active) if active else query
+            
+            items = {}
+            for page in iter_keyset(build_query):
+                for row in page:
+                    if row.get("name"):
+                        items[str(row["id"])] = self._item(kind, row)
+            kinds[kind] = _KindIndex()
+            kinds[kind].build(items)
+        
+        with self._lock:
+            self._kinds = kinds
+            self.loaded_at = time.monotonic()
+    
+    def _refresh_in_background(self, supabase):
+        try:
+            self.load(supabase)
+        finally:
+            with self._lock:
+                self._refreshing = False
+    
+    def ensure(self, supabase):
+        """처음이면 바로 적재, refresh_interval 이 지났으면 백그라운드에서 재적재 (이전 배열로 계속 응답)"""
+        if not self.loaded_at:
+            self.load(supabase)
+            return
+        with self._lock:
+            if self._refreshing or time.monotonic() - self.loaded_at < self.refresh_interval:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_in_background, args=(supabase,), daemon=True).start()
+    
+    def upsert(self, kind: str, row: dict):
+        """쓰기 API 에서 호출: 이름 추가/변경 (적재 전이면 다음 적재에서 반영)"""
+        active = KINDS[kind][4]
+        with self._lock:
+            if not self.loaded_at:
+                return
+            if row.get("name") and (active is None or row.get(active[0]) == active[1]):
+                self._kinds[kind].add(str(row["id"]), self._item(kind, row))
+            else:
+                self._kinds[kind].remove(str(row["id"]))
+    
+    def remove(self, kind: str, item_id: str):
+        with self._lock:
+            self._kinds[kind].remove(str(item_id))
+    
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def keyword_boosts(supabase, user_id: str) -> Dict[str, int]:
+        """사용자 키워드 경험 수 (keyword_id → experience_count), 사용자 캐시에 보관"""
+        boosts = stats_cache.get(user_id, "keyword_experience")
+        if boosts is None:
+            boosts = {}
+            for page in iter_keyset(lambda: supabase.table("user_keywords")
+                    .select("id, keyword_id, experience_count")
+                    .eq("user_id", user_id)):
+                for row in page:
+                    boosts[str(row["keyword_id"])] = row.get("experience_count") or 0
+            stats_cache.set(user_id, "keyword_experience", boosts)
+        return boosts
+    
+    def suggest(self, q: str, user_id: str, kinds: Optional[Iterable[str]] = None, limit: Optional[int] = None,
+                boosts: Optional[Dict[str, int]] = None) -> Dict[str, List[dict]]:
+        """종류별 자동완성 후보 (점수 내림차순, 같으면 짧은 이름 먼저)"""
+        query = normalize(q)
+        kinds = list(kinds or KINDS)
+        limit = limit or self.limit
+        results: Dict[str, List[dict]] = {kind: [] for kind in kinds}
+        if not query:
+            return results
+        
+        with self._lock:
+            for kind in kinds:
+                index = self._kinds[kind]
+                scope = user_id if KINDS[kind][3] else ""
+                ranked = []
+                for item_id, score in index.lookup(query, scope, self.scan_limit).items():
+                    if kind == "keywords" and boosts:
+                        score += BOOST_WEIGHT * math.log1p(boosts.get(item_id, 0))
+                    payload, name, _ = index.items[item_id]
+                    ranked.append((-score, len(name), name, payload))
+                ranked.sort(key=lambda item: item[:3])
+                results[kind] = [{**payload, "score": round(-neg_score, 3)} for neg_score, _, _, payload in ranked[:limit]]
+        return results
+
+autocomplete_index = AutocompleteIndex(
+    refresh_interval=settings.autocomplete_refresh_seconds,
+    limit=settings.autocomplete_limit,
+    scan_limit=settings.autocomplete_scan_limit
+)
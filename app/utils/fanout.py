@@ -0,0 +1,52 @@
+"""
+Supabase 쿼리 동시 실행 (fan-out)
+
+supabase-py 클라이언트는 동기 방식이라 async 라우트에서 execute() 를 연달아 호출하면
+이벤트 루프가 막히고 왕복 지연이 쿼리 수만큼 더해진다.
+서로 독립적인 쿼리를 제한된 스레드 풀에서 동시에 실행하고 쿼리별 소요 시간을 기록한다.
+
+사용 예:
+    fanout = QueryFanout()
+    results = await fanout.run({
+        "logs_count": supabase.table("logs").select("id", count="exact").eq("user_id", user_id),
+        ...
+    })
+    response.headers["Server-Timing"] = fanout.server_timing()
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+from app.config import settings
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.query_fanout_workers,
+    thread_name_prefix="supabase-fanout"
+)
+
+class QueryFanout:
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+    
+    async def _execute(self, name: str, query) -> Any:
+        loop = asyncio.get_running_loop()
+        execute = query.execute if hasattr(query, "execute") else query
+        start = time.perf_counter()
+        try:
+            return await loop.run_in_executor(_executor, execute)
+        finally:
+            self.timings[name] = (time.perf_counter() - start) * 1000
+    
+    async def run(self, queries: Dict[str, Any]) -> Dict[str, Any]:
+        """쿼리 빌더(또는 인자 없는 함수)를 동시에 실행해 이름별 결과 반환"""
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            self._execute(name, query) for name, query in queries.items()
+        ))
+        self.timings["total"] = self.timings.get("total", 0.0) + (time.perf_counter() - start) * 1000
+        return dict(zip(queries.keys(), results))
+    
+    def server_timing(self) -> str:
+        """Server-Timing 응답 헤더 값 (쿼리별 ms)"""
+        return ", ".join(f"{name};dur={ms:.1f}" for name, ms in self.timings.items())
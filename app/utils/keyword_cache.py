@@ -0,0 +1,83 @@
+"""
+키워드 마스터 캐시
+
+키워드 마스터(keywords)는 거의 바뀌지 않는데 프론트엔드가 자주 전체 목록을 요청하므로
+프로세스 메모리에 두고 버전(내용 해시)으로 클라이언트 캐시를 검증한다.
+
+- 버전: 행 전체의 해시 (같은 내용이면 워커가 달라도 같은 버전) → ETag / If-None-Match 304
+- 변경분: 최근 history 개 버전의 행별 해시를 기억해 ?since=<버전> 이후 추가/수정/삭제된 키워드만 반환,
+          모르는 버전이면 전체 목록 (full=True)
+- 갱신: API 에는 키워드 마스터 쓰기 경로가 없으므로(시드 SQL/관리 콘솔로 추가) ttl 마다 다시 읽어 반영,
+        쓰기 경로가 생기면 invalidate() 로 다음 조회에서 바로 다시 읽음
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from app.config import settings
+from app.utils.paging import iter_keyset
+
+def _digest(value) -> str:
+    return hashlib.sha1(json.dumps(value, sort_keys=True, ensure_ascii=False, default=str).encode()).hexdigest()
+
+class KeywordMasterCache:
+    def __init__(self, ttl: int = 300, history: int = 8):
+        self.ttl = ttl
+        self.history = history
+        self.rows: List[dict] = []
+        self.version: Optional[str] = None
+        self.loaded_at = 0.0
+        # 버전 → (키워드 id → 행 해시), 오래된 버전부터 제거
+        self._versions: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def load(self, supabase):
+        rows = []
+        for page in iter_keyset(lambda: supabase.table("keywords").select("*")):
+            rows.extend(page)
+        hashes = {str(row["id"]): _digest(row) for row in rows}
+        version = _digest(sorted(hashes.items()))[:16]
+        
+        with self._lock:
+            if version != self.version:
+                self.rows = rows
+                self.version = version
+                self._versions[version] = hashes
+                self._versions.move_to_end(version)
+                while len(self._versions) > self.history:
+                    self._versions.popitem(last=False)
+            self.loaded_at = time.monotonic()
+    
+    def get(self, supabase) -> Tuple[str, List[dict]]:
+        """(버전, 전체 키워드), 처음이거나 ttl 이 지났거나 무효화됐으면 다시 읽음"""
+        if self.version is None or time.monotonic() - self.loaded_at >= self.ttl:
+            self.load(supabase)
+        with self._lock:
+            return self.version, self.rows
+    
+    def delta(self, supabase, since: str) -> dict:
+        """since 버전 이후 바뀐 키워드 {"version", "full", "keywords", "removed"}"""
+        version, rows = self.get(supabase)
+        with self._lock:
+            before = self._versions.get(since)
+            current = self._versions.get(version, {})
+        
+        if before is None:
+            return {"version": version, "full": True, "keywords": rows, "removed": []}
+        changed = {key for key, row_hash in current.items() if before.get(key) != row_hash}
+        return {
+            "version": version,
+            "full": False,
+            "keywords": [row for row in rows if str(row["id"]) in changed],
+            "removed": sorted(key for key in before if key not in current)
+        }
+    
+    def invalidate(self):
+        """다음 조회에서 다시 읽음 (버전 기록은 유지해 변경분 계산에 사용)"""
+        with self._lock:
+            self.loaded_at = 0.0
+
+keyword_cache = KeywordMasterCache(ttl=settings.keyword_cache_ttl_seconds)
@@ -0,0 +1,168 @@
+"""
+추천 매칭 점수 일괄 계산
+
+routes/activities.py 의 calculate_match_score 를 활동 여러 개에 대해 한 번에 계산한다.
+활동 목록을 학과/키워드/분야 공용 어휘 위의 희소 행렬(CSR 형태의 인덱스 배열)로 한 번 인코딩해 두고,
+사용자마다 어휘 마스크만 만들어 NumPy 연산으로 전체 점수를 계산한다.
+
+점수와 match_reasons 는 calculate_match_score 와 동일하다.
+"""
+
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+# calculate_match_score 와 같은 가중치
+MAJOR_WEIGHT = 0.3
+KEYWORD_WEIGHT = 0.4
+FIELD_WEIGHT = 0.2
+DIFFICULTY_WEIGHT = 0.1
+
+class _TermMatrix:
+    """활동별 용어 집합을 (row_ids, term_ids) 희소 행렬로 보관"""
+
+    def __init__(self, vocab: Dict[str, int], values: List[list]):
+        row_ids = []
+        term_ids = []
+        for row, terms in enumerate(values):
+            # calculate_match_score 는 set() 으로 비교하므로 중복 제거
+            for term in set(terms or []):
+                term_ids.append(vocab.setdefault(term, len(vocab)))
+                row_ids.append(row)
+
+        self.vocab = vocab
+        self.n_rows = len(values)
+        self.row_ids = np.asarray(row_ids, dtype=np.int64)
+        self.term_ids = np.asarray(term_ids, dtype=np.int64)
+
+    def count_hits(self, terms: set) -> np.ndarray:
+        """행마다 terms 와 겹치는 용어 수"""
+        ids = [self.vocab[t] for t in terms if t in self.vocab]
+        if not ids:
+            return np.zeros(self.n_rows, dtype=np.int64)
+
+        mask = np.zeros(len(self.vocab), dtype=bool)
+        mask[ids] = True
+        hits = mask[self.term_ids]
+        return np.bincount(self.row_ids[hits], minlength=self.n_rows)
+
+class ActivityMatrix:
+    """활동 목록을 한 번 인코딩해 두고 사용자별 점수를 벡터 연산으로 계산"""
+
+    def __init__(self, activities: List[dict]):
+        self.activities = activities
+        self.majors = _TermMatrix({}, [a.get('recommended_majors', []) for a in activities])
+        self.keywords = _TermMatrix({}, [a.get('keywords', []) for a in activities])
+        self.fields = _TermMatrix({}, [a.get('fields', []) for a in activities])
+
+        difficulty_vocab: Dict[str, int] = {}
+        self.difficulty = np.asarray(
+            [difficulty_vocab.setdefault(a['difficulty_level'], len(difficulty_vocab))
+             if a.get('difficulty_level') else -1
+             for a in activities],
+            dtype=np.int64
+        )
+        self.difficulty_vocab = difficulty_vocab
+
+    def __len__(self) -> int:
+        return len(self.activities)
+
+    def components(self, user_data: dict) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """항목별 점수 배열 (학과, 키워드, 분야, 난이도)"""
+        n = len(self.activities)
+        zeros = np.zeros(n, dtype=np.float64)
+
+        # 1. 학과 매칭
+        major = zeros
+        user_major = user_data.get('major', '')
+        if user_major:
+            hits = self.majors.count_hits({user_major, '전공무관'})
+            major = np.where(hits > 0, MAJOR_WEIGHT, 0.0)
+
+        # 2. 키워드 매칭
+        keyword = zeros
+        user_keywords = user_data.get('skill_keywords', [])
+        if user_keywords:
+            hits = self.keywords.count_hits(set(user_keywords))
+            keyword = np.minimum(KEYWORD_WEIGHT, (hits / max(len(user_keywords), 1)) * KEYWORD_WEIGHT)
+
+        # 3. 관심 분야 매칭
+        field = zeros
+        user_fields = user_data.get('interested_fields', [])
+        if user_fields:
+            hits = self.fields.count_hits(set(user_fields))
+            field = np.minimum(FIELD_WEIGHT, (hits / max(len(user_fields), 1)) * FIELD_WEIGHT)
+
+        # 4. 난이도 매칭
+        difficulty = zeros
+        user_difficulty = user_data.get('preferred_difficulty')
+        if user_difficulty and user_difficulty in self.difficulty_vocab:
+            code = self.difficulty_vocab[user_difficulty]
+            difficulty = np.where(self.difficulty == code, DIFFICULTY_WEIGHT, 0.0)
+
+        return major, keyword, field, difficulty
+
+    def scores(self, user_data: dict) -> np.ndarray:
+        """전체 활동의 매칭 점수 (calculate_match_score 와 같은 반올림)"""
+        major, keyword, field, difficulty = self.components(user_data)
+        raw = 0.0 + major + keyword + field + difficulty
+        return _round2(raw)
+
+    def reasons(self, user_data: dict, indices: Optional[np.ndarray] = None) -> List[dict]:
+        """지정한 활동(기본: 전체)의 match_reasons"""
+        major, keyword, field, difficulty = self.components(user_data)
+        if indices is None:
+            indices = np.arange(len(self.activities))
+
+        has_major = (major[indices] > 0).tolist()
+        has_keyword = (keyword[indices] > 0).tolist()
+        has_field = (field[indices] > 0).tolist()
+        has_difficulty = (difficulty[indices] > 0).tolist()
+        keyword_rounded = _round2(keyword[indices]).tolist()
+        field_rounded = _round2(field[indices]).tolist()
+
+        result = []
+        for pos in range(len(indices)):
+            reasons = {}
+            if has_major[pos]:
+                reasons['major_match'] = MAJOR_WEIGHT
+            if has_keyword[pos]:
+                reasons['keyword_match'] = keyword_rounded[pos]
+            if has_field[pos]:
+                reasons['interest_match'] = field_rounded[pos]
+            if has_difficulty[pos]:
+                reasons['difficulty_match'] = DIFFICULTY_WEIGHT
+            result.append(reasons)
+        return result
+
+    def top_k(self, user_data: dict, k: int) -> List[Tuple[float, dict, dict]]:
+        """매칭 점수 상위 k개 (score, reasons, activity), 동점은 원래 순서 유지"""
+        scores = self.scores(user_data)
+        if k < len(scores):
+            candidates = np.argpartition(-scores, k - 1)[:k]
+            cutoff = scores[candidates].min()
+            # argpartition 은 동점 사이의 순서를 보장하지 않으므로 경계 점수는 다시 모아 정렬
+            candidates = np.flatnonzero(scores >= cutoff)
+        else:
+            candidates = np.arange(len(scores))
+
+        order = candidates[np.argsort(-scores[candidates], kind='stable')][:k]
+        reasons = self.reasons(user_data, order)
+        return [
+            (float(scores[i]), reasons[pos], self.activities[i])
+            for pos, i in enumerate(order.tolist())
+        ]
+
+def _round2(values: np.ndarray) -> np.ndarray:
+    """Python round(x, 2) 와 같은 결과 (np.round 는 .xx5 경계에서 다를 수 있음)"""
+    if values.size == 0:
+        return values
+    unique, inverse = np.unique(values, return_inverse=True)
+    rounded = np.asarray([round(float(v), 2) for v in unique], dtype=np.float64)
+    return rounded[inverse]
+
+def batch_match_scores(user_data: dict, activities: List[dict]) -> List[Tuple[float, dict]]:
+    """calculate_match_score 를 활동 목록 전체에 적용한 것과 같은 결과"""
+    matrix = ActivityMatrix(activities)
+    scores = matrix.scores(user_data)
+    reasons = matrix.reasons(user_data)
+    return list(zip(scores.tolist(), reasons))
@@ -0,0 +1,73 @@
+from typing import Callable, Iterator, List
+
+# Supabase(PostgREST) 기본 최대 응답 행 수
+PAGE_SIZE = 1000
+
+def iter_pages(build_query: Callable, page_size: int = PAGE_SIZE) -> Iterator[List[dict]]:
+    """range() 로 페이지를 넘기며 한 페이지씩 반환
+    
+    build_query 는 호출할 때마다 새 쿼리 빌더를 반환해야 하며, 페이지가 밀리지 않도록 정렬을 포함해야 한다.
+    """
+    offset = 0
+    while True:
+        response = build_query().range(offset, offset + page_size - 1).execute()
+        page = response.data or []
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        offset += page_size
+
+def iter_keyset(build_query: Callable, key: str = "id", page_size: int = PAGE_SIZE) -> Iterator[List[dict]]:
+    """key 컬럼 기준 keyset 페이지네이션 (큰 테이블 전체 스캔용, OFFSET 비용 없음)
+    
+    build_query 가 반환하는 쿼리는 select 에 key 컬럼을 포함해야 한다.
+    """
+    last = None
+    while True:
+        query = build_query()
+        if last is not None:
+            query = query.gt(key, last)
+        response = query.order(key).limit(page_size).execute()
+        page = response.data or []
+        if page:
+            yield page
+            last = page[-1][key]
+        if len(page) < page_size:
+            return
+
+def iter_keyset_after(build_query: Callable, order_key: str, since: str, key: str = "id",
+                      page_size: int = PAGE_SIZE) -> Iterator[List[dict]]:
+    """order_key 가 since 보다 큰 행을 (order_key, key) 순서 keyset 으로 한 페이지씩 반환 (증분 동기화용)
+    
+    since 는 호출 시점 값으로 고정되고, 같은 order_key 값이 페이지 경계에 걸쳐도 key 로 이어서 읽는다.
+    build_query 가 반환하는 쿼리는 select 에 order_key / key 컬럼을 포함해야 한다.
+    """
+    last = None
+    while True:
+        query = build_query()
+        if last is None:
+            query = query.gt(order_key, since)
+        else:
+            query = query.or_(
+                f'{order_key}.gt."{last[0]}",and({order_key}.eq."{last[0]}",{key}.gt."{last[1]}")'
+            )
+        response = query.order(order_key).order(key).limit(page_size).execute()
+        page = response.data or []
+        if page:
+            yield page
+            last = (page[-1][order_key], page[-1][key])
+        if len(page) < page_size:
+            return
+
+def fetch_all(build_query: Callable, page_size: int = PAGE_SIZE) -> List[dict]:
+    """조회 결과 전체를 리스트로 수집 (iter_pages 참고)"""
+    rows: List[dict] = []
+    for page in iter_pages(build_query, page_size):
+        rows.extend(page)
+    return rows
+
+def chunked(items: List, size: int) -> Iterator[List]:
+    """리스트를 size 개씩 나눔"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
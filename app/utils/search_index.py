@@ -0,0 +1,621 @@
+"""
+통합 검색(/search) 인메모리 역색인
+
+ilike('%q%') 는 앞쪽 와일드카드라 B-tree 인덱스를 못 쓰고 테이블 전체를 훑는다.
+검색 대상 6종(로그/프로젝트/키워드/회고/스페이스/템플릿)을 토큰 역색인으로 만들어 한 번에 검색한다.
+
+- 토큰: 한글은 문자 2-gram + 3-gram (조사가 붙어도 부분 일치), 영문/숫자는 소문자 단어
+- 질의: 한글 3글자 이상은 3-gram, 2글자는 2-gram 을 모두 포함하는 문서 (AND),
+        영문 마지막 단어는 접두어 일치 (입력 중 검색), 한 글자 한글은 후보 문서 본문에서 부분 문자열 확인
+- 순위: 필드 가중치를 반영한 BM25 + 질의 전체가 그대로 들어 있으면 가산점
+- 범위: 사용자 데이터(로그/프로젝트/회고/스페이스)는 사용자별 파티션, 키워드/템플릿은 공용 파티션
+- 갱신: 쓰기 API 가 upsert/remove 로 바로 반영하고(적재된 파티션만),
+        다른 곳(프론트엔드, 다른 워커)의 쓰기는 sync_interval 마다 updated_at 증분 조회로,
+        삭제는 ttl 마다 파티션을 다시 적재해 반영한다.
+- 적재: 종류별 테이블을 QueryFanout 스레드 풀에서 동시에 읽는다. 검색 요청은 search_timeout_ms 까지만 기다리고
+        그때까지 준비된 종류로 먼저 응답한다 (나머지는 pending 으로 알리고 적재는 계속 진행).
+- 결과: 종류별 limit 개 (최대 search_result_max_limit), (점수, id) keyset 커서로 다음 페이지
+- 본문: 로그 content/reflection, 회고 answers/ai_feedback 은 토큰 위치까지 색인해
+        반환할 항목만 일치 토큰 주변 스니펫 + 강조 구간(highlights)을 만든다.
+"""
+
+import asyncio
+import base64
+import functools
+import heapq
+import json
+import math
+import re
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from app.config import settings
+from app.utils.fanout import QueryFanout
+from app.utils.paging import iter_keyset
+
+_HANGUL = re.compile(r'[가-힣]+')
+_TOKEN = re.compile(r'[가-힣]+|[a-z0-9]+')
+
+# BM25 파라미터 / 질의 전체 일치 가산점 (필드 가중치 배수)
+K1 = 1.2
+B = 0.75
+PHRASE_BOOST = 2.0
+
+# 본문 스니펫 길이 (글자) / 첫 일치 앞에 보여 줄 글자 수
+SNIPPET_CHARS = 100
+SNIPPET_LEAD = 20
+
+# 위치 게시 목록 항목: (필드 번호 << 24) | 필드 안 글자 위치
+_OFFSET_BITS = 24
+_OFFSET_MASK = (1 << _OFFSET_BITS) - 1
+
+Key = Tuple[str, str]
+
+def _snippet(text: Optional[str]) -> str:
+    return text[:SNIPPET_CHARS] + "..." if text else ""
+
+def _field_text(row: dict, field: str) -> str:
+    """검색 필드 값 → 텍스트 (회고 answers 처럼 [{"question", "answer"}] 목록이면 답변만 줄바꿈으로 이음)"""
+    value = row.get(field)
+    if isinstance(value, list):
+        return "\n".join(str(item.get("answer") or "") if isinstance(item, dict) else str(item) for item in value)
+    return value or ""
+
+@dataclass
+class EntitySpec:
+    table: str
+    columns: str
+    fields: Dict[str, float]                # 검색 필드별 가중치
+    payload: Callable[[dict], dict]         # 검색 결과 항목
+    snippet_fields: Tuple[str, ...] = ()    # 위치를 색인해 일치 부분 스니펫을 만들 본문 필드
+    per_user: bool = True
+    active: Optional[Tuple[str, object]] = None   # 색인할 행 조건 (컬럼, 값)
+    limit: Optional[int] = None
+
+ENTITIES: Dict[str, EntitySpec] = {
+    "logs": EntitySpec(
+        table="logs",
+        columns="id, title, content, reflection, updated_at",
+        fields={"title": 2.0, "content": 1.0, "reflection": 1.0},
+        payload=lambda row: {"id": row["id"], "title": row["title"], "snippet": _snippet(row.get("content"))},
+        snippet_fields=("content", "reflection")
+    ),
+    "projects": EntitySpec(
+        table="projects",
+        columns="id, name, updated_at",
+        fields={"name": 1.0},
+        payload=lambda row: {"id": row["id"], "name": row["name"]}
+    ),
+    "keywords": EntitySpec(
+        table="keywords",
+        columns="id, name",
+        fields={"name": 1.0},
+        payload=lambda row: {"id": row["id"], "name": row["name"]},
+        per_user=False
+    ),
+    "reflections": EntitySpec(
+        table="reflections",
+        columns="id, space_id, answers, ai_feedback, reflection_date, mood, updated_at",
+        fields={"answers": 1.0, "ai_feedback": 1.0},
+        payload=lambda row: {
+            "id": row["id"],
+            "space_id": row.get("space_id"),
+            "snippet": _snippet(row.get("ai_feedback")),
+            "date": row.get("reflection_date"),
+            "mood": row.get("mood")
+        },
+        snippet_fields=("answers", "ai_feedback"),
+        limit=10
+    ),
+    "spaces": EntitySpec(
+        table="reflection_spaces",
+        columns="id, name, type, status, updated_at",
+        fields={"name": 1.0},
+        payload=lambda row: {"id": row["id"], "name": row["name"], "type": row.get("type"), "status": row.get("status")}
+    ),
+    "templates": EntitySpec(
+        table="reflection_templates",
+        columns="id, name, category, description, is_active, updated_at",
+        fields={"name": 2.0, "description": 1.0},
+        payload=lambda row: {
+            "id": row["id"],
+            "name": row["name"],
+            "category": row.get("category"),
+            "description": row.get("description")
+        },
+        per_user=False,
+        active=("is_active", True)
+    ),
+}
+
+def tokenize_positions(text: Optional[str]) -> List[Tuple[str, int]]:
+    """문서 토큰과 글자 위치 (한글 2/3-gram, 한 글자 한글은 그대로, 영문/숫자 단어)"""
+    if not text:
+        return []
+    terms = []
+    for match in _TOKEN.finditer(text.lower()):
+        run, start = match.group(), match.start()
+        if not _HANGUL.match(run) or len(run) == 1:
+            terms.append((run, start))
+            continue
+        terms.extend((run[i:i + 2], start + i) for i in range(len(run) - 1))
+        terms.extend((run[i:i + 3], start + i) for i in range(len(run) - 2))
+    return terms
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return [term for term, _ in tokenize_positions(text)]
+
+@dataclass
+class ParsedQuery:
+    terms: List[str]                # 모두 포함해야 하는 토큰
+    prefix: Optional[str]           # 접두어 일치할 마지막 영문 단어
+    substrings: List[str]           # 색인으로 찾을 수 없는 조각 (한 글자 한글) → 본문에서 확인
+    phrase: str                     # 가산점용 질의 전체 (소문자)
+
+def parse_query(q: str) -> ParsedQuery:
+    lowered = q.lower().strip()
+    runs = _TOKEN.findall(lowered)
+    terms: List[str] = []
+    substrings: List[str] = []
+    prefix = None
+    for index, run in enumerate(runs):
+        if _HANGUL.match(run):
+            if len(run) == 1:
+                substrings.append(run)
+            else:
+                n = 3 if len(run) >= 3 else 2
+                terms.extend(run[i:i + n] for i in range(len(run) - n + 1))
+        elif index == len(runs) - 1 and not q[-1:].isspace():
+            prefix = run
+        else:
+            terms.append(run)
+    return ParsedQuery(list(dict.fromkeys(terms)), prefix, substrings, lowered)
+
+class _Partition:
+    """사용자 한 명(또는 공용) 문서의 역색인"""
+    def __init__(self):
+        # key = (entity, id) → (payload, 길이, [(소문자 필드 텍스트, 가중치, 대소문자가 다르면 원문)])
+        self.docs: Dict[Key, Tuple[dict, float, List[Tuple[str, float, Optional[str]]]]] = {}
+        self.postings: Dict[str, Dict[Key, float]] = {}
+        # 본문 필드(snippet_fields)의 위치 게시 목록: 토큰 → key → 위치 배열 (_OFFSET_BITS 참고)
+        self.positions: Dict[str, Dict[Key, array]] = {}
+        self.words: Set[str] = set()
+        self.total_length = 0.0
+        # 종류별로 적재/증분 조회에서 읽은 마지막 updated_at (증분 조회 기준), 행이 없으면 적재 시각
+        # 쓰기 API 의 upsert 로는 옮기지 않음 (다른 워커의 쓰기를 건너뛰지 않도록)
+        self.synced_at: Dict[str, str] = {}
+        self.loaded_at = datetime.now(timezone.utc).isoformat()
+        # 한 번 이상 적재가 끝난 종류 (적재 중인 종류는 검색에서 빠짐)
+        self.ready: Set[str] = set()
+    
+    def add(self, entity: str, spec: EntitySpec, row: dict):
+        key = (entity, str(row["id"]))
+        self.remove(key)
+        if spec.active and row.get(spec.active[0]) != spec.active[1]:
+            return
+        
+        weights: Dict[str, float] = {}
+        offsets: Dict[str, array] = {}
+        texts = []
+        for index, (field, weight) in enumerate(spec.fields.items()):
+            text = _field_text(row, field)
+            lowered = text.lower()
+            texts.append((lowered, weight, text if text != lowered and len(text) == len(lowered) else None))
+            positional = field in spec.snippet_fields
+            for term, start in tokenize_positions(text):
+                weights[term] = weights.get(term, 0.0) + weight
+                if positional and start <= _OFFSET_MASK:
+                    offsets.setdefault(term, array("I")).append((index << _OFFSET_BITS) | start)
+        
+        length = sum(weights.values())
+        self.docs[key] = (spec.payload(row), length, texts)
+        self.total_length += length
+        for term, weight in weights.items():
+            self.postings.setdefault(term, {})[key] = weight
+            if not _HANGUL.match(term):
+                self.words.add(term)
+        for term, positions in offsets.items():
+            self.positions.setdefault(term, {})[key] = positions
+    
+    def remove(self, key: Key):
+        doc = self.docs.pop(key, None)
+        if doc is None:
+            return
+        self.total_length -= doc[1]
+        # 문서 토큰을 따로 저장하지 않으므로 필드 텍스트를 다시 토큰화
+        for text, _, _ in doc[2]:
+            for term in tokenize(text):
+                positions = self.positions.get(term)
+                if positions is not None and positions.pop(key, None) is not None and not positions:
+                    del self.positions[term]
+                postings = self.postings.get(term)
+                if postings is None or postings.pop(key, None) is None:
+                    continue
+                if not postings:
+                    del self.postings[term]
+                    self.words.discard(term)
+    
+    def _expand(self, prefix: str) -> List[str]:
+        return [word for word in self.words if word.startswith(prefix)]
+    
+    def _groups(self, query: ParsedQuery) -> Optional[List[Dict[Key, float]]]:
+        """질의 토큰별 게시 목록 (접두어는 일치하는 단어 중 최대 가중치), 없는 토큰이 있으면 None"""
+        groups = []
+        for term in query.terms:
+            postings = self.postings.get(term)
+            if not postings:
+                return None
+            groups.append(postings)
+        if query.prefix:
+            merged: Dict[Key, float] = {}
+            for word in self._expand(query.prefix):
+                for key, weight in self.postings[word].items():
+                    merged[key] = max(merged.get(key, 0.0), weight)
+            if not merged:
+                return None
+            groups.append(merged)
+        return groups
+    
+    def search(self, query: ParsedQuery, entities: Set[str]) -> Iterable[Tuple[float, Key]]:
+        groups = self._groups(query)
+        if groups is None:
+            return []
+        
+        if groups:
+            groups.sort(key=len)
+            candidates = [key for key in groups[0] if key[0] in entities]
+            for postings in groups[1:]:
+                candidates = [key for key in candidates if key in postings]
+        else:
+            # 색인 토큰이 없는 질의 (한 글자 한글 등) → 해당 종류 문서 전체에서 확인
+            candidates = [key for key in self.docs if key[0] in entities]
+        
+        count = len(self.docs)
+        average = self.total_length / count if count else 1.0
+        results = []
+        for key in candidates:
+            _, length, texts = self.docs[key]
+            if query.substrings and not all(any(s in text for text, _, _ in texts) for s in query.substrings):
+                continue
+            
+            score = 0.0
+            for postings in groups:
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                weight = postings[key]
+                score += idf * weight * (K1 + 1) / (weight + K1 * (1 - B + B * length / (average or 1.0)))
+            score += sum(PHRASE_BOOST * weight for text, weight, _ in texts if query.phrase and query.phrase in text)
+            if score > 0:
+                results.append((score, key))
+        return results
+    
+    def highlight(self, key: Key, spec: EntitySpec, query: ParsedQuery) -> Optional[dict]:
+        """일치한 토큰이 가장 많이 모인 본문 구간의 스니펫과 강조 구간
+        
+        위치 게시 목록에서 질의 토큰의 위치만 모아 SNIPPET_CHARS 창을 밀며 서로 다른 토큰이 가장 많은 곳을 고른다.
+        반환: {"snippet", "highlights": [[시작, 끝), ...] (스니펫 안 글자 위치), "field"}, 본문에 일치가 없으면 None
+        """
+        texts = self.docs[key][2]
+        terms = list(query.terms) + (self._expand(query.prefix) if query.prefix else [])
+        hits: Dict[int, List[Tuple[int, int, int]]] = {}
+        for term_index, term in enumerate(terms):
+            for packed in self.positions.get(term, {}).get(key, ()):
+                start = packed & _OFFSET_MASK
+                hits.setdefault(packed >> _OFFSET_BITS, []).append((start, start + len(term), term_index))
+        if not hits:
+            # 색인되지 않는 한 글자 질의는 본문에서 직접 찾음
+            for index, (lowered, _, _) in enumerate(texts):
+                if list(spec.fields)[index] not in spec.snippet_fields:
+                    continue
+                for piece in query.substrings:
+                    start = lowered.find(piece)
+                    if start >= 0:
+                        hits.setdefault(index, []).append((start, start + len(piece), 0))
+            if not hits:
+                return None
+        
+        # 필드별로 창 안의 서로 다른 토큰 수 (같으면 일치 수) 가 가장 큰 구간
+        best = None
+        for index, field_hits in hits.items():
+            field_hits.sort()
+            counts: Dict[int, int] = {}
+            left = 0
+            for right, (start, end, term_index) in enumerate(field_hits):
+                counts[term_index] = counts.get(term_index, 0) + 1
+                while end - field_hits[left][0] > SNIPPET_CHARS:
+                    counts[field_hits[left][2]] -= 1
+                    if not counts[field_hits[left][2]]:
+                        del counts[field_hits[left][2]]
+                    left += 1
+                rank = (len(counts), right - left + 1)
+                if best is None or rank > best[0]:
+                    best = (rank, index, field_hits[left:right + 1])
+        
+        _, index, window = best
+        lowered, _, original = texts[index]
+        text = original or lowered
+        start = max(0, min(window[0][0] - SNIPPET_LEAD, len(text) - SNIPPET_CHARS))
+        end = min(len(text), start + SNIPPET_CHARS)
+        prefix = "..." if start > 0 else ""
+        
+        highlights: List[List[int]] = []
+        for hit_start, hit_end, _ in window:
+            hit_start, hit_end = max(hit_start, start), min(hit_end, end)
+            if hit_start >= hit_end:
+                continue
+            hit_start, hit_end = hit_start - start + len(prefix), hit_end - start + len(prefix)
+            # 겹치는 n-gram 은 하나의 구간으로 합침
+            if highlights and hit_start <= highlights[-1][1]:
+                highlights[-1][1] = max(highlights[-1][1], hit_end)
+            else:
+                highlights.append([hit_start, hit_end])
+        
+        return {
+            "snippet": prefix + text[start:end] + ("..." if end < len(text) else ""),
+            "highlights": highlights,
+            "field": list(spec.fields)[index]
+        }
+
+class SearchIndex:
+    def __init__(self, ttl: int = 600, sync_interval: int = 30, max_users: int = 1000,
+                 limit: int = 20, max_limit: int = 50):
+        self.ttl = ttl
+        self.sync_interval = sync_interval
+        self.max_users = max_users
+        self.limit = limit
+        self.max_limit = max_limit
+        self._global = _Partition()
+        self._global_loaded_at = 0.0
+        # user_id → (파티션, 전체 적재 시각, 마지막 증분 조회 시각), 오래 안 쓴 사용자부터 제거
+        self._users: "OrderedDict[str, List]" = OrderedDict()
+        # 진행 중인 적재/증분 조회 ("global" 또는 user_id → Task), 같은 파티션을 중복으로 읽지 않게 함
+        self._pending: Dict[str, asyncio.Task] = {}
+        self._lock = threading.RLock()
+    
+    # ------------------------------------------------------------------
+    # 적재 / 동기화
+    # ------------------------------------------------------------------
+    
+    def _load_entity(self, supabase, partition: _Partition, entity: str, user_id: Optional[str] = None,
+                     since: Optional[str] = None) -> int:
+        """한 종류의 테이블을 읽어 파티션에 반영 (since 가 있으면 updated_at 이후 행만), 반영한 행 수 반환"""
+        spec = ENTITIES[entity]
+        
+        def build_query():
+            query = supabase.table(spec.table).select(spec.columns)
+            if user_id is not None:
+                query = query.eq("user_id", user_id)
+            if since is None and spec.active:
+                query = query.eq(*spec.active)
+            if since is not None:
+                query = query.gt("updated_at", since)
+            return query
+        
+        applied = 0
+        newest = since or ""
+        for page in iter_keyset(build_query):
+            with self._lock:
+                for row in page:
+                    partition.add(entity, spec, row)
+                    if (row.get("updated_at") or "") > newest:
+                        newest = row["updated_at"]
+            applied += len(page)
+        # id 순서로 읽으므로 기준 시각은 모든 페이지를 반영한 뒤에만 옮김 (중간 실패 시 다음 조회가 다시 읽음)
+        with self._lock:
+            if newest > partition.synced_at.get(entity, ""):
+                partition.synced_at[entity] = newest
+            partition.ready.add(entity)
+        return applied
+    
+    def _loaders(self, supabase, partition: _Partition, per_user: bool, user_id: Optional[str] = None,
+                 delta: bool = False) -> Dict[str, Callable]:
+        """종류별 적재 함수 (QueryFanout 으로 동시에 실행)"""
+        loaders = {}
+        for entity, spec in ENTITIES.items():
+            if spec.per_user != per_user:
+                continue
+            since = (partition.synced_at.get(entity) or partition.loaded_at) if delta else None
+            loaders[f"search_{entity}"] = functools.partial(
+                self._load_entity, supabase, partition, entity, user_id, since
+            )
+        return loaders
+    
+    def _schedule(self, name: str, loaders: Dict[str, Callable], on_done: Callable, fanout: QueryFanout,
+                  on_failed: Optional[Callable] = None):
+        """적재 작업 시작 (잠금 안에서 호출), 응답이 먼저 나가도 작업은 끝까지 진행된다"""
+        async def run():
+            try:
+                await fanout.run(loaders)
+                with self._lock:
+                    on_done()
+            except Exception:
+                if on_failed:
+                    with self._lock:
+                        on_failed()
+                raise
+            finally:
+                with self._lock:
+                    self._pending.pop(name, None)
+        
+        task = asyncio.ensure_future(run())
+        # 기다리던 요청이 없어도 예외가 "never retrieved" 경고로 남지 않게 함 (다음 요청에서 다시 시도)
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._pending[name] = task
+    
+    def _schedule_global(self, supabase, now: float, fanout: QueryFanout):
+        if "global" in self._pending or now - self._global_loaded_at < self.ttl:
+            return
+        # 첫 적재는 현재 파티션에 바로 채우고(종류별로 준비되는 대로 검색), 재적재는 다 읽은 뒤 교체
+        partition = self._global if not self._global_loaded_at else _Partition()
+        
+        def on_done():
+            self._global = partition
+            self._global_loaded_at = now
+        
+        self._schedule("global", self._loaders(supabase, partition, per_user=False), on_done, fanout)
+    
+    def _schedule_user(self, supabase, user_id: str, now: float, fanout: QueryFanout):
+        if user_id in self._pending:
+            return
+        entry = self._users.get(user_id)
+        if entry:
+            self._users.move_to_end(user_id)
+        
+        on_failed = None
+        if entry is None or now - entry[1] >= self.ttl:
+            # 전체 적재 (삭제된 행 반영), 적재 중 들어온 쓰기는 다음 증분 조회에서 반영
+            partition = _Partition()
+            if entry is None:
+                # 첫 적재는 바로 등록해 종류별로 준비되는 대로 검색
+                self._users[user_id] = [partition, now, now]
+                self._evict()
+            
+            def on_done():
+                self._users[user_id] = [partition, now, now]
+                self._users.move_to_end(user_id)
+                self._evict()
+            
+            def on_failed():
+                # 일부만 읽은 첫 적재 파티션을 남기면 다음 요청이 증분 조회만 하게 되므로 버림
+                current = self._users.get(user_id)
+                if current and current[0] is partition:
+                    del self._users[user_id]
+            
+            loaders = self._loaders(supabase, partition, per_user=True, user_id=user_id)
+        elif now - entry[2] >= self.sync_interval:
+            def on_done():
+                entry[2] = now
+            
+            loaders = self._loaders(supabase, entry[0], per_user=True, user_id=user_id, delta=True)
+        else:
+            return
+        self._schedule(user_id, loaders, on_done, fanout, on_failed)
+    
+    def _evict(self):
+        while len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+    
+    async def ensure(self, supabase, user_id: str, fanout: Optional[QueryFanout] = None,
+                     timeout: Optional[float] = None) -> Set[str]:
+        """공용 파티션과 사용자 파티션을 최신 상태로
+        
+        종류별 테이블을 동시에 읽고, timeout(초) 이 지나면 기다리지 않고 반환한다 (적재는 계속 진행).
+        반환값: 아직 한 번도 적재되지 않아 이번 검색에서 빠지는 종류
+        """
+        fanout = fanout or QueryFanout()
+        now = time.monotonic()
+        with self._lock:
+            self._schedule_global(supabase, now, fanout)
+            self._schedule_user(supabase, user_id, now, fanout)
+            tasks = [self._pending[name] for name in ("global", user_id) if name in self._pending]
+        
+        if tasks:
+            done, _ = await asyncio.wait(tasks, timeout=timeout)
+            for task in done:
+                task.result()
+        
+        with self._lock:
+            entry = self._users.get(user_id)
+            ready = self._global.ready | (entry[0].ready if entry else set())
+        return set(ENTITIES) - ready
+    
+    def _partition(self, entity: str, user_id: Optional[str]) -> Optional[_Partition]:
+        if not ENTITIES[entity].per_user:
+            return self._global
+        entry = self._users.get(user_id)
+        return entry[0] if entry else None
+    
+    def upsert(self, entity: str, row: dict, user_id: Optional[str] = None):
+        """쓰기 API 에서 호출: 적재된 파티션에 행 추가/수정 (적재 전이면 무시)"""
+        with self._lock:
+            partition = self._partition(entity, user_id)
+            if partition is not None:
+                partition.add(entity, ENTITIES[entity], row)
+    
+    def remove(self, entity: str, row_id: str, user_id: Optional[str] = None):
+        with self._lock:
+            partition = self._partition(entity, user_id)
+            if partition is not None:
+                partition.remove((entity, str(row_id)))
+    
+    def invalidate(self, user_id: str):
+        with self._lock:
+            self._users.pop(user_id, None)
+    
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def encode_cursor(positions: Dict[str, Tuple[float, str]]) -> str:
+        raw = json.dumps({entity: [score, key] for entity, (score, key) in positions.items()})
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> Dict[str, Tuple[float, str]]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            return {entity: (float(score), str(key)) for entity, (score, key) in json.loads(raw).items()
+                    if entity in ENTITIES}
+        except (ValueError, TypeError):
+            raise ValueError("Invalid cursor")
+    
+    def search(self, user_id: str, q: str, types: Optional[Iterable[str]] = None, limit: Optional[int] = None,
+               cursor: Optional[str] = None) -> Tuple[Dict[str, List[dict]], Optional[str]]:
+        """종류별 검색 결과 (점수 내림차순, 항목마다 score 포함) 와 다음 페이지 커서
+        
+        종류마다 (점수, id) 기준 keyset 으로 limit 개씩 돌려준다.
+        cursor 가 있으면 커서에 남은 종류(다음 페이지가 있는 종류)만 이어서 검색한다.
+        """
+        types = list(types or ENTITIES)
+        after = self.decode_cursor(cursor) if cursor else None
+        if after is not None:
+            types = [entity for entity in types if entity in after]
+        query = parse_query(q)
+        results: Dict[str, List[dict]] = {entity: [] for entity in ENTITIES}
+        
+        with self._lock:
+            entry = self._users.get(user_id)
+            partitions = [self._global] + ([entry[0]] if entry else [])
+            scored: Dict[str, List[Tuple[float, str, _Partition]]] = {entity: [] for entity in types}
+            for partition in partitions:
+                for score, key in partition.search(query, set(types) & partition.ready):
+                    scored[key[0]].append((score, key[1], partition))
+        
+        positions: Dict[str, Tuple[float, str]] = {}
+        for entity, items in scored.items():
+            if after is not None:
+                last_score, last_id = after[entity]
+                items = [item for item in items if item[0] < last_score or (item[0] == last_score and item[1] > last_id)]
+            size = min(limit or ENTITIES[entity].limit or self.limit, self.max_limit)
+            # 전체 정렬 대신 상위 size + 1 개만 (남은 항목이 있는지 확인용 1개)
+            top = heapq.nsmallest(size + 1, items, key=lambda item: (-item[0], item[1]))
+            if len(top) > size:
+                top = top[:size]
+                positions[entity] = (top[-1][0], top[-1][1])
+            
+            # 스니펫은 반환할 항목만 만듦
+            spec = ENTITIES[entity]
+            page = []
+            with self._lock:
+                for score, row_id, partition in top:
+                    doc = partition.docs.get((entity, row_id))
+                    if doc is None:
+                        continue
+                    item = {**doc[0], "score": round(score, 3)}
+                    if spec.snippet_fields:
+                        item.update(partition.highlight((entity, row_id), spec, query) or {"highlights": []})
+                    page.append(item)
+            results[entity] = page
+        return results, (self.encode_cursor(positions) if positions else None)
+
+search_index = SearchIndex(
+    ttl=settings.search_index_ttl_seconds,
+    sync_interval=settings.search_index_sync_seconds,
+    max_users=settings.search_index_max_users,
+    limit=settings.search_result_limit,
+    max_limit=settings.search_result_max_limit
+)
@@ -0,0 +1,106 @@
+"""
+사용자별 대시보드 통계 캐시
+
+대시보드 통계(/dashboard/stats, /dashboard/reflection-overview, /users/me stats)는
+로그/프로젝트/키워드/회고가 기록될 때만 바뀌므로 사용자별로 메모리에 캐시한다.
+
+- TTL(dashboard_cache_ttl_seconds)이 지나면 다시 계산, 만료된 항목은 조회 시 삭제
+- 사용자 수가 dashboard_cache_max_users 를 넘으면 가장 오래 안 쓴 사용자부터 제거 (LRU)
+- 쓰기 API 는 카운터를 바로 올리거나(bump) 해당 사용자 캐시를 무효화(invalidate)
+- 적중/미스 수는 metrics() 로 확인 (/dashboard/cache-metrics)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from app.config import settings
+
+class UserStatsCache:
+    def __init__(self, ttl: int = 60, max_users: int = 10000):
+        self.ttl = ttl
+        self.max_users = max_users
+        # 사용자 → (키 → (만료 시각, 값)), 최근에 쓴 사용자가 뒤
+        self._entries: "OrderedDict[str, Dict[str, Tuple[float, Any]]]" = OrderedDict()
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+        self._invalidations = 0
+        self._bumps = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+    
+    def get(self, user_id: str, key: str) -> Optional[Any]:
+        """캐시된 값 (없거나 만료되면 None)"""
+        with self._lock:
+            entries = self._entries.get(user_id, {})
+            entry = entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(user_id)
+                self._hits[key] = self._hits.get(key, 0) + 1
+                return entry[1]
+            
+            if entry:
+                del entries[key]
+                if not entries:
+                    del self._entries[user_id]
+            self._misses[key] = self._misses.get(key, 0) + 1
+            return None
+    
+    def set(self, user_id: str, key: str, value: Any):
+        with self._lock:
+            self._entries.setdefault(user_id, {})[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+    
+    def bump(self, user_id: str, key: str, path: Tuple[str, ...], delta: int = 1):
+        """캐시된 카운터를 delta 만큼 변경 (캐시가 없으면 아무것도 하지 않음)"""
+        with self._lock:
+            entry = self._entries.get(user_id, {}).get(key)
+            if not entry:
+                return
+            
+            target = entry[1]
+            for name in path[:-1]:
+                target = target[name]
+            target[path[-1]] = max(0, target[path[-1]] + delta)
+            self._bumps += 1
+    
+    def invalidate(self, user_id: str, *keys: str):
+        """사용자 캐시 삭제 (keys 를 생략하면 전체)"""
+        with self._lock:
+            if not keys:
+                self._entries.pop(user_id, None)
+            else:
+                entries = self._entries.get(user_id, {})
+                for key in keys:
+                    entries.pop(key, None)
+                if not entries:
+                    self._entries.pop(user_id, None)
+            self._invalidations += 1
+    
+    def metrics(self) -> dict:
+        with self._lock:
+            keys = sorted(set(self._hits) | set(self._misses))
+            return {
+                "users": len(self._entries),
+                "entries": sum(len(entries) for entries in self._entries.values()),
+                "max_users": self.max_users,
+                "ttl_seconds": self.ttl,
+                "invalidations": self._invalidations,
+                "bumps": self._bumps,
+                "evictions": self._evictions,
+                "keys": {
+                    key: {
+                        "hits": self._hits.get(key, 0),
+                        "misses": self._misses.get(key, 0),
+                        "hit_rate": round(
+                            self._hits.get(key, 0) / max(self._hits.get(key, 0) + self._misses.get(key, 0), 1), 3
+                        )
+                    }
+                    for key in keys
+                }
+            }
+
+stats_cache = UserStatsCache(ttl=settings.dashboard_cache_ttl_seconds, max_users=settings.dashboard_cache_max_users)
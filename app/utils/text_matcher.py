@@ -0,0 +1,84 @@
+"""
+다중 패턴 문자열 매칭 (분야/키워드/태그 분류용)
+
+패턴마다 `in` 으로 텍스트를 다시 훑는 대신, 모든 패턴을 트라이 모양의 정규식 하나로 컴파일해
+텍스트를 한 번만 스캔한다. 정규식은 각 위치에서 가장 긴 패턴을 찾고, 같은 위치에서 시작하는
+더 짧은 패턴(가장 긴 패턴의 접두어)은 미리 계산한 목록으로 채운다. 매치 안쪽에서 시작하는
+패턴은 그 위치들만 다시 확인하므로, 결과는 Aho-Corasick 과 같이 겹치는 것을 포함한 모든 출현 패턴 집합이다.
+
+대소문자는 구분하지 않는다 (텍스트와 패턴 모두 lower()).
+
+사용 예:
+    matcher = MultiPatternMatcher({'IT': ['개발', 'AI'], '디자인': ['UX', 'UI']})
+    matcher.labels("AI 웹개발 공모전")  # ['IT']
+"""
+
+import re
+from typing import Dict, FrozenSet, Iterable, List, Set
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """단어 목록을 공통 접두어로 묶은 정규식 (가장 긴 단어가 먼저 시도됨)"""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def build(node: dict) -> str:
+        end = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f"(?:{body})?" if end else body
+    
+    return build(trie)
+
+class MultiPatternMatcher:
+    def __init__(self, mapping: Dict[str, List[str]]):
+        """mapping: {라벨: [패턴, ...]} (라벨 순서가 결과 순서)"""
+        self.labels_order = list(mapping)
+        self.pattern_labels: Dict[str, Set[str]] = {}
+        for label, patterns in mapping.items():
+            for pattern in patterns:
+                self.pattern_labels.setdefault(pattern.lower(), set()).add(label)
+        
+        patterns = sorted(self.pattern_labels)
+        # 같은 위치에서 함께 출현하는 더 짧은 패턴 (= 접두어인 패턴)
+        self._prefixes: Dict[str, FrozenSet[str]] = {
+            pattern: frozenset(other for other in patterns if pattern.startswith(other))
+            for pattern in patterns
+        }
+        self._regex = re.compile(_trie_pattern(patterns)) if patterns else None
+    
+    def matches(self, text: str) -> Set[str]:
+        """텍스트에 나타난 패턴 집합 (소문자)"""
+        found: Set[str] = set()
+        if not text or self._regex is None:
+            return found
+        
+        text = text.lower()
+        search, match = self._regex.search, self._regex.match
+        pos = 0
+        while True:
+            m = search(text, pos)
+            if m is None:
+                return found
+            start, pos = m.span()
+            found |= self._prefixes[m.group()]
+            # 매치 안쪽에서 시작하는 겹친 패턴 (예: '웹개발' 안의 '개발')
+            for inner in range(start + 1, pos):
+                m = match(text, inner)
+                if m is not None:
+                    found |= self._prefixes[m.group()]
+    
+    def labels_for(self, found: Set[str]) -> List[str]:
+        """matches() 결과에 해당하는 라벨 (mapping 순서)"""
+        hit: Set[str] = set()
+        for pattern in found:
+            hit |= self.pattern_labels[pattern]
+        return [label for label in self.labels_order if label in hit]
+    
+    def labels(self, text: str) -> List[str]:
+        return self.labels_for(self.matches(text))